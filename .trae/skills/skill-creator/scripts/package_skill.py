@@ -2,27 +2,185 @@
 """
 Skill Packager - Creates a distributable .skill file of a skill folder
 
+Archives are reproducible: entries are sorted, timestamps are fixed, and
+already-compressed assets are stored as-is while everything else is deflated
+in parallel. Identical file contents are compressed only once. The content
+hash is kept in the archive comment so an unchanged skill is not repackaged.
+
 Usage:
-    python utils/package_skill.py <path/to/skill-folder> [output-directory]
+    python utils/package_skill.py <path/to/skill-folder> [output-directory] [--force]
 
 Example:
     python utils/package_skill.py skills/public/my-skill
     python utils/package_skill.py skills/public/my-skill ./dist
 """
 
+import hashlib
+import os
+import struct
 import sys
 import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from quick_validate import validate_skill
 
+# Bump when the archive layout changes so existing packages are rebuilt
+PACKAGE_FORMAT_VERSION = 1
+
+# Extensions that are already compressed and gain nothing from deflate
+STORED_EXTENSIONS = {
+    '.png', '.jpg', '.jpeg', '.gif', '.webp',
+    '.mp4', '.webm', '.mp3',
+    '.wasm', '.zip', '.skill', '.gz', '.br', '.svga'
+}
+
+# Files and folders that never belong in a package
+EXCLUDED_NAMES = {'__pycache__', '.DS_Store', 'Thumbs.db'}
+EXCLUDED_SUFFIXES = {'.pyc', '.pyo'}
+
+# Fixed entry timestamp (earliest DOS date) for reproducible archives
+FIXED_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+DEFLATE_LEVEL = 9
+COMMENT_PREFIX = b'skill-sha256:'
+
+
+def collect_files(skill_path):
+    """
+    List the files to package in a stable order.
+
+    Args:
+        skill_path: Resolved path to the skill folder
+
+    Returns:
+        List of (arcname, file_path) tuples sorted by arcname
+    """
+    files = []
+    for file_path in skill_path.rglob('*'):
+        relative = file_path.relative_to(skill_path)
+        if any(part in EXCLUDED_NAMES for part in relative.parts):
+            continue
+        if file_path.suffix.lower() in EXCLUDED_SUFFIXES or not file_path.is_file():
+            continue
+        # Calculate the relative path within the zip
+        arcname = file_path.relative_to(skill_path.parent).as_posix()
+        files.append((arcname, file_path))
+    return sorted(files)
+
 
-def package_skill(skill_path, output_dir=None):
+def read_entry(file_path):
+    """
+    Read a file and compute its content hash and zip metadata.
+
+    Returns:
+        Dict with data, sha256, crc and unix mode
+    """
+    data = file_path.read_bytes()
+    executable = os.access(file_path, os.X_OK) and os.name != 'nt'
+    return {
+        'data': data,
+        'sha256': hashlib.sha256(data).hexdigest(),
+        'crc': zlib.crc32(data) & 0xFFFFFFFF,
+        'mode': 0o100755 if executable else 0o100644
+    }
+
+
+def compress_entry(data):
+    """
+    Deflate data as a raw zip stream (zlib releases the GIL, so threads run in parallel).
+    """
+    compressor = zlib.compressobj(DEFLATE_LEVEL, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+def compute_package_digest(files, entries):
+    """
+    Hash the archive inputs: paths, modes, contents and format version.
+    """
+    digest = hashlib.sha256(f"format:{PACKAGE_FORMAT_VERSION}\n".encode())
+    for arcname, _ in files:
+        entry = entries[arcname]
+        digest.update(f"{arcname}\0{entry['mode']:o}\0{entry['sha256']}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def read_package_digest(skill_filename):
+    """
+    Read the content hash stored in an existing package's comment.
+
+    Returns:
+        Hex digest string, or None if the package is missing or has no digest
+    """
+    try:
+        with zipfile.ZipFile(skill_filename) as zipf:
+            comment = zipf.comment
+    except (OSError, zipfile.BadZipFile):
+        return None
+    if not comment.startswith(COMMENT_PREFIX):
+        return None
+    return comment[len(COMMENT_PREFIX):].decode('ascii', 'replace')
+
+
+def write_archive(skill_filename, records, comment):
+    """
+    Write a deterministic zip archive from precomputed entries.
+
+    Args:
+        skill_filename: Output path
+        records: List of (arcname, entry, method, payload) in archive order
+        comment: Archive comment bytes
+    """
+    dos_time = (FIXED_DATE_TIME[3] << 11) | (FIXED_DATE_TIME[4] << 5) | (FIXED_DATE_TIME[5] // 2)
+    dos_date = ((FIXED_DATE_TIME[0] - 1980) << 9) | (FIXED_DATE_TIME[1] << 5) | FIXED_DATE_TIME[2]
+    utf8_flag = 0x0800
+
+    central_directory = []
+    offset = 0
+    temp_filename = skill_filename.with_name(skill_filename.name + '.tmp')
+    with open(temp_filename, 'wb') as f:
+        for arcname, entry, method, payload in records:
+            name = arcname.encode('utf-8')
+            size = len(entry['data'])
+            if max(size, len(payload), offset) >= 0xFFFFFFFF:
+                raise ValueError(f"{arcname} is too large for a .skill package")
+
+            local_header = struct.pack(
+                '<IHHHHHIIIHH',
+                0x04034B50, 20, utf8_flag, method, dos_time, dos_date,
+                entry['crc'], len(payload), size, len(name), 0
+            )
+            f.write(local_header)
+            f.write(name)
+            f.write(payload)
+
+            central_directory.append(struct.pack(
+                '<IHHHHHHIIIHHHHHII',
+                0x02014B50, (3 << 8) | 20, 20, utf8_flag, method, dos_time, dos_date,
+                entry['crc'], len(payload), size, len(name), 0, 0, 0, 0,
+                entry['mode'] << 16, offset
+            ) + name)
+            offset += len(local_header) + len(name) + len(payload)
+
+        directory = b''.join(central_directory)
+        f.write(directory)
+        f.write(struct.pack(
+            '<IHHHHIIH',
+            0x06054B50, 0, 0, len(records), len(records), len(directory), offset, len(comment)
+        ))
+        f.write(comment)
+
+    os.replace(temp_filename, skill_filename)
+
+
+def package_skill(skill_path, output_dir=None, force=False):
     """
     Package a skill folder into a .skill file.
 
     Args:
         skill_path: Path to the skill folder
         output_dir: Optional output directory for the .skill file (defaults to current directory)
+        force: Repackage even if the content hash is unchanged
 
     Returns:
         Path to the created .skill file, or None if error
@@ -65,14 +223,39 @@ def package_skill(skill_path, output_dir=None):
 
     # Create the .skill file (zip format)
     try:
-        with zipfile.ZipFile(skill_filename, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            # Walk through the skill directory
-            for file_path in skill_path.rglob('*'):
-                if file_path.is_file():
-                    # Calculate the relative path within the zip
-                    arcname = file_path.relative_to(skill_path.parent)
-                    zipf.write(file_path, arcname)
-                    print(f"  Added: {arcname}")
+        files = collect_files(skill_path)
+        with ThreadPoolExecutor() as executor:
+            entries = dict(zip(
+                (arcname for arcname, _ in files),
+                executor.map(read_entry, (file_path for _, file_path in files))
+            ))
+
+            digest = compute_package_digest(files, entries)
+            if not force and read_package_digest(skill_filename) == digest:
+                print(f"⏭️  Skill unchanged, keeping existing package: {skill_filename}")
+                return skill_filename
+
+            # Deflate each distinct content once, skipping already-compressed formats
+            to_compress = {}
+            for arcname, file_path in files:
+                entry = entries[arcname]
+                if file_path.suffix.lower() not in STORED_EXTENSIONS:
+                    to_compress.setdefault(entry['sha256'], entry['data'])
+            compressed = dict(zip(to_compress, executor.map(compress_entry, to_compress.values())))
+
+        records = []
+        for arcname, file_path in files:
+            entry = entries[arcname]
+            payload = compressed.get(entry['sha256'])
+            # Fall back to STORED when deflate does not help
+            if payload is None or len(payload) >= len(entry['data']):
+                records.append((arcname, entry, zipfile.ZIP_STORED, entry['data']))
+                print(f"  Stored: {arcname}")
+            else:
+                records.append((arcname, entry, zipfile.ZIP_DEFLATED, payload))
+                print(f"  Added: {arcname}")
+
+        write_archive(skill_filename, records, COMMENT_PREFIX + digest.encode('ascii'))
 
         print(f"\n✅ Successfully packaged skill to: {skill_filename}")
         return skill_filename
@@ -83,22 +266,25 @@ def package_skill(skill_path, output_dir=None):
 
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python utils/package_skill.py <path/to/skill-folder> [output-directory]")
+    args = [arg for arg in sys.argv[1:] if arg != '--force']
+    force = len(args) != len(sys.argv) - 1
+
+    if not args:
+        print("Usage: python utils/package_skill.py <path/to/skill-folder> [output-directory] [--force]")
         print("\nExample:")
         print("  python utils/package_skill.py skills/public/my-skill")
         print("  python utils/package_skill.py skills/public/my-skill ./dist")
         sys.exit(1)
 
-    skill_path = sys.argv[1]
-    output_dir = sys.argv[2] if len(sys.argv) > 2 else None
+    skill_path = args[0]
+    output_dir = args[1] if len(args) > 1 else None
 
     print(f"📦 Packaging skill: {skill_path}")
     if output_dir:
         print(f"   Output directory: {output_dir}")
     print()
 
-    result = package_skill(skill_path, output_dir)
+    result = package_skill(skill_path, output_dir, force)
 
     if result:
         sys.exit(0)
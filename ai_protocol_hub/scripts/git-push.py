@@ -8,7 +8,7 @@ import subprocess
 import sys
 import os
 from datetime import datetime
-import re
+from update_log_store import open_store, find_latest_summary
 
 def run_cmd(cmd, cwd=None):
   """运行命令并返回结果"""
@@ -25,37 +25,24 @@ def run_cmd(cmd, cwd=None):
   except Exception as e:
     return 1, "", str(e)
 
-def get_file_update_summary(file_name):
+def get_file_update_summary(file_name, conn=None):
   """
-  从UPDATE_LOG.md中获取文件的最近一次更新简述
+  从UPDATE_LOG.md的索引存储中获取文件的最近一次更新简述
   :param file_name: 文件名（不包含路径）
+  :param conn: 已打开的存储连接，不传时临时打开
   :return: 更新简述，如果未找到则返回空字符串
   """
-  update_log_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "UPDATE_LOG.md")
-  
-  if not os.path.exists(update_log_path):
-    return ""
-  
   try:
-    with open(update_log_path, 'r', encoding='utf-8') as f:
-      content = f.read()
-    
-    # 匹配更新记录的正则表达式
-    # 格式：[YYYY-MM-DD HH:MM:SS] 【操作类型】 : 路径信息 - 更新简述
-    pattern = r'\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\] \【([^\】]+)\】 : ([^-]+) - ([^\n]+)'
-    matches = re.findall(pattern, content)
-    
-    # 按时间戳降序排序，最新的在前
-    matches.sort(key=lambda x: x[0], reverse=True)
-    
-    # 查找包含该文件名的最近一次更新记录
-    for match in matches:
-      timestamp, operation, path, summary = match
-      # 检查路径中是否包含该文件名
-      if file_name in path:
-        return summary
-    
-    return ""
+    own_conn = conn is None
+    if own_conn:
+      conn = open_store()
+      if conn is None:
+        return ""
+    try:
+      return find_latest_summary(conn, file_name)
+    finally:
+      if own_conn:
+        conn.close()
   except Exception as e:
     print(f"读取UPDATE_LOG.md失败: {str(e)}")
     return ""
@@ -127,8 +114,10 @@ def main():
   if changed_files:
     # 生成包含文件名和对应更新简述的描述
     file_summary_pairs = []
+    # 所有文件共用一个存储连接，每个文件一次索引查询
+    log_store = open_store()
     for i, file_name in enumerate(changed_files):
-      summary = get_file_update_summary(file_name)
+      summary = get_file_update_summary(file_name, log_store) if log_store else ""
       if not summary:
         # 如果没有找到更新简述，根据文件路径猜测操作类型
         file_path = changed_file_paths[i]
@@ -137,6 +126,8 @@ def main():
         else:
           summary = "删除文件"
       file_summary_pairs.append(f"{file_name}，{summary}")
+    if log_store:
+      log_store.close()
     
     # 生成最终的提交信息
     file_summary_text = '；'.join(file_summary_pairs)
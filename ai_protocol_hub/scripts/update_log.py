@@ -7,8 +7,8 @@
 import subprocess
 import sys
 import os
-import re
 from datetime import datetime
+from update_log_store import open_store, append_entries
 
 # 获取北京时间
 def get_beijing_time():
@@ -46,56 +46,77 @@ def get_beijing_time():
     import time
     return f"[{time.strftime('%Y-%m-%d %H:%M:%S')}]"
 
-def run_cmd(cmd, cwd=None):
+def run_cmd(cmd, cwd=None, input_data=None, strip=True):
   """
   运行命令并返回结果
-  :param cmd: 命令
+  :param cmd: 命令（字符串经 shell 执行，列表直接执行）
   :param cwd: 工作目录
+  :param input_data: 写入标准输入的文本
+  :param strip: 是否去除输出首尾空白（-z 输出需要保留）
   :return: (returncode, stdout, stderr)
   """
   try:
     result = subprocess.run(
       cmd, 
-      shell=True, 
+      shell=isinstance(cmd, str), 
+      input=input_data,
       capture_output=True, 
       text=True, 
       encoding='utf-8',
       cwd=cwd
     )
-    return result.returncode, result.stdout.strip(), result.stderr.strip()
+    stdout = result.stdout.strip() if strip else result.stdout
+    return result.returncode, stdout, result.stderr.strip()
   except Exception as e:
     return 1, "", str(e)
 
-def get_git_changes():
+def parse_porcelain_v2(output):
   """
-  获取Git变更记录
-  :return: 变更文件列表
+  解析 git status --porcelain=v2 -z 的输出
+  :param output: 命令输出（NUL 分隔）
+  :return: 变更文件列表 [(状态, 路径)]，重命名/复制只保留新路径
   """
   changes = []
-  
-  # 获取修改的文件
-  code, stdout, stderr = run_cmd("git diff --name-status")
-  if code == 0:
-    for line in stdout.split('\n'):
-      if line:
-        parts = line.split('\t', 1)
-        if len(parts) == 2:
-          status = parts[0]
-          file_path = parts[1]
-          # 对于重命名的文件，只保留新文件名
-          if '->' in file_path:
-            file_path = file_path.split(' -> ')[1]
-          changes.append((status, file_path))
-  
-  # 获取未跟踪的文件
-  code, stdout, stderr = run_cmd("git ls-files --others --exclude-standard")
-  if code == 0:
-    for file_path in stdout.split('\n'):
-      if file_path:
-        changes.append(('A', file_path))
-  
+  records = output.split('\0')
+  i = 0
+  while i < len(records):
+    record = records[i]
+    i += 1
+    if not record:
+      continue
+    kind = record[0]
+    if kind == '?':
+      # 未跟踪的文件：? <path>
+      changes.append(('A', record[2:]))
+    elif kind in ('1', 'u'):
+      # 普通变更：1 <XY> <sub> <mH> <mI> <mW> <hH> <hI> <path>
+      # 冲突：u <XY> <sub> <m1> <m2> <m3> <mW> <h1> <h2> <h3> <path>
+      fields = record.split(' ', 8 if kind == '1' else 10)
+      xy = fields[1]
+      # 工作区状态优先，其次是暂存区状态
+      status = xy[1] if xy[1] != '.' else xy[0]
+      changes.append(('M' if kind == 'u' else status, fields[-1]))
+    elif kind == '2':
+      # 重命名/复制：2 <XY> <sub> <mH> <mI> <mW> <hH> <hI> <Xscore> <path>，下一条记录为原路径
+      fields = record.split(' ', 9)
+      changes.append((fields[8][0], fields[9]))
+      i += 1
   return changes
 
+def get_git_changes():
+  """
+  获取Git变更记录（一次 git status 调用，包含未跟踪的文件）
+  :return: 变更文件列表
+  """
+  code, stdout, stderr = run_cmd(
+    ['git', 'status', '--porcelain=v2', '-z', '--untracked-files=all'],
+    strip=False
+  )
+  if code != 0:
+    print(f"获取Git变更失败: {stderr}")
+    return []
+  return parse_porcelain_v2(stdout)
+
 def get_operation_type(status):
   """
   根据Git状态获取操作类型
@@ -111,22 +132,28 @@ def get_operation_type(status):
   }
   return status_map.get(status, '修改文件')
 
-def is_ignored(file_path):
+def get_ignored_files(file_paths):
   """
-  检查文件是否应该被忽略
-  :param file_path: 文件路径
-  :return: 是否忽略
+  批量检查需要忽略的文件（一次 git check-ignore --stdin 调用）
+  :param file_paths: 文件路径列表
+  :return: 需要忽略的文件路径集合
   """
-  # 忽略.gitignore过滤的文件
-  code, stdout, stderr = run_cmd(f"git check-ignore {file_path}")
-  if code == 0:
-    return True
+  ignored = set()
+  
+  # 忽略.gitignore过滤的文件（返回码 1 表示没有被忽略的文件）
+  if file_paths:
+    code, stdout, stderr = run_cmd(
+      ['git', 'check-ignore', '--stdin', '-z'],
+      input_data=''.join(f"{path}\0" for path in file_paths),
+      strip=False
+    )
+    if code == 0:
+      ignored.update(path for path in stdout.split('\0') if path)
   
   # 忽略UPDATE_LOG.md自身
-  if os.path.basename(file_path) == "UPDATE_LOG.md":
-    return True
+  ignored.update(path for path in file_paths if os.path.basename(path) == "UPDATE_LOG.md")
   
-  return False
+  return ignored
 
 def update_log():
   """
@@ -145,22 +172,18 @@ def update_log():
     print("没有发现变更")
     return False
   
-  # 读取现有日志
-  with open(update_log_path, 'r', encoding='utf-8') as f:
-    content = f.read()
-  
-  # 提取更新记录部分
-  log_section_match = re.search(r'## 更新记录\n(.*)', content, re.DOTALL)
-  if not log_section_match:
-    print("UPDATE_LOG.md格式不正确")
+  # 打开索引存储（UPDATE_LOG.md 有手工修改时自动重新导入）
+  conn = open_store(update_log_path)
+  if conn is None:
     return False
   
-  existing_logs = log_section_match.group(1)
-  
   # 检查变更是否已经在日志中
+  ignored_files = get_ignored_files([file_path for _, file_path in changes])
+  # 同一次运行的记录使用同一个时间戳（只调用一次 GET_TIME.py）
+  beijing_time = get_beijing_time()
   new_entries = []
   for status, file_path in changes:
-    if is_ignored(file_path):
+    if file_path in ignored_files:
       continue
     
     # 检查文件是否已经在最近的日志中
@@ -178,25 +201,19 @@ def update_log():
       summary = "重命名文件"
     
     # 生成日志条目
-    beijing_time = get_beijing_time()
     entry = f"{beijing_time} 【{operation_type}】 : {relative_path} - {summary}"
     
-    # 检查条目是否已存在
-    if entry not in existing_logs:
-      new_entries.append(entry)
+    new_entries.append(entry)
+  
+  # 写入存储并渲染UPDATE_LOG.md（已存在的条目由唯一索引跳过）
+  added = append_entries(conn, new_entries, update_log_path)
+  conn.close()
   
-  if not new_entries:
+  if not added:
     print("没有新的变更需要更新到日志")
     return False
   
-  # 更新日志文件
-  new_logs = '\n'.join(new_entries) + '\n' + existing_logs
-  new_content = content.replace(existing_logs, new_logs)
-  
-  with open(update_log_path, 'w', encoding='utf-8') as f:
-    f.write(new_content)
-  
-  print(f"成功更新UPDATE_LOG.md，添加了{len(new_entries)}条记录")
+  print(f"成功更新UPDATE_LOG.md，添加了{added}条记录")
   return True
 
 def main():
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+更新日志索引存储 - Python 版本
+为 UPDATE_LOG.md 维护一个 SQLite 旁路存储（.update_log.db），按路径和时间戳建立索引，
+UPDATE_LOG.md 由存储渲染生成。
+
+- 查询某个文件最近一次更新、判断记录是否已存在均走索引，不再整文件扫描
+- 追加记录只写入新行，再按顺序渲染 UPDATE_LOG.md
+- UPDATE_LOG.md 被手工编辑（大小或修改时间变化）时自动重新导入，手工编辑仍然有效
+"""
+
+import os
+import re
+import sqlite3
+import sys
+
+# 日志文件与旁路存储路径（项目根目录）
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+UPDATE_LOG_PATH = os.path.join(PROJECT_ROOT, "UPDATE_LOG.md")
+STORE_PATH = os.path.join(PROJECT_ROOT, ".update_log.db")
+
+# 更新记录部分的标题
+LOG_SECTION_HEADER = "## 更新记录\n"
+
+# 记录格式：[YYYY-MM-DD HH:MM:SS] 【操作类型】 : 路径信息 - 更新简述
+ENTRY_PATTERN = re.compile(r'^\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\] 【([^】]+)】 : (.+?) - (.*)$')
+
+# 存储结构：seq 决定渲染顺序（越大越靠前），line 保存原始行，保证渲染结果与原文件一致
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+  key TEXT PRIMARY KEY,
+  value TEXT
+);
+CREATE TABLE IF NOT EXISTS entries (
+  seq INTEGER PRIMARY KEY,
+  line TEXT NOT NULL UNIQUE,
+  timestamp TEXT,
+  operation TEXT,
+  path TEXT,
+  name TEXT,
+  summary TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_entries_path ON entries (path, timestamp);
+CREATE INDEX IF NOT EXISTS idx_entries_name ON entries (name, timestamp);
+CREATE INDEX IF NOT EXISTS idx_entries_timestamp ON entries (timestamp);
+"""
+
+def parse_entry(line):
+  """
+  解析一条日志记录
+  :param line: 日志行
+  :return: (时间戳, 操作类型, 路径, 文件名, 简述)，不符合格式时字段均为 None
+  """
+  match = ENTRY_PATTERN.match(line)
+  if not match:
+    return None, None, None, None, None
+  timestamp, operation, path, summary = match.groups()
+  path = path.strip()
+  return timestamp, operation, path, os.path.basename(path.rstrip('/')), summary
+
+def get_file_signature(file_path):
+  """
+  获取文件签名（大小和修改时间），用于判断 UPDATE_LOG.md 是否在存储之外被修改
+  :param file_path: 文件路径
+  :return: 签名字符串
+  """
+  stat = os.stat(file_path)
+  return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+def get_meta(conn, key):
+  """
+  读取元数据
+  :param conn: 数据库连接
+  :param key: 键
+  :return: 值，不存在时返回 None
+  """
+  row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+  return row[0] if row else None
+
+def set_meta(conn, key, value):
+  """
+  写入元数据
+  :param conn: 数据库连接
+  :param key: 键
+  :param value: 值
+  """
+  conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+def import_log(conn, update_log_path):
+  """
+  从 UPDATE_LOG.md 全量导入（仅在文件被手工修改后执行）
+  :param conn: 数据库连接
+  :param update_log_path: UPDATE_LOG.md 路径
+  :return: 是否导入成功
+  """
+  with open(update_log_path, 'r', encoding='utf-8') as f:
+    content = f.read()
+
+  index = content.find(LOG_SECTION_HEADER)
+  if index < 0:
+    print("UPDATE_LOG.md格式不正确")
+    return False
+
+  header = content[:index + len(LOG_SECTION_HEADER)]
+  lines = content[len(header):].split('\n')
+  # 保留末尾是否有换行，渲染时原样还原
+  trailing_newline = lines[-1] == ''
+  if trailing_newline:
+    lines.pop()
+
+  # 文件中靠前的记录更新，seq 更大；重复行只保留第一次出现的位置
+  rows = []
+  seen = set()
+  for position, line in enumerate(lines):
+    if line in seen:
+      continue
+    seen.add(line)
+    rows.append((len(lines) - position, line) + parse_entry(line))
+
+  with conn:
+    conn.execute("DELETE FROM entries")
+    conn.executemany(
+      "INSERT INTO entries (seq, line, timestamp, operation, path, name, summary) VALUES (?, ?, ?, ?, ?, ?, ?)",
+      rows
+    )
+    set_meta(conn, 'header', header)
+    set_meta(conn, 'trailing_newline', '1' if trailing_newline else '0')
+    set_meta(conn, 'signature', get_file_signature(update_log_path))
+  return True
+
+def open_store(update_log_path=UPDATE_LOG_PATH, store_path=STORE_PATH):
+  """
+  打开旁路存储，UPDATE_LOG.md 有外部修改时先重新导入
+  :param update_log_path: UPDATE_LOG.md 路径
+  :param store_path: 存储文件路径
+  :return: 数据库连接，UPDATE_LOG.md 不存在或格式不正确时返回 None
+  """
+  if not os.path.exists(update_log_path):
+    return None
+
+  conn = sqlite3.connect(store_path)
+  conn.executescript(SCHEMA)
+  if get_meta(conn, 'signature') != get_file_signature(update_log_path):
+    if not import_log(conn, update_log_path):
+      conn.close()
+      return None
+  return conn
+
+def render_log(conn, update_log_path=UPDATE_LOG_PATH):
+  """
+  由存储渲染 UPDATE_LOG.md
+  :param conn: 数据库连接
+  :param update_log_path: UPDATE_LOG.md 路径
+  """
+  lines = [row[0] for row in conn.execute("SELECT line FROM entries ORDER BY seq DESC")]
+  content = get_meta(conn, 'header') + '\n'.join(lines)
+  if lines and get_meta(conn, 'trailing_newline') == '1':
+    content += '\n'
+
+  with open(update_log_path, 'w', encoding='utf-8', newline='\n') as f:
+    f.write(content)
+
+  with conn:
+    set_meta(conn, 'signature', get_file_signature(update_log_path))
+
+def append_entries(conn, entries, update_log_path=UPDATE_LOG_PATH):
+  """
+  追加日志记录（已存在的记录自动跳过），有新记录时重新渲染 UPDATE_LOG.md
+  :param conn: 数据库连接
+  :param entries: 日志行列表，列表中靠前的记录显示在前面
+  :param update_log_path: UPDATE_LOG.md 路径
+  :return: 实际新增的记录数
+  """
+  added = 0
+  with conn:
+    seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM entries").fetchone()[0]
+    for line in reversed(entries):
+      cursor = conn.execute(
+        "INSERT OR IGNORE INTO entries (seq, line, timestamp, operation, path, name, summary) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        (seq + 1, line) + parse_entry(line)
+      )
+      if cursor.rowcount:
+        seq += 1
+        added += 1
+
+  if added:
+    render_log(conn, update_log_path)
+  return added
+
+def find_latest_summary(conn, file_name):
+  """
+  查找文件最近一次更新的简述
+  :param conn: 数据库连接
+  :param file_name: 文件名（不包含路径）或相对路径
+  :return: 更新简述，如果未找到则返回空字符串
+  """
+  column = 'path' if '/' in file_name else 'name'
+  row = conn.execute(
+    f"SELECT summary FROM entries WHERE {column} = ? ORDER BY timestamp DESC, seq DESC LIMIT 1",
+    (file_name,)
+  ).fetchone()
+  return row[0] if row else ""
+
+def main():
+  print("==== 重建更新日志索引 ====\n")
+
+  if os.path.exists(STORE_PATH):
+    os.remove(STORE_PATH)
+
+  conn = open_store()
+  if conn is None:
+    print("UPDATE_LOG.md不存在或格式不正确")
+    return 1
+
+  count = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+  conn.close()
+  print(f"已导入{count}条记录到 {os.path.basename(STORE_PATH)}")
+  return 0
+
+if __name__ == "__main__":
+  sys.exit(main())
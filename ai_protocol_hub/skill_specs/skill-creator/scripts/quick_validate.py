@@ -9,79 +9,95 @@ import re
 import yaml
 from pathlib import Path
 
-def validate_skill(skill_path):
-    """Basic validation of a skill"""
-    skill_path = Path(skill_path)
+# Define allowed properties
+ALLOWED_PROPERTIES = {'name', 'description', 'license', 'allowed-tools', 'metadata'}
 
-    # Check SKILL.md exists
-    skill_md = skill_path / 'SKILL.md'
-    if not skill_md.exists():
-        return False, "SKILL.md not found"
+# Prefer the libyaml-backed loader when available
+SafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
 
-    # Read and validate frontmatter
-    content = skill_md.read_text()
+
+def check_skill_md(content):
+    """Collect every validation error in SKILL.md content"""
     if not content.startswith('---'):
-        return False, "No YAML frontmatter found"
+        return ["No YAML frontmatter found"]
 
     # Extract frontmatter
     match = re.match(r'^---\n(.*?)\n---', content, re.DOTALL)
     if not match:
-        return False, "Invalid frontmatter format"
+        return ["Invalid frontmatter format"]
 
     frontmatter_text = match.group(1)
 
     # Parse YAML frontmatter
     try:
-        frontmatter = yaml.safe_load(frontmatter_text)
+        frontmatter = yaml.load(frontmatter_text, Loader=SafeLoader)
         if not isinstance(frontmatter, dict):
-            return False, "Frontmatter must be a YAML dictionary"
+            return ["Frontmatter must be a YAML dictionary"]
     except yaml.YAMLError as e:
-        return False, f"Invalid YAML in frontmatter: {e}"
+        return [f"Invalid YAML in frontmatter: {e}"]
 
-    # Define allowed properties
-    ALLOWED_PROPERTIES = {'name', 'description', 'license', 'allowed-tools', 'metadata'}
+    errors = []
 
     # Check for unexpected properties (excluding nested keys under metadata)
     unexpected_keys = set(frontmatter.keys()) - ALLOWED_PROPERTIES
     if unexpected_keys:
-        return False, (
+        errors.append(
             f"Unexpected key(s) in SKILL.md frontmatter: {', '.join(sorted(unexpected_keys))}. "
             f"Allowed properties are: {', '.join(sorted(ALLOWED_PROPERTIES))}"
         )
 
     # Check required fields
     if 'name' not in frontmatter:
-        return False, "Missing 'name' in frontmatter"
+        errors.append("Missing 'name' in frontmatter")
     if 'description' not in frontmatter:
-        return False, "Missing 'description' in frontmatter"
+        errors.append("Missing 'description' in frontmatter")
 
     # Extract name for validation
     name = frontmatter.get('name', '')
     if not isinstance(name, str):
-        return False, f"Name must be a string, got {type(name).__name__}"
+        errors.append(f"Name must be a string, got {type(name).__name__}")
+        name = ''
     name = name.strip()
     if name:
         # Check naming convention (hyphen-case: lowercase with hyphens)
         if not re.match(r'^[a-z0-9-]+$', name):
-            return False, f"Name '{name}' should be hyphen-case (lowercase letters, digits, and hyphens only)"
-        if name.startswith('-') or name.endswith('-') or '--' in name:
-            return False, f"Name '{name}' cannot start/end with hyphen or contain consecutive hyphens"
+            errors.append(f"Name '{name}' should be hyphen-case (lowercase letters, digits, and hyphens only)")
+        elif name.startswith('-') or name.endswith('-') or '--' in name:
+            errors.append(f"Name '{name}' cannot start/end with hyphen or contain consecutive hyphens")
         # Check name length (max 64 characters per spec)
         if len(name) > 64:
-            return False, f"Name is too long ({len(name)} characters). Maximum is 64 characters."
+            errors.append(f"Name is too long ({len(name)} characters). Maximum is 64 characters.")
 
     # Extract and validate description
     description = frontmatter.get('description', '')
     if not isinstance(description, str):
-        return False, f"Description must be a string, got {type(description).__name__}"
+        errors.append(f"Description must be a string, got {type(description).__name__}")
+        description = ''
     description = description.strip()
     if description:
         # Check for angle brackets
         if '<' in description or '>' in description:
-            return False, "Description cannot contain angle brackets (< or >)"
+            errors.append("Description cannot contain angle brackets (< or >)")
         # Check description length (max 1024 characters per spec)
         if len(description) > 1024:
-            return False, f"Description is too long ({len(description)} characters). Maximum is 1024 characters."
+            errors.append(f"Description is too long ({len(description)} characters). Maximum is 1024 characters.")
+
+    return errors
+
+
+def validate_skill(skill_path):
+    """Basic validation of a skill"""
+    skill_path = Path(skill_path)
+
+    # Check SKILL.md exists
+    skill_md = skill_path / 'SKILL.md'
+    if not skill_md.exists():
+        return False, "SKILL.md not found"
+
+    # Read and validate frontmatter
+    errors = check_skill_md(skill_md.read_text(encoding='utf-8'))
+    if errors:
+        return False, errors[0]
 
     return True, "Skill is valid!"
 
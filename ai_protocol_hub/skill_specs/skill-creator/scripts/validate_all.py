@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Bulk skill validation - validates every skill under the skill trees at once
+
+Walks each root for folders containing SKILL.md, validates them in parallel and
+reports every error in one pass. Results are cached by SKILL.md content hash
+(and the validator's own hash), so unchanged skills and identical copies in
+duplicated trees are only parsed once.
+
+Usage:
+    python validate_all.py [skill-root ...] [--no-cache] [--cache <path>]
+
+Example:
+    python validate_all.py
+    python validate_all.py .trae/skills ai_protocol_hub/skill_specs
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from quick_validate import check_skill_md
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+# scripts -> skill-creator -> skill tree -> tree parent -> project root
+PROJECT_ROOT = SCRIPT_DIR.parents[3]
+
+DEFAULT_ROOTS = ['.trae/skills', 'ai_protocol_hub/skill_specs']
+DEFAULT_CACHE = PROJECT_ROOT / '.skill-validate-cache.json'
+
+# Below this many uncached files, process start-up costs more than it saves
+PROCESS_POOL_THRESHOLD = 8
+
+
+def find_skills(roots):
+    """
+    Find skill folders (direct children containing SKILL.md) under each root.
+
+    Returns:
+        Tuple of (skill folders, folders missing SKILL.md)
+    """
+    skills = []
+    missing = []
+    for root in roots:
+        if not root.is_dir():
+            continue
+        for entry in sorted(root.iterdir()):
+            if not entry.is_dir() or entry.name.startswith(('.', '__')):
+                continue
+            if (entry / 'SKILL.md').is_file():
+                skills.append(entry)
+            else:
+                missing.append(entry)
+    return skills, missing
+
+
+def read_skill_md(skill_path):
+    """
+    Read SKILL.md and hash its content.
+
+    Returns:
+        Tuple of (sha256 hex digest, decoded content)
+    """
+    data = (skill_path / 'SKILL.md').read_bytes()
+    return hashlib.sha256(data).hexdigest(), data.decode('utf-8', 'replace')
+
+
+def get_validator_hash():
+    """
+    Hash the validation rules so the cache is dropped when they change.
+    """
+    return hashlib.sha256((SCRIPT_DIR / 'quick_validate.py').read_bytes()).hexdigest()
+
+
+def load_cache(cache_path, validator_hash):
+    """
+    Load cached results ({content hash: [errors]}) for the current validator.
+    """
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if cache.get('validator') != validator_hash:
+        return {}
+    return cache.get('results', {})
+
+
+def save_cache(cache_path, validator_hash, results):
+    """
+    Write cached results atomically.
+    """
+    temp_path = f"{cache_path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump({'validator': validator_hash, 'results': results}, f, indent=2, sort_keys=True)
+    os.replace(temp_path, cache_path)
+
+
+def validate_all(roots, cache_path=None):
+    """
+    Validate every skill under the given roots.
+
+    Args:
+        roots: List of skill tree paths
+        cache_path: Cache file path, or None to disable caching
+
+    Returns:
+        Tuple of (number of skills checked, {skill path: [errors]}, cache hits)
+    """
+    skills, missing = find_skills(roots)
+    failures = {path: ["SKILL.md not found"] for path in missing}
+
+    with ThreadPoolExecutor() as executor:
+        contents = dict(zip(skills, executor.map(read_skill_md, skills)))
+
+    validator_hash = get_validator_hash()
+    cached = load_cache(cache_path, validator_hash) if cache_path else {}
+
+    # Validate each distinct SKILL.md content once
+    pending = {}
+    for digest, content in contents.values():
+        if digest not in cached:
+            pending.setdefault(digest, content)
+
+    if pending:
+        pool = ProcessPoolExecutor if len(pending) >= PROCESS_POOL_THRESHOLD else ThreadPoolExecutor
+        with pool() as executor:
+            cached.update(zip(pending, executor.map(check_skill_md, pending.values())))
+
+    for skill_path, (digest, _) in contents.items():
+        if cached[digest]:
+            failures[skill_path] = cached[digest]
+
+    if cache_path and pending:
+        # Keep only results for content that still exists
+        live = {digest for digest, _ in contents.values()}
+        save_cache(cache_path, validator_hash, {digest: cached[digest] for digest in live})
+
+    hits = len({digest for digest, _ in contents.values()}) - len(pending)
+    return len(skills) + len(missing), failures, hits
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Validate every skill in the skill trees')
+    parser.add_argument('roots', nargs='*', help=f"Skill tree paths (default: {', '.join(DEFAULT_ROOTS)} under the project root)")
+    parser.add_argument('--cache', default=str(DEFAULT_CACHE), help='Cache file path')
+    parser.add_argument('--no-cache', action='store_true', help='Validate everything without reading or writing the cache')
+    args = parser.parse_args()
+
+    roots = [Path(root).resolve() for root in args.roots] or [PROJECT_ROOT / root for root in DEFAULT_ROOTS]
+    cache_path = None if args.no_cache else args.cache
+
+    total, failures, hits = validate_all(roots, cache_path)
+
+    print(f"🔍 Validated {total} skill(s) ({hits} unique SKILL.md from cache)")
+    for skill_path in sorted(failures):
+        try:
+            display = skill_path.relative_to(PROJECT_ROOT)
+        except ValueError:
+            display = skill_path
+        print(f"\n❌ {display}")
+        for error in failures[skill_path]:
+            print(f"   - {error}")
+
+    if failures:
+        print(f"\n❌ {len(failures)} of {total} skill(s) failed validation")
+        sys.exit(1)
+
+    print("✅ All skills are valid!")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,41 @@ from playwright.sync_api import sync_playwright
 import time
 import datetime
 
+def attach_error_capture(page, console_logs, page_errors=None, echo_types=("error", "warning")):
+    """
+    为页面挂载控制台日志和页面异常捕获（供其他测试脚本复用）
+
+    参数:
+        page: Playwright 页面
+        console_logs: 用于收集格式化控制台日志的列表
+        page_errors: 用于收集未捕获页面异常的列表，为 None 时异常也记入 console_logs
+        echo_types: 需要实时打印的控制台消息类型
+    """
+    if page_errors is None:
+        page_errors = console_logs
+
+    # 设置控制台日志捕获
+    def handle_console_message(msg):
+        timestamp_str = datetime.datetime.now().strftime("%H:%M:%S")
+        location = f" ({msg.location['url']}:{msg.location['line']}:{msg.location['column']})" if msg.location else ""
+        log_entry = f"[{timestamp_str}] [{msg.type.upper()}] {msg.text}{location}"
+        console_logs.append(log_entry)
+
+        # 只显示错误和警告
+        if msg.type in echo_types:
+            print(log_entry)
+
+    # 设置未捕获异常捕获
+    def handle_page_error(error):
+        timestamp_str = datetime.datetime.now().strftime("%H:%M:%S")
+        log_entry = f"[{timestamp_str}] [PAGEERROR] {error}"
+        page_errors.append(log_entry)
+        print(log_entry)
+
+    page.on("console", handle_console_message)
+    page.on("pageerror", handle_page_error)
+
+
 def capture_browser_errors():
     # 创建带时间戳的日志文件
     timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -16,18 +51,8 @@ def capture_browser_errors():
         browser = p.chromium.launch(headless=False)
         page = browser.new_page(viewport={'width': 1920, 'height': 1080})
         
-        # 设置控制台日志捕获
-        def handle_console_message(msg):
-            timestamp_str = datetime.datetime.now().strftime("%H:%M:%S")
-            location = f" ({msg.location['url']}:{msg.location['line']}:{msg.location['column']})" if msg.location else ""
-            log_entry = f"[{timestamp_str}] [{msg.type.upper()}] {msg.text}{location}"
-            console_logs.append(log_entry)
-            
-            # 只显示错误和警告
-            if msg.type in ["error", "warning"]:
-                print(log_entry)
-        
-        page.on("console", handle_console_message)
+        # 挂载控制台日志和页面异常捕获
+        attach_error_capture(page, console_logs)
         
         # 导航到应用
         page.goto('http://localhost:5173')
@@ -53,7 +78,7 @@ def capture_browser_errors():
         f.write('\n'.join(console_logs))
         f.write(f'\n\n结束时间: {datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")}\n')
     
-    error_count = sum(1 for log in console_logs if "[ERROR]" in log)
+    error_count = sum(1 for log in console_logs if "[ERROR]" in log or "[PAGEERROR]" in log)
     warning_count = sum(1 for log in console_logs if "[WARNING]" in log)
     
     print(f"\n捕获到 {len(console_logs)} 条控制台消息")
@@ -0,0 +1,483 @@
+#!/usr/bin/env python3
+"""
+导出性能基准测试 - 基于 Playwright 的导出流水线回归数据采集
+
+此脚本逐个加载 test_files/ 中的样例文件（test.svga、YYEVA 双通道 MP4、aaa.mp4 等），
+在播放器中依次触发 GIF、WebP、序列帧 ZIP、双通道 MP4、SVGA 导出，并记录：
+- 首帧时间：从选择文件到播放器渲染出首帧的耗时
+- 导出首帧时间：从触发导出到进度首次大于 0 的耗时
+- 导出总耗时：从触发导出到下载完成的耗时
+- JS 堆峰值：导出期间通过 CDP Performance.getMetrics 采样的 JSHeapUsedSize 最大值
+- 输出体积：下载文件的字节数
+
+结果写入带提交号的 JSON 文件，可用 --compare 对比两次提交的结果。
+
+Usage:
+    # 先启动开发服务器（或使用 scripts/with_server.py 托管）
+    python scripts/with_server.py --server "npm run dev" --port 5173 -- \\
+        python examples/export_benchmark.py
+
+    # 只测 GIF 和 WebP
+    python examples/export_benchmark.py --exports gif,webp
+
+    # 对比两次结果（导出耗时/堆峰值/体积劣化超过阈值时返回非 0）
+    python examples/export_benchmark.py --compare old.json new.json --threshold 0.2
+"""
+
+from playwright.sync_api import sync_playwright
+import argparse
+import datetime
+import json
+import os
+import subprocess
+import sys
+import time
+
+
+# 项目根目录（examples -> webapp-testing -> skill_specs -> ai_protocol_hub -> 根目录）
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../..'))
+
+# 默认测试文件目录
+DEFAULT_TEST_FILES_DIR = os.path.join(PROJECT_ROOT, 'test_files')
+
+# 参与基准测试的文件后缀
+BENCHMARK_EXTENSIONS = ('.svga', '.mp4')
+
+# 导出类型定义：打开面板方法、启动方法、配置字段、忙碌标志、进度字段、适用模式
+EXPORTS = {
+    'gif': {
+        'open': 'openGifPanel',
+        'start': 'handleGifExport',
+        'config': 'gifConfig',
+        'busy': 'isExportingGIF',
+        'progress': 'gifExportProgress',
+        'modules': ('svga', 'yyeva', 'mp4')
+    },
+    'webp': {
+        'open': 'openWebpPanel',
+        'start': 'handleWebpExport',
+        'config': 'webpConfig',
+        'busy': 'isExportingWebp',
+        'progress': 'webpExportProgress',
+        'modules': ('svga', 'yyeva', 'mp4')
+    },
+    'frames': {
+        'open': 'openFramesPanel',
+        'start': 'handleFramesExport',
+        'config': 'framesConfig',
+        'busy': 'isExportingFrames',
+        'progress': 'framesExportProgress',
+        'modules': ('svga', 'yyeva', 'mp4')
+    },
+    'dual-channel': {
+        'open': 'openDualChannelPanel',
+        'start': 'handleDualChannelConvert',
+        'config': 'dualChannelConfig',
+        'busy': 'isConvertingToDualChannel',
+        'progress': 'dualChannelProgress',
+        'modules': ('svga', 'mp4')
+    },
+    'svga': {
+        'open': 'openToSvgaPanel',
+        'start': 'handleToSvgaConvert',
+        'config': 'toSvgaConfig',
+        'busy': 'isConvertingToSvga',
+        'progress': 'toSvgaProgress',
+        'modules': ('yyeva', 'mp4')
+    }
+}
+
+# 轮询间隔（秒）
+POLL_INTERVAL = 0.1
+
+# 查询当前已加载文件所属模式的脚本，未加载完成时返回 null
+LOADED_MODULE_JS = '''
+    () => {
+        const app = window.MeeWoo && window.MeeWoo.app;
+        if (!app) return null;
+        const state = app[app.currentModule];
+        return state && state.hasFile ? app.currentModule : null;
+    }
+'''
+
+
+def get_git_commit(cwd=PROJECT_ROOT):
+    """
+    获取当前提交的短哈希
+
+    参数:
+        cwd: git 仓库目录
+
+    返回:
+        str: 短哈希，获取失败时返回 'unknown'
+    """
+    try:
+        result = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=cwd,
+            capture_output=True,
+            text=True,
+            encoding='utf-8'
+        )
+        if result.returncode == 0 and result.stdout.strip():
+            return result.stdout.strip()
+    except Exception:
+        pass
+    return 'unknown'
+
+
+def list_test_files(test_files_dir):
+    """
+    列出参与测试的样例文件（按文件名排序，保证多次运行顺序一致）
+
+    参数:
+        test_files_dir: 测试文件目录
+
+    返回:
+        list: 文件绝对路径列表
+    """
+    files = []
+    for name in sorted(os.listdir(test_files_dir)):
+        path = os.path.join(test_files_dir, name)
+        if os.path.isfile(path) and name.lower().endswith(BENCHMARK_EXTENSIONS):
+            files.append(path)
+    return files
+
+
+def get_js_heap_used(cdp):
+    """
+    通过 CDP 读取当前 JS 堆已用大小
+
+    参数:
+        cdp: CDP 会话（需已执行 Performance.enable）
+
+    返回:
+        int: JSHeapUsedSize（字节）
+    """
+    metrics = cdp.send('Performance.getMetrics')['metrics']
+    for metric in metrics:
+        if metric['name'] == 'JSHeapUsedSize':
+            return int(metric['value'])
+    return 0
+
+
+def open_benchmark_page(browser, server_url, init_script=None, on_page=None):
+    """
+    打开一个干净的播放器页面并建立 CDP 会话
+
+    每个样例文件使用独立的上下文，避免上一个文件的缓存和内存影响下一个文件的数据。
+    页面中的 alert/confirm（导出限制确认、任务确认）会被自动接受。
+
+    参数:
+        browser: Playwright 浏览器实例
+        server_url: 开发服务器URL
+        init_script: 可选，在页面脚本执行前注入的 JS（如性能观察器）
+        on_page: 可选，导航前对页面做额外挂载的回调（如错误捕获）
+
+    返回:
+        tuple: (context, page, cdp)
+    """
+    context = browser.new_context(accept_downloads=True, viewport={'width': 1440, 'height': 900})
+    if init_script:
+        context.add_init_script(init_script)
+    page = context.new_page()
+    page.on('dialog', lambda dialog: dialog.accept())
+    if on_page:
+        on_page(page)
+
+    cdp = context.new_cdp_session(page)
+    cdp.send('Performance.enable')
+
+    page.goto(server_url)
+    page.wait_for_load_state('networkidle')
+    page.wait_for_function('() => window.MeeWoo && window.MeeWoo.app')
+    return context, page, cdp
+
+
+def load_file(page, file_path, timeout=60):
+    """
+    通过"打开文件"输入框加载样例文件，并测量首帧时间
+
+    参数:
+        page: Playwright 页面
+        file_path: 样例文件路径
+        timeout: 等待加载的最长时间（秒）
+
+    返回:
+        tuple: (模式名称, 首帧耗时毫秒)，加载超时返回 (None, None)
+    """
+    file_input = page.locator('input[type="file"][multiple]').last
+    start = time.perf_counter()
+    file_input.set_input_files(file_path)
+
+    deadline = start + timeout
+    module = None
+    while time.perf_counter() < deadline:
+        module = page.evaluate(LOADED_MODULE_JS)
+        if module:
+            break
+        time.sleep(POLL_INTERVAL)
+    if not module:
+        return None, None
+
+    # 等待两次 requestAnimationFrame，确保首帧已提交到画布
+    page.evaluate('() => new Promise(r => requestAnimationFrame(() => requestAnimationFrame(r)))')
+    return module, (time.perf_counter() - start) * 1000
+
+
+def run_export(page, cdp, export_name, timeout=600):
+    """
+    触发一次导出并采集耗时、堆峰值和输出体积
+
+    实现思路：
+    1. 强制 GC 后记录基线堆大小
+    2. 打开对应面板（面板会按源文件填充默认尺寸/帧率），读取配置后调用启动方法
+    3. 轮询忙碌标志和进度，同时采样 JS 堆；收到下载事件或忙碌标志结束即视为完成
+
+    参数:
+        page: Playwright 页面
+        cdp: CDP 会话
+        export_name: EXPORTS 中的导出类型
+        timeout: 单次导出最长等待时间（秒）
+
+    返回:
+        dict: 单次导出的测量结果
+    """
+    spec = EXPORTS[export_name]
+    result = {
+        'export': export_name,
+        'status': 'ok',
+        'first_progress_ms': None,
+        'total_ms': None,
+        'heap_before_mb': None,
+        'peak_heap_mb': None,
+        'output_name': None,
+        'output_bytes': None
+    }
+
+    downloads = []
+    on_download = downloads.append
+    page.on('download', on_download)
+
+    try:
+        cdp.send('HeapProfiler.collectGarbage')
+        heap_before = get_js_heap_used(cdp)
+        peak_heap = heap_before
+
+        page.evaluate(f'() => window.MeeWoo.app.{spec["open"]}()')
+        page.wait_for_timeout(500)
+
+        start = time.perf_counter()
+        page.evaluate(f'''
+            () => {{
+                const app = window.MeeWoo.app;
+                app.{spec["start"]}(Object.assign({{}}, app.{spec["config"]}));
+            }}
+        ''')
+
+        seen_busy = False
+        deadline = start + timeout
+        while time.perf_counter() < deadline:
+            state = page.evaluate(f'''
+                () => {{
+                    const app = window.MeeWoo.app;
+                    return {{ busy: !!app.{spec["busy"]}, progress: Number(app.{spec["progress"]}) || 0 }};
+                }}
+            ''')
+            peak_heap = max(peak_heap, get_js_heap_used(cdp))
+
+            if state['progress'] > 0 and result['first_progress_ms'] is None:
+                result['first_progress_ms'] = round((time.perf_counter() - start) * 1000, 1)
+            seen_busy = seen_busy or state['busy']
+
+            if downloads:
+                break
+            if seen_busy and not state['busy']:
+                # 忙碌标志结束后给下载事件一点时间到达
+                page.wait_for_timeout(2000)
+                break
+            time.sleep(POLL_INTERVAL)
+        else:
+            result['status'] = 'timeout'
+
+        if downloads:
+            download = downloads[0]
+            path = download.path()
+            result['total_ms'] = round((time.perf_counter() - start) * 1000, 1)
+            result['output_name'] = download.suggested_filename
+            result['output_bytes'] = os.path.getsize(path) if path else None
+        elif result['status'] == 'ok':
+            result['status'] = 'no-output'
+
+        result['heap_before_mb'] = round(heap_before / 1024 / 1024, 2)
+        result['peak_heap_mb'] = round(peak_heap / 1024 / 1024, 2)
+    except Exception as e:
+        result['status'] = 'error'
+        result['error'] = str(e)
+    finally:
+        page.remove_listener('download', on_download)
+        page.evaluate('() => window.MeeWoo.app.closeAllPanels && window.MeeWoo.app.closeAllPanels()')
+
+    return result
+
+
+def run_benchmark(server_url, test_files_dir, export_names, output_path, headless=False, timeout=600):
+    """
+    执行完整的导出基准测试并写入 JSON 结果
+
+    参数:
+        server_url: 开发服务器URL
+        test_files_dir: 测试文件目录
+        export_names: 要测试的导出类型列表
+        output_path: 结果 JSON 路径
+        headless: 是否无头模式（测试规范要求本地调试使用有界面模式，CI 可开启）
+        timeout: 单次导出最长等待时间（秒）
+
+    返回:
+        dict: 完整的基准测试结果
+    """
+    report = {
+        'meta': {
+            'commit': get_git_commit(),
+            'timestamp': datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'server_url': server_url,
+            'exports': export_names
+        },
+        'results': []
+    }
+
+    files = list_test_files(test_files_dir)
+    print(f"=== 导出性能基准测试（提交 {report['meta']['commit']}，{len(files)} 个文件）===")
+
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=headless)
+        report['meta']['browser'] = browser.version
+
+        for file_path in files:
+            file_name = os.path.basename(file_path)
+            print(f"\n[{file_name}]")
+            entry = {'file': file_name, 'file_bytes': os.path.getsize(file_path), 'module': None, 'load_ms': None, 'exports': []}
+
+            context, page, cdp = open_benchmark_page(browser, server_url)
+            try:
+                module, load_ms = load_file(page, file_path)
+                if not module:
+                    print("   ✗ 文件加载超时")
+                    entry['status'] = 'load-timeout'
+                    report['results'].append(entry)
+                    continue
+
+                entry['module'] = module
+                entry['load_ms'] = round(load_ms, 1)
+                print(f"   - 模式: {module}，首帧: {entry['load_ms']}ms")
+
+                for export_name in export_names:
+                    if module not in EXPORTS[export_name]['modules']:
+                        continue
+                    result = run_export(page, cdp, export_name, timeout=timeout)
+                    entry['exports'].append(result)
+                    mark = '✓' if result['status'] == 'ok' else '✗'
+                    print(f"   {mark} {export_name}: {result['status']}，总耗时 {result['total_ms']}ms，"
+                          f"堆峰值 {result['peak_heap_mb']}MB，体积 {result['output_bytes']}B")
+            finally:
+                context.close()
+
+            report['results'].append(entry)
+
+        browser.close()
+
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n结果已保存到: {output_path}")
+    return report
+
+
+def compare_reports(old_path, new_path, threshold=0.2):
+    """
+    对比两次基准测试结果，打印差异表
+
+    对每个（文件, 导出类型）比较导出总耗时、堆峰值和输出体积，
+    任一指标相对劣化超过阈值即视为回归。
+
+    参数:
+        old_path: 旧结果 JSON 路径
+        new_path: 新结果 JSON 路径
+        threshold: 回归阈值（相对变化比例）
+
+    返回:
+        int: 回归项数量
+    """
+    with open(old_path, 'r', encoding='utf-8') as f:
+        old = json.load(f)
+    with open(new_path, 'r', encoding='utf-8') as f:
+        new = json.load(f)
+
+    def index(report):
+        return {
+            (entry['file'], item['export']): item
+            for entry in report['results']
+            for item in entry.get('exports', [])
+        }
+
+    old_index = index(old)
+    new_index = index(new)
+    metrics = ('total_ms', 'peak_heap_mb', 'output_bytes')
+    regressions = 0
+
+    print(f"=== 对比 {old['meta']['commit']} -> {new['meta']['commit']}（阈值 {threshold:.0%}）===")
+    for key in sorted(new_index):
+        if key not in old_index:
+            print(f"{key[0]} / {key[1]}: 新增项，无基线")
+            continue
+        cells = []
+        for metric in metrics:
+            before = old_index[key].get(metric)
+            after = new_index[key].get(metric)
+            if not before or after is None:
+                cells.append(f"{metric}=n/a")
+                continue
+            delta = (after - before) / before
+            flag = ''
+            if delta > threshold:
+                flag = ' ✗'
+                regressions += 1
+            cells.append(f"{metric}={before}->{after} ({delta:+.1%}){flag}")
+        print(f"{key[0]} / {key[1]}: " + '，'.join(cells))
+
+    print(f"\n回归项: {regressions}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='导出性能基准测试')
+    parser.add_argument('--url', default='http://localhost:5173/', help='开发服务器URL（默认: http://localhost:5173/）')
+    parser.add_argument('--test-files', default=DEFAULT_TEST_FILES_DIR, help='样例文件目录（默认: 项目根目录 test_files）')
+    parser.add_argument('--exports', default=','.join(EXPORTS), help=f"逗号分隔的导出类型（默认: {','.join(EXPORTS)}）")
+    parser.add_argument('--output', default=None, help='结果 JSON 路径（默认: benchmark_results/export_<提交>_<时间>.json）')
+    parser.add_argument('--timeout', type=int, default=600, help='单次导出最长等待秒数（默认: 600）')
+    parser.add_argument('--headless', action='store_true', help='无头模式运行（仅用于 CI）')
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help='对比两份结果 JSON')
+    parser.add_argument('--threshold', type=float, default=0.2, help='对比回归阈值（默认: 0.2，即 20%%）')
+    args = parser.parse_args()
+
+    if args.compare:
+        regressions = compare_reports(args.compare[0], args.compare[1], args.threshold)
+        sys.exit(1 if regressions else 0)
+
+    export_names = [name.strip() for name in args.exports.split(',') if name.strip()]
+    unknown = [name for name in export_names if name not in EXPORTS]
+    if unknown:
+        print(f"错误：未知的导出类型: {', '.join(unknown)}")
+        sys.exit(1)
+
+    output_path = args.output
+    if not output_path:
+        timestamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
+        output_path = os.path.join('benchmark_results', f'export_{get_git_commit()}_{timestamp}.json')
+
+    run_benchmark(args.url, args.test_files, export_names, output_path, headless=args.headless, timeout=args.timeout)
+
+
+if __name__ == '__main__':
+    main()
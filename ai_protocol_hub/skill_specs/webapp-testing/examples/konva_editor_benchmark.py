@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+Konva 素材编辑器交互基准测试 - 批量编辑操作的延迟分位数与规模上限
+
+此脚本在播放器页面中注入 Konva 模块化组件（舞台、元素、变换器、命令系统）
+和 test_files/performance_test.js 中的 PerformanceTest 计时器，然后按不同元素规模
+（默认 50/100/250/500）批量执行素材编辑器的核心操作：
+- 拖拽：dragstart -> 多次 dragmove -> dragend，并通过 konva-command.js 提交变换命令
+- 变换：挂载 Transformer 后提交缩放/旋转命令
+- 文案编辑：通过更新命令修改 Konva.Text 的内容
+- 撤销/重做：KonvaCommand.undo / KonvaCommand.redo
+
+每个操作用 PerformanceTest.startTest/endTest 计时，汇总 p50/p90/p95/p99/max，
+任一操作的指定分位数超过阈值即判定失败（返回非 0）。
+开启 --find-limit 后会按倍数递增元素数量，自动测出所有操作仍达标的最大规模。
+
+Usage:
+    python scripts/with_server.py --server "npm run dev" --port 5173 -- \\
+        python examples/konva_editor_benchmark.py --scales 50,100,250,500
+
+    # 自定义阈值（毫秒）并自动探测规模上限
+    python examples/konva_editor_benchmark.py --threshold drag=50 --threshold undo=30 --find-limit
+"""
+
+from playwright.sync_api import sync_playwright
+import argparse
+import json
+import math
+import os
+import sys
+
+
+# 项目根目录（examples -> webapp-testing -> skill_specs -> ai_protocol_hub -> 根目录）
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../..'))
+
+# 需要注入的 Konva 模块（index.html 只加载了 konva-editor-core.js / konva-text-editor.js）
+KONVA_MODULES = [
+    'src/assets/js/core/konva-performance.js',
+    'src/assets/js/core/konva-stage.js',
+    'src/assets/js/core/konva-element.js',
+    'src/assets/js/core/konva-transformer.js',
+    'src/assets/js/core/konva-command.js'
+]
+
+# PerformanceTest 计时器脚本
+PERFORMANCE_TEST_SCRIPT = 'test_files/performance_test.js'
+
+# 参与统计的操作
+OPERATIONS = ('drag', 'transform', 'text_edit', 'undo', 'redo')
+
+# 默认阈值：与 performance_test.js 的性能目标一致（编辑操作响应不超过 100ms）
+DEFAULT_THRESHOLD_MS = 100
+
+# 统计的分位数
+PERCENTILES = (50, 90, 95, 99)
+
+# 页面内执行的批量编辑脚本，返回每种操作的耗时列表（毫秒）
+EDITOR_BENCHMARK_JS = '''
+async ({ elementCount, iterations }) => {
+    const Core = window.MeeWoo.Core;
+    const perf = window.PerformanceTest;
+    const durations = { drag: [], transform: [], text_edit: [], undo: [], redo: [] };
+    let seq = 0;
+
+    // 用 PerformanceTest 计时，测试名带序号避免覆盖
+    const timed = (op, fn) => {
+        const name = `bench-${op}-${elementCount}-${seq++}`;
+        perf.startTest(name);
+        fn();
+        durations[op].push(perf.endTest(name));
+        delete perf.results[name];
+    };
+
+    const container = document.createElement('div');
+    container.id = 'konva-bench-container';
+    container.style.cssText = 'position:fixed;left:0;top:0;width:1280px;height:800px;z-index:-1;';
+    document.body.appendChild(container);
+
+    const stageInstance = Core.KonvaStage.initStage('konva-bench-container', { width: 1280, height: 800 });
+    const layer = stageInstance.layers.editLayer;
+    const commandState = Core.KonvaCommand.initCommandManager(stageInstance, { maxHistorySize: iterations * 4 });
+    const transformerState = Core.KonvaTransformer.initTransformer(stageInstance, {});
+
+    // 按 3:1 的比例创建矩形（底图替身）和文本（文案层）
+    const elements = [];
+    const texts = [];
+    for (let i = 0; i < elementCount; i++) {
+        const isText = i % 4 === 3;
+        const element = Core.KonvaElement.createElement(isText ? 'text' : 'rect', isText ? {
+            x: Math.random() * 1180, y: Math.random() * 760, text: '文案 ' + i, fontSize: 18, fill: '#333333'
+        } : {
+            x: Math.random() * 1180, y: Math.random() * 700, width: 100, height: 100,
+            fill: '#ff6600', stroke: '#000000', strokeWidth: 1
+        });
+        Core.KonvaElement.addElementToLayer(element, layer);
+        elements.push(element);
+        if (isText) texts.push(element);
+    }
+    layer.draw();
+
+    const pick = (list) => list[Math.floor(Math.random() * list.length)];
+    const nextFrame = () => new Promise((resolve) => requestAnimationFrame(resolve));
+
+    for (let i = 0; i < iterations; i++) {
+        // 拖拽
+        const dragTarget = pick(elements);
+        timed('drag', () => {
+            const oldTransform = Core.KonvaCommand.saveTransformState(dragTarget);
+            dragTarget.fire('dragstart');
+            for (let step = 1; step <= 10; step++) {
+                dragTarget.x(oldTransform.x + step * 3);
+                dragTarget.y(oldTransform.y + step * 2);
+                dragTarget.fire('dragmove');
+                layer.batchDraw();
+            }
+            dragTarget.fire('dragend');
+            const newTransform = Core.KonvaCommand.saveTransformState(dragTarget);
+            Core.KonvaCommand.executeCommand(commandState,
+                Core.KonvaCommand.createTransformElementCommand(commandState, dragTarget, newTransform, oldTransform));
+        });
+
+        // 变换（缩放 + 旋转）
+        const transformTarget = pick(elements);
+        timed('transform', () => {
+            Core.KonvaTransformer.attachTransformer(transformerState, transformTarget);
+            const newTransform = Object.assign(Core.KonvaCommand.saveTransformState(transformTarget), {
+                scaleX: 1 + Math.random(), scaleY: 1 + Math.random(), rotation: Math.random() * 360
+            });
+            Core.KonvaCommand.executeCommand(commandState,
+                Core.KonvaCommand.createTransformElementCommand(commandState, transformTarget, newTransform));
+        });
+
+        // 文案编辑
+        if (texts.length) {
+            const textTarget = pick(texts);
+            timed('text_edit', () => {
+                Core.KonvaCommand.executeCommand(commandState,
+                    Core.KonvaCommand.createUpdateElementCommand(commandState, textTarget, { text: '编辑后的文案 ' + i + '\\n第二行' }));
+            });
+        }
+
+        // 撤销 + 重做
+        timed('undo', () => Core.KonvaCommand.undo(commandState));
+        timed('redo', () => Core.KonvaCommand.redo(commandState));
+
+        // 让出一帧，避免整个测试阻塞在一个任务里
+        await nextFrame();
+    }
+
+    Core.KonvaTransformer.destroyTransformer(transformerState);
+    Core.KonvaStage.destroyStage(stageInstance);
+    document.body.removeChild(container);
+    return durations;
+}
+'''
+
+
+def percentile(values, pct):
+    """
+    计算分位数（最近秩法）
+
+    参数:
+        values: 数值列表
+        pct: 分位数（0-100）
+
+    返回:
+        float: 分位数值，列表为空时返回 None
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def summarize(durations):
+    """
+    汇总每种操作的分位数
+
+    参数:
+        durations: {操作: 耗时列表}
+
+    返回:
+        dict: {操作: {'count', 'p50', 'p90', 'p95', 'p99', 'max'}}
+    """
+    summary = {}
+    for op in OPERATIONS:
+        values = durations.get(op) or []
+        stats = {'count': len(values)}
+        for pct in PERCENTILES:
+            stats[f'p{pct}'] = percentile(values, pct)
+        stats['max'] = max(values) if values else None
+        summary[op] = stats
+    return summary
+
+
+def check_thresholds(summary, thresholds, pct_key):
+    """
+    检查各操作的分位数是否超出阈值
+
+    参数:
+        summary: summarize() 的结果
+        thresholds: {操作: 阈值毫秒}
+        pct_key: 参与判定的分位数字段，如 'p95'
+
+    返回:
+        list: 超标描述列表，为空表示全部达标
+    """
+    failures = []
+    for op, stats in summary.items():
+        value = stats.get(pct_key)
+        limit = thresholds.get(op, DEFAULT_THRESHOLD_MS)
+        if value is not None and value > limit:
+            failures.append(f"{op} {pct_key}={value}ms > {limit}ms")
+    return failures
+
+
+def prepare_page(page, server_url):
+    """
+    打开页面并注入 Konva 模块与 PerformanceTest 计时器
+
+    参数:
+        page: Playwright 页面
+        server_url: 开发服务器URL
+    """
+    page.goto(server_url)
+    page.wait_for_load_state('networkidle')
+    page.wait_for_function('() => typeof Konva !== "undefined" && window.MeeWoo && window.MeeWoo.Core')
+
+    for module in KONVA_MODULES:
+        page.add_script_tag(path=os.path.join(PROJECT_ROOT, module))
+    page.add_script_tag(path=os.path.join(PROJECT_ROOT, PERFORMANCE_TEST_SCRIPT))
+    page.wait_for_function('() => window.PerformanceTest && window.MeeWoo.Core.KonvaCommand')
+
+    # performance_test.js 注入后会自动跑一轮自带测试，等待其结束再开始批量测试
+    page.wait_for_timeout(1500)
+
+
+def run_scale(page, element_count, iterations):
+    """
+    在指定元素规模下执行批量编辑操作
+
+    参数:
+        page: Playwright 页面
+        element_count: 舞台上的元素数量
+        iterations: 每种操作的执行次数
+
+    返回:
+        dict: 各操作的分位数汇总
+    """
+    durations = page.evaluate(EDITOR_BENCHMARK_JS, {'elementCount': element_count, 'iterations': iterations})
+    return summarize(durations)
+
+
+def print_scale_result(element_count, summary, failures):
+    """
+    打印单个规模的结果表
+
+    参数:
+        element_count: 元素数量
+        summary: 各操作的分位数汇总
+        failures: 超标描述列表
+    """
+    mark = '✓' if not failures else '✗'
+    print(f"\n[{mark}] {element_count} 个元素")
+    print('   ' + '操作'.ljust(10) + ''.join(f'p{pct}'.rjust(8) for pct in PERCENTILES) + 'max'.rjust(8))
+    for op, stats in summary.items():
+        cells = ''.join(str(stats[f'p{pct}']).rjust(8) for pct in PERCENTILES)
+        print('   ' + op.ljust(10) + cells + str(stats['max']).rjust(8))
+    for failure in failures:
+        print(f"   ✗ {failure}")
+
+
+def parse_thresholds(items):
+    """
+    解析 --threshold op=ms 参数
+
+    参数:
+        items: 形如 ['drag=50', 'undo=30'] 的列表
+
+    返回:
+        dict: {操作: 阈值毫秒}
+    """
+    thresholds = {}
+    for item in items or []:
+        op, _, value = item.partition('=')
+        if op not in OPERATIONS or not value:
+            raise ValueError(f"无效的阈值配置: {item}（可用操作: {', '.join(OPERATIONS)}）")
+        thresholds[op] = float(value)
+    return thresholds
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Konva 素材编辑器交互基准测试')
+    parser.add_argument('--url', default='http://localhost:5173/', help='开发服务器URL（默认: http://localhost:5173/）')
+    parser.add_argument('--scales', default='50,100,250,500', help='逗号分隔的元素规模（默认: 50,100,250,500）')
+    parser.add_argument('--iterations', type=int, default=50, help='每种操作在每个规模下的执行次数（默认: 50）')
+    parser.add_argument('--percentile', type=int, default=95, choices=PERCENTILES, help='判定阈值使用的分位数（默认: 95）')
+    parser.add_argument('--threshold', action='append', help=f'操作阈值，格式 op=ms，可重复（默认每项 {DEFAULT_THRESHOLD_MS}ms）')
+    parser.add_argument('--find-limit', action='store_true', help='按倍数递增元素数量，探测所有操作仍达标的最大规模')
+    parser.add_argument('--max-elements', type=int, default=8000, help='规模探测的上限（默认: 8000）')
+    parser.add_argument('--output', default=None, help='结果 JSON 路径（不指定则只打印）')
+    parser.add_argument('--headless', action='store_true', help='无头模式运行（仅用于 CI）')
+    args = parser.parse_args()
+
+    try:
+        thresholds = parse_thresholds(args.threshold)
+    except ValueError as e:
+        print(f"错误：{e}")
+        sys.exit(2)
+
+    pct_key = f'p{args.percentile}'
+    scales = [int(value) for value in args.scales.split(',') if value.strip()]
+    report = {'percentile': pct_key, 'thresholds': thresholds, 'scales': {}, 'scaling_limit': None}
+    failed = False
+
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=args.headless)
+        page = browser.new_page(viewport={'width': 1280, 'height': 800})
+        page.on('pageerror', lambda error: print(f"[Page Error] {error}"))
+
+        try:
+            print("=== Konva 素材编辑器交互基准测试 ===")
+            prepare_page(page, args.url)
+
+            for element_count in scales:
+                summary = run_scale(page, element_count, args.iterations)
+                failures = check_thresholds(summary, thresholds, pct_key)
+                report['scales'][element_count] = {'summary': summary, 'failures': failures}
+                print_scale_result(element_count, summary, failures)
+                failed = failed or bool(failures)
+
+            if args.find_limit:
+                print("\n=== 探测规模上限 ===")
+                element_count = max(scales) if scales else 50
+                limit = None
+                while element_count <= args.max_elements:
+                    summary = run_scale(page, element_count, args.iterations)
+                    failures = check_thresholds(summary, thresholds, pct_key)
+                    print_scale_result(element_count, summary, failures)
+                    if failures:
+                        break
+                    limit = element_count
+                    element_count *= 2
+                report['scaling_limit'] = limit
+                print(f"\n规模上限（{pct_key} 全部达标）: {limit if limit is not None else '低于起始规模'}")
+        finally:
+            browser.close()
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n结果已保存到: {args.output}")
+
+    print(f"\n{'❌ 存在超出阈值的操作' if failed else '✅ 所有规模均达标'}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
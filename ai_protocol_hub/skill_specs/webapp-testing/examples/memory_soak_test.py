@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+内存泄漏浸泡测试 - 长时间反复加载文件和开关导出面板，检测内存持续增长
+
+运营同学的浏览器会长时间挂着播放器，内存缓慢膨胀很难靠手测发现。
+此脚本在同一个页面中循环执行"加载文件 -> 逐个打开/关闭导出面板"：
+- 样例文件：test.svga 和 test_files/ 中带 *_yyeva_data.json 的 YYEVA 双通道 MP4
+- 每轮把所有样例各加载一次，并打开/关闭该模式下可用的全部导出面板
+- 每隔若干轮强制 GC 后通过 CDP 拍摄堆快照，统计：
+  - 堆快照总大小，并按最小二乘拟合出每轮的残留增长（KB/轮）
+  - 已脱离 DOM 但仍被引用的 canvas 数量（Detached HTMLCanvasElement）
+  - 未被 revoke 的 Object URL 数量（注入脚本包装 URL.createObjectURL/revokeObjectURL）
+
+超过阈值时返回非 0，可直接接入 CI。
+
+Usage:
+    python scripts/with_server.py --server "npm run dev" --port 5173 -- \\
+        python examples/memory_soak_test.py --cycles 100 --snapshot-every 10
+
+    # 保存堆快照，便于在 DevTools Memory 面板中对比
+    python examples/memory_soak_test.py --snapshot-dir snapshots --output soak.json
+"""
+
+from playwright.sync_api import sync_playwright
+from export_benchmark import (
+    DEFAULT_TEST_FILES_DIR, EXPORTS, POLL_INTERVAL,
+    get_git_commit, get_js_heap_used, open_benchmark_page
+)
+from urllib.parse import urlparse
+import argparse
+import datetime
+import json
+import os
+import sys
+import time
+
+# 复用 with_server.py 的端口就绪检测
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+from with_server import is_server_ready
+
+
+# 页面注入脚本：记录仍然存活（未 revoke）的 Object URL 及其创建位置
+OBJECT_URL_TRACKER_JS = '''
+(() => {
+    const live = new Map();
+    const originalCreate = URL.createObjectURL.bind(URL);
+    const originalRevoke = URL.revokeObjectURL.bind(URL);
+    URL.createObjectURL = function (obj) {
+        const url = originalCreate(obj);
+        const stack = (new Error().stack || '').split('\\n').slice(2, 4).map(s => s.trim()).join(' <- ');
+        live.set(url, {
+            type: (obj && obj.type) || '',
+            size: (obj && obj.size) || 0,
+            source: stack
+        });
+        return url;
+    };
+    URL.revokeObjectURL = function (url) {
+        live.delete(url);
+        return originalRevoke(url);
+    };
+    window.__objectUrlTracker = {
+        count: () => live.size,
+        list: () => Array.from(live.values())
+    };
+})();
+'''
+
+# 查询指定文件是否已加载完成，返回所属模式
+FILE_LOADED_JS = '''
+    (fileName) => {
+        const app = window.MeeWoo.app;
+        const state = app[app.currentModule];
+        if (!state || !state.hasFile || !state.fileInfo || state.fileInfo.name !== fileName) return null;
+        return app.currentModule;
+    }
+'''
+
+
+def list_soak_files(test_files_dir):
+    """
+    列出浸泡测试使用的样例：test.svga 和带 YYEVA 数据的 MP4
+
+    参数:
+        test_files_dir: 测试文件目录
+
+    返回:
+        list: 文件绝对路径列表
+    """
+    files = []
+    for name in sorted(os.listdir(test_files_dir)):
+        stem, ext = os.path.splitext(name)
+        path = os.path.join(test_files_dir, name)
+        if name == 'test.svga':
+            files.append(path)
+        elif ext.lower() == '.mp4' and os.path.exists(os.path.join(test_files_dir, f'{stem}_yyeva_data.json')):
+            files.append(path)
+    return files
+
+
+def load_file_fresh(page, file_path, timeout=60):
+    """
+    加载样例文件，并等待当前模式的文件名切换为该文件
+
+    与 export_benchmark.load_file 不同，这里按文件名判断加载完成，
+    避免连续加载同一模式的文件时误把上一个文件当成已加载。
+
+    参数:
+        page: Playwright 页面
+        file_path: 样例文件路径
+        timeout: 等待加载的最长时间（秒）
+
+    返回:
+        str: 模式名称，加载超时返回 None
+    """
+    file_name = os.path.basename(file_path)
+    page.locator('input[type="file"][multiple]').last.set_input_files(file_path)
+
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        module = page.evaluate(FILE_LOADED_JS, file_name)
+        if module:
+            return module
+        time.sleep(POLL_INTERVAL)
+    return None
+
+
+def cycle_export_panels(page, module, panel_delay):
+    """
+    逐个打开并关闭当前模式下可用的导出面板
+
+    参数:
+        page: Playwright 页面
+        module: 当前模式
+        panel_delay: 面板打开后的停留时间（毫秒）
+
+    返回:
+        int: 开关的面板数量
+    """
+    opened = 0
+    for spec in EXPORTS.values():
+        if module not in spec['modules']:
+            continue
+        page.evaluate(f'() => window.MeeWoo.app.{spec["open"]}()')
+        page.wait_for_timeout(panel_delay)
+        page.evaluate('() => window.MeeWoo.app.closeAllPanels()')
+        opened += 1
+    return opened
+
+
+def take_heap_snapshot(cdp):
+    """
+    通过 CDP 拍摄堆快照
+
+    参数:
+        cdp: CDP 会话
+
+    返回:
+        str: 堆快照 JSON 文本
+    """
+    chunks = []
+
+    def on_chunk(params):
+        chunks.append(params['chunk'])
+
+    cdp.on('HeapProfiler.addHeapSnapshotChunk', on_chunk)
+    try:
+        cdp.send('HeapProfiler.takeHeapSnapshot', {'reportProgress': False})
+    finally:
+        cdp.remove_listener('HeapProfiler.addHeapSnapshotChunk', on_chunk)
+    return ''.join(chunks)
+
+
+def analyze_heap_snapshot(snapshot_text):
+    """
+    统计堆快照总大小和脱离 DOM 的节点
+
+    新版 Chromium 在 node_fields 中提供 detachedness（2 表示已脱离），
+    旧版则在节点名前加 "Detached " 前缀，两种情况都兼容。
+
+    参数:
+        snapshot_text: 堆快照 JSON 文本
+
+    返回:
+        dict: 总大小（字节）、节点数、脱离 DOM 的节点数、脱离 DOM 的 canvas 数
+    """
+    snapshot = json.loads(snapshot_text)
+    meta = snapshot['snapshot']['meta']
+    fields = meta['node_fields']
+    field_count = len(fields)
+    name_index = fields.index('name')
+    size_index = fields.index('self_size')
+    detached_index = fields.index('detachedness') if 'detachedness' in fields else None
+    strings = snapshot['strings']
+    nodes = snapshot['nodes']
+
+    total_size = 0
+    detached_nodes = 0
+    detached_canvases = 0
+    for offset in range(0, len(nodes), field_count):
+        total_size += nodes[offset + size_index]
+        name = strings[nodes[offset + name_index]]
+        if detached_index is not None:
+            is_detached = nodes[offset + detached_index] == 2
+        else:
+            is_detached = name.startswith('Detached ')
+            name = name[len('Detached '):] if is_detached else name
+        if is_detached:
+            detached_nodes += 1
+            if name.startswith('HTMLCanvasElement'):
+                detached_canvases += 1
+
+    return {
+        'heap_bytes': total_size,
+        'node_count': len(nodes) // field_count,
+        'detached_nodes': detached_nodes,
+        'detached_canvases': detached_canvases
+    }
+
+
+def collect_sample(page, cdp, cycle, snapshot_dir=None):
+    """
+    强制 GC 后采集一次快照数据
+
+    参数:
+        page: Playwright 页面
+        cdp: CDP 会话（需已执行 HeapProfiler.enable）
+        cycle: 当前轮次
+        snapshot_dir: 可选，堆快照保存目录
+
+    返回:
+        dict: 本次采样结果
+    """
+    cdp.send('HeapProfiler.collectGarbage')
+    snapshot_text = take_heap_snapshot(cdp)
+    if snapshot_dir:
+        os.makedirs(snapshot_dir, exist_ok=True)
+        with open(os.path.join(snapshot_dir, f'cycle_{cycle:04d}.heapsnapshot'), 'w', encoding='utf-8') as f:
+            f.write(snapshot_text)
+
+    sample = {'cycle': cycle}
+    sample.update(analyze_heap_snapshot(snapshot_text))
+    sample['js_heap_used_bytes'] = get_js_heap_used(cdp)
+    sample['live_object_urls'] = page.evaluate('() => window.__objectUrlTracker.count()')
+    return sample
+
+
+def growth_per_cycle(samples, key):
+    """
+    最小二乘拟合每轮增长量
+
+    参数:
+        samples: 采样列表
+        key: 参与拟合的字段
+
+    返回:
+        float: 每轮增长量，采样不足两个时返回 0
+    """
+    if len(samples) < 2:
+        return 0.0
+    xs = [sample['cycle'] for sample in samples]
+    ys = [sample[key] for sample in samples]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    denominator = sum((x - mean_x) ** 2 for x in xs)
+    if not denominator:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / denominator
+
+
+def summarize(samples, thresholds):
+    """
+    汇总增长数据并按阈值判定
+
+    第 0 轮采样在预热轮之后拍摄，作为基线（排除首次加载时的缓存、编译等一次性开销）。
+
+    参数:
+        samples: 采样列表
+        thresholds: {'growth_kb', 'detached_canvases', 'object_urls'}
+
+    返回:
+        tuple: (汇总 dict, 超标描述列表)
+    """
+    first, last = samples[0], samples[-1]
+    summary = {
+        'heap_growth_kb_per_cycle': round(growth_per_cycle(samples, 'heap_bytes') / 1024, 2),
+        'js_heap_growth_kb_per_cycle': round(growth_per_cycle(samples, 'js_heap_used_bytes') / 1024, 2),
+        'heap_start_mb': round(first['heap_bytes'] / 1024 / 1024, 2),
+        'heap_end_mb': round(last['heap_bytes'] / 1024 / 1024, 2),
+        'detached_canvases_added': last['detached_canvases'] - first['detached_canvases'],
+        'detached_nodes_added': last['detached_nodes'] - first['detached_nodes'],
+        'object_urls_added': last['live_object_urls'] - first['live_object_urls']
+    }
+
+    failures = []
+    if summary['heap_growth_kb_per_cycle'] > thresholds['growth_kb']:
+        failures.append(f"堆每轮增长 {summary['heap_growth_kb_per_cycle']}KB > {thresholds['growth_kb']}KB")
+    if summary['detached_canvases_added'] > thresholds['detached_canvases']:
+        failures.append(f"脱离 DOM 的 canvas 增加 {summary['detached_canvases_added']} 个 > {thresholds['detached_canvases']}")
+    if summary['object_urls_added'] > thresholds['object_urls']:
+        failures.append(f"未 revoke 的 Object URL 增加 {summary['object_urls_added']} 个 > {thresholds['object_urls']}")
+    return summary, failures
+
+
+def print_samples(samples):
+    """
+    打印采样表
+
+    参数:
+        samples: 采样列表
+    """
+    print("\n=== 堆快照采样 ===")
+    print('轮次'.ljust(6) + '快照MB'.rjust(10) + 'JS堆MB'.rjust(10) + '脱离节点'.rjust(10) + '脱离canvas'.rjust(12) + 'ObjectURL'.rjust(11))
+    for sample in samples:
+        print(
+            str(sample['cycle']).ljust(6)
+            + f"{sample['heap_bytes'] / 1024 / 1024:.2f}".rjust(10)
+            + f"{sample['js_heap_used_bytes'] / 1024 / 1024:.2f}".rjust(10)
+            + str(sample['detached_nodes']).rjust(10)
+            + str(sample['detached_canvases']).rjust(12)
+            + str(sample['live_object_urls']).rjust(11)
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='内存泄漏浸泡测试')
+    parser.add_argument('--url', default='http://localhost:5173/', help='开发服务器URL（默认: http://localhost:5173/）')
+    parser.add_argument('--test-files', default=DEFAULT_TEST_FILES_DIR, help='样例文件目录（默认: 项目根目录 test_files）')
+    parser.add_argument('--cycles', type=int, default=100, help='循环轮数，每轮加载全部样例各一次（默认: 100）')
+    parser.add_argument('--snapshot-every', type=int, default=10, help='每隔多少轮拍摄一次堆快照（默认: 10）')
+    parser.add_argument('--panel-delay', type=int, default=100, help='导出面板打开后的停留毫秒数（默认: 100）')
+    parser.add_argument('--max-growth-kb', type=float, default=64, help='允许的堆每轮增长 KB（默认: 64）')
+    parser.add_argument('--max-detached-canvases', type=int, default=0, help='允许新增的脱离 DOM canvas 数（默认: 0）')
+    parser.add_argument('--max-object-urls', type=int, default=0, help='允许新增的未 revoke Object URL 数（默认: 0）')
+    parser.add_argument('--snapshot-dir', default=None, help='堆快照保存目录（不指定则不保存）')
+    parser.add_argument('--output', default=None, help='结果 JSON 路径（不指定则只打印）')
+    parser.add_argument('--server-timeout', type=int, default=30, help='等待开发服务器就绪的秒数（默认: 30）')
+    parser.add_argument('--headless', action='store_true', help='无头模式运行（仅用于 CI）')
+    args = parser.parse_args()
+
+    port = urlparse(args.url).port or 80
+    if not is_server_ready(port, timeout=args.server_timeout):
+        print(f"错误：开发服务器未就绪（端口 {port}），请先启动或使用 scripts/with_server.py 托管")
+        sys.exit(2)
+
+    files = list_soak_files(args.test_files)
+    if not files:
+        print(f"错误：{args.test_files} 中没有 test.svga 或 YYEVA 样例")
+        sys.exit(2)
+
+    thresholds = {
+        'growth_kb': args.max_growth_kb,
+        'detached_canvases': args.max_detached_canvases,
+        'object_urls': args.max_object_urls
+    }
+    samples = []
+    load_failures = []
+    panel_toggles = 0
+
+    print(f"=== 内存泄漏浸泡测试（{len(files)} 个样例 × {args.cycles} 轮）===")
+    for file_path in files:
+        print(f"  - {os.path.basename(file_path)}")
+
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=args.headless)
+        try:
+            context, page, cdp = open_benchmark_page(browser, args.url, init_script=OBJECT_URL_TRACKER_JS)
+            cdp.send('HeapProfiler.enable')
+
+            # 第 0 轮为预热轮，结束后拍摄基线快照
+            for cycle in range(args.cycles + 1):
+                for file_path in files:
+                    module = load_file_fresh(page, file_path)
+                    if not module:
+                        load_failures.append({'cycle': cycle, 'file': os.path.basename(file_path)})
+                        continue
+                    panel_toggles += cycle_export_panels(page, module, args.panel_delay)
+
+                if cycle % args.snapshot_every == 0 or cycle == args.cycles:
+                    sample = collect_sample(page, cdp, cycle, args.snapshot_dir)
+                    samples.append(sample)
+                    print(f"[进度] 第 {cycle}/{args.cycles} 轮，堆快照 {sample['heap_bytes'] / 1024 / 1024:.2f}MB，"
+                          f"脱离 canvas {sample['detached_canvases']}，Object URL {sample['live_object_urls']}")
+
+            leaked_urls = page.evaluate('() => window.__objectUrlTracker.list()')
+            context.close()
+        finally:
+            browser.close()
+
+    print_samples(samples)
+    summary, failures = summarize(samples, thresholds)
+    summary['loads'] = (args.cycles + 1) * len(files) - len(load_failures)
+    summary['panel_toggles'] = panel_toggles
+
+    print("\n=== 汇总 ===")
+    for key, value in summary.items():
+        print(f"  {key}: {value}")
+    if load_failures:
+        print(f"  ⚠️ 加载超时 {len(load_failures)} 次")
+    if leaked_urls:
+        print("\n=== 仍存活的 Object URL（前 10 个）===")
+        for item in leaked_urls[:10]:
+            print(f"  {item['type'] or '-'} {item['size']}B  {item['source']}")
+
+    if args.output:
+        report = {
+            'meta': {
+                'commit': get_git_commit(),
+                'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+                'files': [os.path.basename(path) for path in files],
+                'cycles': args.cycles,
+                'thresholds': thresholds
+            },
+            'samples': samples,
+            'summary': summary,
+            'failures': failures,
+            'load_failures': load_failures,
+            'live_object_urls': leaked_urls
+        }
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n结果已保存到: {args.output}")
+
+    for failure in failures:
+        print(f"✗ {failure}")
+    print(f"\n{'❌ 检测到内存增长超出阈值' if failures else '✅ 未检测到明显泄漏'}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+播放性能分析 - 基于 Playwright 的帧率与长任务采集
+
+此脚本逐个加载 test_files/ 中的 SVGA / YYEVA 双通道 MP4 / 普通 MP4 样例，
+在播放器中持续播放固定时长，并采集：
+- CDP 性能追踪（Chromium tracing，可选保存为 .json，在 DevTools Performance 面板打开）
+- 长任务数量与总时长（PerformanceObserver longtask）
+- 掉帧数（requestAnimationFrame 间隔超过 1.5 倍刷新间隔的帧，按间隔折算丢失帧数）
+- GC 暂停次数、总时长、最长单次（追踪中的 MajorGC / MinorGC 事件）
+- 控制台错误与页面异常数量（复用 enhanced_error_capture.py 的捕获逻辑）
+
+最后输出汇总表，可选写入 JSON。
+
+Usage:
+    python scripts/with_server.py --server "npm run dev" --port 5173 -- \\
+        python examples/playback_profiler.py --duration 10
+
+    # 保存追踪文件，便于在 DevTools 中逐帧分析
+    python examples/playback_profiler.py --trace-dir traces --output profile.json
+"""
+
+from playwright.sync_api import sync_playwright
+from enhanced_error_capture import attach_error_capture
+from export_benchmark import DEFAULT_TEST_FILES_DIR, list_test_files, open_benchmark_page, load_file
+import argparse
+import json
+import os
+import statistics
+
+
+# 追踪分类：时间线事件、帧事件和 V8 GC 事件
+TRACE_CATEGORIES = [
+    'devtools.timeline',
+    'disabled-by-default-devtools.timeline',
+    'disabled-by-default-devtools.timeline.frame',
+    'v8',
+    'v8.gc'
+]
+
+# 追踪中代表 GC 暂停的事件名
+GC_EVENT_NAMES = ('MajorGC', 'MinorGC')
+
+# 判定掉帧的间隔倍数
+DROPPED_FRAME_FACTOR = 1.5
+
+# 页面注入脚本：长任务观察器 + rAF 帧间隔记录器，由 start()/stop() 控制采集区间
+PROFILER_INIT_JS = '''
+(() => {
+    const profiler = {
+        recording: false,
+        longTasks: [],
+        frameDeltas: [],
+        lastFrameTime: 0,
+        start() {
+            this.recording = true;
+            this.longTasks = [];
+            this.frameDeltas = [];
+            this.lastFrameTime = 0;
+            const tick = (now) => {
+                if (!this.recording) return;
+                if (this.lastFrameTime) this.frameDeltas.push(now - this.lastFrameTime);
+                this.lastFrameTime = now;
+                requestAnimationFrame(tick);
+            };
+            requestAnimationFrame(tick);
+        },
+        stop() {
+            this.recording = false;
+            return { longTasks: this.longTasks, frameDeltas: this.frameDeltas };
+        }
+    };
+    try {
+        new PerformanceObserver((list) => {
+            if (!profiler.recording) return;
+            for (const entry of list.getEntries()) profiler.longTasks.push(entry.duration);
+        }).observe({ entryTypes: ['longtask'] });
+    } catch (e) {
+        console.warn('longtask observer unavailable:', e);
+    }
+    window.__playbackProfiler = profiler;
+})();
+'''
+
+
+def ensure_playing(page):
+    """
+    确保播放器处于播放状态（加载后未自动播放时调用 togglePlay）
+
+    参数:
+        page: Playwright 页面
+
+    返回:
+        bool: 是否处于播放状态
+    """
+    return page.evaluate('''
+        () => {
+            const app = window.MeeWoo.app;
+            if (!app.isPlaying && typeof app.togglePlay === 'function') app.togglePlay();
+            return !!app.isPlaying;
+        }
+    ''')
+
+
+def summarize_frames(frame_deltas):
+    """
+    根据 rAF 帧间隔统计帧率和掉帧
+
+    以帧间隔中位数作为刷新间隔（兼容 60Hz/120Hz 显示器），
+    超过 DROPPED_FRAME_FACTOR 倍的间隔按 round(间隔/刷新间隔)-1 计入丢失帧数。
+
+    参数:
+        frame_deltas: 帧间隔列表（毫秒）
+
+    返回:
+        dict: 帧数、平均帧率、刷新间隔、掉帧数、最长帧间隔
+    """
+    if not frame_deltas:
+        return {'frames': 0, 'avg_fps': 0, 'refresh_ms': None, 'dropped_frames': 0, 'max_frame_ms': None}
+
+    refresh_ms = statistics.median(frame_deltas)
+    dropped = 0
+    for delta in frame_deltas:
+        if delta > refresh_ms * DROPPED_FRAME_FACTOR:
+            dropped += max(round(delta / refresh_ms) - 1, 1)
+
+    total_ms = sum(frame_deltas)
+    return {
+        'frames': len(frame_deltas),
+        'avg_fps': round(len(frame_deltas) * 1000 / total_ms, 1) if total_ms else 0,
+        'refresh_ms': round(refresh_ms, 2),
+        'dropped_frames': dropped,
+        'max_frame_ms': round(max(frame_deltas), 1)
+    }
+
+
+def summarize_gc(trace_bytes):
+    """
+    从追踪数据中统计 GC 暂停
+
+    参数:
+        trace_bytes: browser.stop_tracing() 返回的追踪 JSON 字节
+
+    返回:
+        dict: GC 次数、总暂停时长、最长单次暂停（毫秒）
+    """
+    trace = json.loads(trace_bytes)
+    events = trace['traceEvents'] if isinstance(trace, dict) else trace
+    pauses = [
+        event.get('dur', 0) / 1000
+        for event in events
+        if event.get('name') in GC_EVENT_NAMES and event.get('ph') == 'X'
+    ]
+    return {
+        'gc_count': len(pauses),
+        'gc_total_ms': round(sum(pauses), 1),
+        'gc_max_ms': round(max(pauses), 1) if pauses else 0
+    }
+
+
+def profile_file(browser, server_url, file_path, duration, trace_dir=None):
+    """
+    播放单个样例文件并采集性能数据
+
+    参数:
+        browser: Playwright 浏览器实例
+        server_url: 开发服务器URL
+        file_path: 样例文件路径
+        duration: 播放采集时长（秒）
+        trace_dir: 可选，追踪文件保存目录
+
+    返回:
+        dict: 单个文件的采集结果
+    """
+    file_name = os.path.basename(file_path)
+    console_logs = []
+    page_errors = []
+    entry = {'file': file_name, 'module': None, 'status': 'ok'}
+
+    context, page, _ = open_benchmark_page(
+        browser,
+        server_url,
+        init_script=PROFILER_INIT_JS,
+        on_page=lambda page: attach_error_capture(page, console_logs, page_errors)
+    )
+    try:
+        module, _ = load_file(page, file_path)
+        if not module:
+            entry['status'] = 'load-timeout'
+            return entry
+        entry['module'] = module
+
+        if not ensure_playing(page):
+            entry['status'] = 'not-playing'
+            return entry
+
+        browser.start_tracing(page=page, categories=TRACE_CATEGORIES)
+        page.evaluate('() => window.__playbackProfiler.start()')
+        page.wait_for_timeout(duration * 1000)
+        samples = page.evaluate('() => window.__playbackProfiler.stop()')
+        trace_bytes = browser.stop_tracing()
+
+        if trace_dir:
+            os.makedirs(trace_dir, exist_ok=True)
+            trace_path = os.path.join(trace_dir, f'{os.path.splitext(file_name)[0]}.trace.json')
+            with open(trace_path, 'wb') as f:
+                f.write(trace_bytes)
+            entry['trace'] = trace_path
+
+        entry.update(summarize_frames(samples['frameDeltas']))
+        entry['long_tasks'] = len(samples['longTasks'])
+        entry['long_task_ms'] = round(sum(samples['longTasks']), 1)
+        entry.update(summarize_gc(trace_bytes))
+    finally:
+        entry['console_errors'] = sum(1 for log in console_logs if '[ERROR]' in log)
+        entry['page_errors'] = len(page_errors)
+        context.close()
+
+    return entry
+
+
+def print_summary(results):
+    """
+    打印汇总表
+
+    参数:
+        results: profile_file 返回的结果列表
+    """
+    columns = [
+        ('file', '文件', 40),
+        ('module', '模式', 6),
+        ('avg_fps', 'FPS', 6),
+        ('dropped_frames', '掉帧', 6),
+        ('max_frame_ms', '最长帧ms', 9),
+        ('long_tasks', '长任务', 7),
+        ('long_task_ms', '长任务ms', 9),
+        ('gc_count', 'GC次数', 7),
+        ('gc_total_ms', 'GCms', 8),
+        ('gc_max_ms', 'GC最长ms', 9),
+        ('page_errors', '异常', 5)
+    ]
+
+    print("\n=== 播放性能汇总 ===")
+    print(' '.join(title.ljust(width) for _, title, width in columns))
+    for entry in results:
+        cells = []
+        for key, _, width in columns:
+            value = entry.get(key)
+            if key == 'module' and entry['status'] != 'ok':
+                # 采集失败的文件在模式列显示失败原因
+                value = entry['status']
+            text = '-' if value is None else str(value)
+            if key == 'file' and len(text) > width:
+                text = '…' + text[-(width - 1):]
+            cells.append(text.ljust(width))
+        print(' '.join(cells))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='播放帧率与长任务分析')
+    parser.add_argument('--url', default='http://localhost:5173/', help='开发服务器URL（默认: http://localhost:5173/）')
+    parser.add_argument('--test-files', default=DEFAULT_TEST_FILES_DIR, help='样例文件目录（默认: 项目根目录 test_files）')
+    parser.add_argument('--duration', type=int, default=10, help='每个文件的播放采集秒数（默认: 10）')
+    parser.add_argument('--trace-dir', default=None, help='追踪文件保存目录（不指定则不保存）')
+    parser.add_argument('--output', default=None, help='结果 JSON 路径（不指定则只打印汇总表）')
+    parser.add_argument('--headless', action='store_true', help='无头模式运行（仅用于 CI，无头模式下帧率数据仅供参考）')
+    args = parser.parse_args()
+
+    files = list_test_files(args.test_files)
+    print(f"=== 播放性能分析（{len(files)} 个文件，每个 {args.duration}s）===")
+
+    results = []
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=args.headless)
+        try:
+            for file_path in files:
+                print(f"\n[{os.path.basename(file_path)}] 播放中...")
+                results.append(profile_file(browser, args.url, file_path, args.duration, args.trace_dir))
+        finally:
+            browser.close()
+
+    print_summary(results)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n结果已保存到: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
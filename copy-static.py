@@ -9,8 +9,11 @@
 4. 复制 src 根目录文件（排除指定文件）
 5. 压缩 CSS 文件（使用 clean-css-cli）
 6. 压缩 JavaScript 文件（使用 terser）
+7. 生成 Service Worker 预缓存清单（带内容哈希和版本），注入 coi-serviceworker.js
 """
 
+import hashlib
+import json
 import os
 import shutil
 import subprocess
@@ -27,6 +30,32 @@ exclude_folders = ['gadgets', 'css']
 exclude_js_files = ['gif.js', 'gif.worker.js']
 # ==============================================
 
+# ==============================================
+# Service Worker 预缓存配置
+# ==============================================
+# 预缓存的重量级运行时资源（相对 docs 目录）
+precache_assets = [
+    'assets/js/lib/ffmpeg.min.js',
+    'assets/js/lib/pngquant.wasm',
+    'assets/js/lib/protobuf.min.js',
+    'assets/js/service/oxipng/meta.js',
+    'assets/js/service/oxipng/optimise.js',
+    'assets/js/service/oxipng/squoosh_oxipng.js',
+    'assets/js/service/oxipng/squoosh_oxipng_bg.wasm',
+    'svga.proto'
+]
+# 版本固定的 CDN 前缀：首次使用时缓存，之后直接读缓存（FFmpeg 核心约 25MB）
+precache_runtime_prefixes = [
+    'https://unpkg.com/@ffmpeg/ffmpeg@0.11.6/',
+    'https://unpkg.com/@ffmpeg/core@0.11.0/'
+]
+# Service Worker 文件名与清单注入占位行
+service_worker_file = 'coi-serviceworker.js'
+precache_placeholder = 'const PRECACHE_MANIFEST = null;'
+# 预缓存清单文件名（同时写入 docs，便于检查）
+precache_manifest_file = 'precache-manifest.json'
+# ==============================================
+
 # 确保脚本使用 UTF-8 编码
 if sys.stdout.encoding != 'utf-8':
     sys.stdout.reconfigure(encoding='utf-8')
@@ -140,6 +169,56 @@ def compress_js_files(directory):
     except Exception as e:
         print_error(f"JS压缩流程失败: {e}")
 
+def generate_precache_manifest(docs_dir):
+    """生成 Service Worker 预缓存清单并注入 coi-serviceworker.js
+
+    必须在 JS 压缩之后执行，保证哈希对应最终发布的文件内容。
+    清单版本由所有资源哈希计算得出，资源不变时 Service Worker 文件内容不变，浏览器不会重新安装。
+    """
+    try:
+        assets = []
+        for asset_path in precache_assets:
+            full_path = os.path.join(docs_dir, *asset_path.split('/'))
+            if not os.path.exists(full_path):
+                print_error(f"预缓存资源不存在，已跳过: {asset_path}")
+                continue
+            with open(full_path, 'rb') as f:
+                data = f.read()
+            assets.append({
+                'url': asset_path,
+                'hash': hashlib.sha256(data).hexdigest()[:16],
+                'size': len(data)
+            })
+
+        version = hashlib.sha256(
+            json.dumps([assets, precache_runtime_prefixes], sort_keys=True).encode('utf-8')
+        ).hexdigest()[:12]
+        manifest = {'version': version, 'assets': assets, 'runtime': precache_runtime_prefixes}
+
+        with open(os.path.join(docs_dir, precache_manifest_file), 'w', encoding='utf-8', newline='\n') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+        sw_path = os.path.join(docs_dir, service_worker_file)
+        if not os.path.exists(sw_path):
+            print_error(f"未找到 {service_worker_file}，预缓存清单未注入")
+            return
+        with open(sw_path, 'r', encoding='utf-8') as f:
+            sw_source = f.read()
+        if precache_placeholder not in sw_source:
+            print_error(f"{service_worker_file} 中没有预缓存占位行，预缓存清单未注入")
+            return
+        sw_source = sw_source.replace(
+            precache_placeholder,
+            f"const PRECACHE_MANIFEST = {json.dumps(manifest, ensure_ascii=False, separators=(',', ':'))};"
+        )
+        with open(sw_path, 'w', encoding='utf-8', newline='\n') as f:
+            f.write(sw_source)
+
+        total_size = sum(asset['size'] for asset in assets)
+        print_info(f"预缓存清单已生成: 版本 {version}，{len(assets)} 个资源，共 {total_size / 1024 / 1024:.2f} MB")
+    except Exception as e:
+        print_error(f"生成预缓存清单失败: {e}")
+
 def main():
     """主函数"""
     print_info("===== 开始执行静态资源复制和压缩 =====")
@@ -196,6 +275,9 @@ def main():
     # 压缩 JavaScript 文件
     compress_js_files(os.path.join(docs_dir, 'assets', 'js'))
     
+    # 生成 Service Worker 预缓存清单（在压缩之后，哈希对应最终文件）
+    generate_precache_manifest(docs_dir)
+    
     print_info("===== 静态资源复制和压缩执行完成 =====")
 
 if __name__ == '__main__':
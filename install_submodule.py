@@ -4,6 +4,8 @@ AI-Protocol-Hub 子模块安装脚本
 
 功能：
 - 添加并克隆 AI-Protocol-Hub 子模块
+- 缓存安装模式（--cached）：本地持久镜像 + 浅克隆/部分克隆 + 只检出 ai_protocol_hub/，
+  增量更新后用硬链接同步到项目，支持离线从本地镜像路径安装（--mirror/--offline）
 - 检查并创建 skill_specs 文件夹
 - 检查并创建 INDEX.md 文件
 - 检查并创建 UPDATE_LOG.md 文件
@@ -12,16 +14,34 @@ AI-Protocol-Hub 子模块安装脚本
 在目标项目根目录执行：
 python install_submodule.py
 
+# 缓存安装（多个项目共用一份镜像，重复安装只需几秒）
+python install_submodule.py --cached
+
+# 离线从本地镜像安装（本地 AI-PH 仓库或 --mirror 克隆）
+python install_submodule.py --cached --mirror /path/to/AI-PH --offline
+
 """
 
 # 脚本版本号
-VERSION = "1.0.1"
+VERSION = "1.1.0"
 
 import os
 import sys
+import shutil
+import filecmp
+import argparse
 import subprocess
 import logging
 
+# AI-PH 仓库地址
+REPO_URL = "https://github.com/vincentline/AI-PH"
+
+# 需要安装的目录
+SUBMODULE_DIR = "ai_protocol_hub"
+
+# 缓存目录（可用环境变量 AI_PH_CACHE 覆盖）
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "ai-ph")
+
 # 配置日志
 logging.basicConfig(
     level=logging.INFO,
@@ -134,6 +154,203 @@ def add_submodule():
                 logger.warning("临时目录可能需要手动清理，但不影响安装结果")
 
 
+def get_cache_dir():
+    """
+    获取缓存目录
+    
+    返回：
+        str: 缓存目录路径
+    """
+    return os.environ.get("AI_PH_CACHE") or DEFAULT_CACHE_DIR
+
+
+def is_local_source(source):
+    """
+    判断仓库来源是否为本地路径（本地克隆由 git 直接硬链接对象，无需浅克隆和部分克隆）
+    
+    参数：
+        source: 仓库地址或本地路径
+    
+    返回：
+        bool: 是否为本地路径
+    """
+    return os.path.isdir(source)
+
+
+def update_mirror(source, mirror_dir, offline=False):
+    """
+    创建或增量更新本地镜像
+    
+    镜像只检出 ai_protocol_hub/（稀疏检出），远程来源使用 --depth=1 浅克隆和
+    --filter=blob:none 部分克隆，只下载当前版本需要的对象。
+    
+    参数：
+        source: 仓库地址或本地镜像路径
+        mirror_dir: 镜像目录
+        offline: 是否离线（不拉取，直接使用已有镜像）
+    
+    返回：
+        bool: 操作是否成功
+    """
+    local = is_local_source(source)
+    if local:
+        source = os.path.abspath(source)
+    remote_args = [] if local else ["--depth=1", "--filter=blob:none"]
+    
+    if not os.path.exists(os.path.join(mirror_dir, ".git")):
+        if offline and not local:
+            logger.error(f"离线模式下镜像不存在: {mirror_dir}，请使用 --mirror 指定本地镜像路径")
+            return False
+        
+        logger.info(f"创建本地镜像: {mirror_dir}")
+        os.makedirs(os.path.dirname(mirror_dir), exist_ok=True)
+        code, stdout, stderr = run_cmd(
+            ["git", "clone", "--no-checkout", "--sparse", *remote_args, source, mirror_dir],
+            shell=False
+        )
+        if code != 0:
+            logger.error("创建本地镜像失败")
+            return False
+        
+        code, stdout, stderr = run_cmd(["git", "sparse-checkout", "set", SUBMODULE_DIR], cwd=mirror_dir, shell=False)
+        if code != 0:
+            logger.error("设置稀疏检出失败")
+            return False
+        
+        code, stdout, stderr = run_cmd(["git", "checkout", "--force", "HEAD"], cwd=mirror_dir, shell=False)
+        if code != 0:
+            logger.error("检出镜像失败")
+            return False
+        return True
+    
+    if offline and not local:
+        logger.info("离线模式，使用已有镜像")
+        return True
+    
+    # 来源可能在远程仓库和本地镜像之间切换
+    run_cmd(["git", "remote", "set-url", "origin", source], cwd=mirror_dir, shell=False)
+    
+    logger.info("增量更新本地镜像...")
+    code, stdout, stderr = run_cmd(["git", "fetch", *remote_args, "origin", "HEAD"], cwd=mirror_dir, shell=False)
+    if code != 0:
+        logger.warning("更新镜像失败，使用已有镜像")
+        return True
+    
+    code, stdout, stderr = run_cmd(["git", "reset", "--hard", "FETCH_HEAD"], cwd=mirror_dir, shell=False)
+    if code != 0:
+        logger.error("更新镜像工作区失败")
+        return False
+    return True
+
+
+def sync_tree(source_dir, target_dir, use_links=True):
+    """
+    增量同步目录：已是同一文件的跳过，其余优先创建硬链接（失败时复制），并删除多余文件
+    
+    参数：
+        source_dir: 源目录
+        target_dir: 目标目录
+        use_links: 是否使用硬链接
+    
+    返回：
+        tuple: (更新的文件数, 删除的文件数)
+    """
+    updated = 0
+    removed = 0
+    expected = set()
+    
+    for root, dirs, files in os.walk(source_dir):
+        relative_root = os.path.relpath(root, source_dir)
+        target_root = os.path.normpath(os.path.join(target_dir, relative_root))
+        os.makedirs(target_root, exist_ok=True)
+        expected.add(os.path.normcase(target_root))
+        
+        for name in files:
+            source_file = os.path.join(root, name)
+            target_file = os.path.join(target_root, name)
+            expected.add(os.path.normcase(target_file))
+            
+            if os.path.isfile(target_file) and os.path.samefile(source_file, target_file):
+                continue
+            if not use_links and os.path.isfile(target_file) and filecmp.cmp(source_file, target_file, shallow=False):
+                continue
+            
+            # 先写临时文件再替换，避免中断时留下半个文件
+            temp_file = target_file + ".ai-ph-tmp"
+            if os.path.lexists(temp_file):
+                os.remove(temp_file)
+            try:
+                if not use_links:
+                    raise OSError("硬链接已禁用")
+                os.link(source_file, temp_file)
+            except OSError:
+                shutil.copy2(source_file, temp_file)
+            os.replace(temp_file, target_file)
+            updated += 1
+    
+    # 删除源目录中已不存在的文件和目录
+    for root, dirs, files in os.walk(target_dir, topdown=False):
+        for name in files:
+            path = os.path.join(root, name)
+            if os.path.normcase(path) not in expected:
+                os.remove(path)
+                removed += 1
+        for name in dirs:
+            path = os.path.join(root, name)
+            if os.path.normcase(path) not in expected:
+                shutil.rmtree(path)
+    
+    return updated, removed
+
+
+def add_submodule_cached(source=REPO_URL, offline=False, use_links=True):
+    """
+    从本地镜像缓存安装 AI-Protocol-Hub
+    
+    参数：
+        source: 仓库地址或本地镜像路径
+        offline: 是否离线（不拉取远程更新）
+        use_links: 是否使用硬链接同步（注意：硬链接文件与镜像共用内容，请勿在项目中直接修改）
+    
+    返回：
+        bool: 操作是否成功
+    """
+    logger.info("开始以缓存模式安装 AI-Protocol-Hub...")
+    
+    # 检查当前目录是否为 ai_protocol_hub 目录，防止嵌套执行
+    if os.path.basename(os.getcwd()) == SUBMODULE_DIR:
+        logger.error("错误：不能在 ai_protocol_hub 目录内部执行此脚本，否则会导致嵌套的目录结构")
+        logger.error("请在目标项目的根目录执行此脚本")
+        return False
+    
+    mirror_dir = os.path.join(get_cache_dir(), "AI-PH")
+    if not update_mirror(source, mirror_dir, offline):
+        return False
+    
+    source_dir = os.path.join(mirror_dir, SUBMODULE_DIR)
+    if not os.path.isdir(source_dir):
+        logger.error(f"镜像中不存在 ai_protocol_hub 目录: {source_dir}")
+        return False
+    
+    # 清理 Git 索引中可能存在的 ai_protocol_hub 子模块条目（gitlink），普通文件保持不变
+    code, stdout, stderr = run_cmd(["git", "ls-files", "-s", "--", SUBMODULE_DIR], shell=False)
+    if code == 0 and stdout.startswith("160000"):
+        logger.info("清理 Git 索引中的 ai_protocol_hub 子模块条目...")
+        run_cmd(["git", "rm", "-rf", "--cached", SUBMODULE_DIR], shell=False)
+    
+    if os.path.exists(SUBMODULE_DIR) and not os.path.isdir(SUBMODULE_DIR):
+        os.remove(SUBMODULE_DIR)
+    
+    try:
+        updated, removed = sync_tree(source_dir, SUBMODULE_DIR, use_links)
+    except Exception as e:
+        logger.error(f"同步 ai_protocol_hub 目录失败: {str(e)}")
+        return False
+    
+    logger.info(f"AI-Protocol-Hub 同步完成：更新 {updated} 个文件，删除 {removed} 个文件")
+    return True
+
+
 def check_skill_specs():
     """
     检查并创建 skill_specs 文件夹
@@ -247,14 +464,40 @@ def create_update_log_md():
     return True
 
 
-def main():
+def parse_args(argv=None):
+    """
+    解析命令行参数
+    
+    参数：
+        argv: 参数列表，默认读取 sys.argv
+    
+    返回：
+        argparse.Namespace: 解析结果
+    """
+    parser = argparse.ArgumentParser(description="AI-Protocol-Hub 子模块安装脚本")
+    parser.add_argument("-v", "--version", action="store_true", help="显示版本号")
+    parser.add_argument("--cached", action="store_true", help="缓存安装：使用本地持久镜像增量更新并硬链接同步")
+    parser.add_argument("--mirror", default=None, help="仓库来源（本地镜像路径或仓库地址，指定后自动启用 --cached）")
+    parser.add_argument("--offline", action="store_true", help="离线模式：不拉取远程更新，直接使用镜像")
+    parser.add_argument("--copy", action="store_true", help="缓存安装时复制文件而不是创建硬链接")
+    return parser.parse_args(argv)
+
+
+def main(args=None):
     """
     脚本主函数
     """
+    if args is None:
+        args = parse_args()
+    
     logger.info(f"开始执行 AI-Protocol-Hub 子模块安装脚本 (v{VERSION})")
     
     # 步骤 1: 添加并克隆子模块
-    if not add_submodule():
+    if args.cached or args.mirror or args.offline:
+        installed = add_submodule_cached(args.mirror or REPO_URL, args.offline, not args.copy)
+    else:
+        installed = add_submodule()
+    if not installed:
         logger.error("安装失败：添加子模块失败")
         return 1
     
@@ -284,8 +527,9 @@ def main():
 
 
 if __name__ == "__main__":
+    args = parse_args()
     # 检查是否需要显示版本号
-    if len(sys.argv) > 1 and sys.argv[1] in ["--version", "-v"]:
+    if args.version:
         print(f"AI-Protocol-Hub 子模块安装脚本 v{VERSION}")
         sys.exit(0)
-    sys.exit(main())
+    sys.exit(main(args))
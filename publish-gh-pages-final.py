@@ -1,19 +1,86 @@
 #!/usr/bin/env python3
 # 发布脚本：将 docs 目录部署到 gh-pages 分支
 # 功能：关闭 Node 进程，检查并提交 Git 更改，将 docs 发布到 gh-pages 分支
+# 增量模式（--incremental）：基于远程 gh-pages 最新提交构建新提交，未变化的文件复用已有 blob，只推送变化的对象
+# 默认使用 git 底层命令直接把 docs 写入对象库（独立索引 + write-tree + commit-tree），不复制、不检出；--copy 使用旧的临时仓库流程
+# 提交前执行部署优化（--no-optimize 跳过）：PNG 无损重压缩、文本资源生成 .gz/.br 预压缩文件、与上次 gh-pages 对比体积
+# 发布时生成 asset-manifest.json（逻辑路径 -> 内容哈希文件名/大小），并在 _headers 中追加 immutable 长缓存和 index.html 短缓存规则
 # 注意：此脚本使用 UTF-8 编码，确保中文显示正常
 
+import argparse
+import gzip
+import hashlib
+import io
+import json
 import os
+import posixpath
+import re
 import sys
 import subprocess
 import shutil
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+# 可选依赖：没有安装时跳过对应的优化
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    from PIL import Image, PngImagePlugin
+except ImportError:
+    Image = None
+
 # 设置编码为 UTF-8
 sys.stdout.reconfigure(encoding='utf-8')
 sys.stderr.reconfigure(encoding='utf-8')
 
+# ==============================================
+# 部署优化配置
+# ==============================================
+# 需要无损重压缩 PNG 的目录（相对 docs）
+PNG_OPTIMIZE_DIRS = ('assets/dar_svga/', 'assets/xunzhang/', 'assets/sth_auto_img/')
+# oxipng 优化级别（与 image-compression-service.js 的最高级别一致）
+OXIPNG_LEVEL = 6
+# 未安装 oxipng 时，Pillow 重新编码能原样写回的 PNG 块（文本块经 pnginfo、iCCP 经 icc_profile 写回）；
+# 含其他块（APNG 的 acTL/fcTL/fdAT、gAMA/sRGB/cHRM/pHYs 等）的文件不做 Pillow 重压缩
+PILLOW_SAFE_PNG_CHUNKS = frozenset((b'IHDR', b'PLTE', b'IDAT', b'IEND', b'tRNS', b'tEXt', b'zTXt', b'iTXt', b'iCCP'))
+# 生成 .gz/.br 预压缩文件的文本资源后缀
+PRECOMPRESS_EXTENSIONS = ('.html', '.js', '.mjs', '.css', '.json', '.svg', '.proto', '.md', '.txt', '.xml', '.csv')
+# 预压缩文件的后缀
+PRECOMPRESSED_SUFFIXES = ('.gz', '.br')
+# 小于该字节数的文本不生成预压缩文件
+PRECOMPRESS_MIN_SIZE = 1024
+# 预压缩后体积需小于原体积的比例，否则不生成
+PRECOMPRESS_MAX_RATIO = 0.9
+# 优化结果缓存文件（位于 .git 目录，按源文件 blob 哈希记录优化后的 blob 哈希）
+OPTIMIZE_CACHE_FILE = 'gh-pages-optimize-cache.json'
+# ==============================================
+
+# ==============================================
+# 资源清单与缓存头配置
+# ==============================================
+# 资源清单文件名（发布根目录）
+ASSET_MANIFEST_FILE = 'asset-manifest.json'
+# 缓存头配置文件名（发布根目录）
+HEADERS_FILE = '_headers'
+# 生成内容哈希别名的资源：lib 目录下的第三方库（由 library-loader.js 通过清单解析）
+HASHED_ALIAS_PREFIXES = ('assets/js/lib/',)
+# wasm 由各自的胶水代码按原文件名请求，不生成别名，改为固定路径 + 较长缓存
+STABLE_CACHE_EXTENSIONS = ('.wasm',)
+# Vite 构建产物本身已带内容哈希（如 assets/index-DCwYqzb3.css）
+VITE_HASHED_PATTERN = re.compile(r'^assets/[^/]+-[A-Za-z0-9_-]{8}\.[A-Za-z0-9]+$')
+# 内容哈希文件使用的长缓存
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+# 固定路径的 wasm 缓存 7 天，过期后 30 天内先用旧文件并在后台重新验证
+STABLE_CACHE_CONTROL = 'public, max-age=604800, stale-while-revalidate=2592000'
+# 入口页面和清单使用的短缓存（每次都重新验证）
+SHORT_CACHE_CONTROL = 'public, max-age=0, must-revalidate'
+SHORT_CACHE_PATHS = ('/', '/index.html', '/' + ASSET_MANIFEST_FILE)
+# ==============================================
+
 def print_with_encoding(text):
     """确保文本以正确的编码输出"""
     print(text)
@@ -75,6 +142,35 @@ def run_command(cmd, cwd=None, shell=True):
         print_with_encoding(f"错误：运行命令失败：{e}")
         return None
 
+def run_git(args, cwd=None, env=None, input_data=None):
+    """
+    直接运行 git 命令（不经过 shell，参数按列表传递）
+
+    参数:
+        args: git 子命令及参数列表，如 ['write-tree']
+        cwd: 工作目录
+        env: 可选，额外的环境变量（如 GIT_INDEX_FILE）
+        input_data: 可选，写入标准输入的文本
+
+    返回:
+        CompletedProcess: 运行结果，启动失败时返回 None
+    """
+    try:
+        # 使用字节模式收发，避免 Windows 文本模式把写入 blob 的换行转换为 \r\n
+        result = subprocess.run(
+            ['git'] + args,
+            cwd=cwd,
+            env=dict(os.environ, **env) if env else None,
+            input=input_data.encode('utf-8') if isinstance(input_data, str) else input_data,
+            capture_output=True
+        )
+        result.stdout = result.stdout.decode('utf-8', errors='replace')
+        result.stderr = result.stderr.decode('utf-8', errors='replace')
+        return result
+    except Exception as e:
+        print_with_encoding(f"错误：运行 git {' '.join(args)} 失败：{e}")
+        return None
+
 def close_node_processes():
     """关闭 Node 进程"""
     print_with_encoding("\n1. 检查 Node 进程...")
@@ -198,8 +294,35 @@ def check_and_commit_git_changes():
     
     return True
 
-def publish_to_gh_pages():
-    """将 docs 目录发布到 gh-pages 分支"""
+def fetch_gh_pages_tip():
+    """
+    在临时仓库中获取远程 gh-pages 最新提交（增量模式使用）
+
+    只拉取提交和目录树（--filter=blob:none），不下载文件内容：
+    构建新提交时未变化的文件哈希与旧树一致，推送时远程已有这些 blob，不会重复上传。
+
+    返回:
+        str: 最新提交哈希，远程不存在 gh-pages 分支或拉取失败时返回 None
+    """
+    fetch_result = run_command('git fetch --depth=1 --filter=blob:none origin gh-pages')
+    if not fetch_result or fetch_result.returncode != 0:
+        if fetch_result and fetch_result.stderr:
+            print_with_encoding(f"[进度] 拉取输出: {fetch_result.stderr.strip()}")
+        return None
+
+    tip_result = run_command('git rev-parse FETCH_HEAD')
+    if not tip_result or tip_result.returncode != 0:
+        return None
+    return tip_result.stdout.strip()
+
+def publish_to_gh_pages(incremental=False, optimize=True):
+    """
+    将 docs 目录发布到 gh-pages 分支
+
+    参数:
+        incremental: 是否使用增量模式（以远程 gh-pages 最新提交为父提交，普通推送）
+        optimize: 是否在提交前对临时目录执行部署优化（此流程不输出体积报告）
+    """
     print_with_encoding("\n3. 正在将 docs 目录发布到 gh-pages 分支...")
     
     # 检查 docs 目录是否存在
@@ -243,11 +366,28 @@ def publish_to_gh_pages():
             print_with_encoding(f"[进度] 无法获取远程仓库地址，使用备选: {fallback_url}")
             run_command(f'git remote add origin "{fallback_url}"')
         
-        # 直接创建gh-pages分支（不检查远程分支存在性）
-        print_with_encoding("[进度] 创建并切换到gh-pages分支...")
-        run_command('git checkout --orphan gh-pages')
-        run_command('git reset --hard')
-        run_command('git commit --allow-empty -m "Initial commit for gh-pages"')
+        # 增量模式：以远程 gh-pages 最新提交为基础
+        base_commit = None
+        if incremental:
+            print_with_encoding("[进度] 增量模式：拉取远程 gh-pages 最新提交（不含文件内容）...")
+            base_commit = fetch_gh_pages_tip()
+            if base_commit:
+                print_with_encoding(f"[进度] 远程 gh-pages 最新提交: {base_commit}")
+            else:
+                print_with_encoding("[进度] 远程不存在 gh-pages 分支，改为完整发布")
+        
+        if base_commit:
+            # 让 gh-pages 指向远程最新提交，并把它的目录树读入索引（不检出文件）
+            print_with_encoding("[进度] 基于远程最新提交创建gh-pages分支...")
+            run_command('git checkout --orphan gh-pages')
+            run_command(f'git reset --soft {base_commit}')
+            run_command(f'git read-tree {base_commit}')
+        else:
+            # 直接创建gh-pages分支（不检查远程分支存在性）
+            print_with_encoding("[进度] 创建并切换到gh-pages分支...")
+            run_command('git checkout --orphan gh-pages')
+            run_command('git reset --hard')
+            run_command('git commit --allow-empty -m "Initial commit for gh-pages"')
         
         # 清空 gh-pages 分支的内容
         print_with_encoding("[进度] 清空 gh-pages 分支的内容...")
@@ -315,16 +455,33 @@ def publish_to_gh_pages():
             if item not in ['.git']:
                 print_with_encoding(f"[进度] - {item}")
         
-        # 添加所有文件
-        add_result = run_command('git add .')
+        if optimize:
+            optimize_directory(temp_dir)
+        write_asset_manifest_directory(temp_dir)
+        
+        # 添加所有文件（-A 同时记录删除，增量模式下旧树中已不存在的文件会被移除）
+        add_result = run_command('git add -A .')
         if add_result:
             print_with_encoding(f"[进度] git add 结果: {'成功' if add_result.returncode == 0 else '失败'}")
         
-        # 检查git状态
-        status_result = run_command('git status')
-        if status_result:
-            print_with_encoding("[进度] git status 结果:")
-            print_with_encoding(status_result.stdout)
+        if base_commit:
+            # 只比较对象哈希（--no-renames 避免为重命名检测下载 blob）
+            diff_result = run_command('git diff --cached --name-status --no-renames HEAD')
+            changed_files = [line for line in diff_result.stdout.splitlines() if line.strip()] if diff_result else []
+            print_with_encoding(f"[进度] 相对远程 gh-pages 变化的文件: {len(changed_files)} 个")
+            for line in changed_files[:20]:
+                print_with_encoding(f"[进度] {line}")
+            if len(changed_files) > 20:
+                print_with_encoding(f"[进度] ... 等{len(changed_files) - 20}个文件")
+            if not changed_files:
+                print_with_encoding("docs 与远程 gh-pages 内容一致，无需发布")
+                return True
+        else:
+            # 检查git状态
+            status_result = run_command('git status')
+            if status_result:
+                print_with_encoding("[进度] git status 结果:")
+                print_with_encoding(status_result.stdout)
         
         commit_msg = f"Deploy docs to gh-pages: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
         # 使用双引号包围提交消息，更适合Windows命令行
@@ -353,9 +510,14 @@ def publish_to_gh_pages():
             print_with_encoding("错误：提交更改失败")
             return False
         
-        # 强制推送到远程 gh-pages 分支
-        print_with_encoding("[进度] 强制推送到远程 gh-pages 分支...")
-        push_result = run_command('git push -f origin gh-pages')
+        if base_commit:
+            # 增量模式：新提交以远程最新提交为父提交，普通推送即可（只上传变化的对象）
+            print_with_encoding("[进度] 推送到远程 gh-pages 分支（增量）...")
+            push_result = run_command('git push origin gh-pages')
+        else:
+            # 强制推送到远程 gh-pages 分支
+            print_with_encoding("[进度] 强制推送到远程 gh-pages 分支...")
+            push_result = run_command('git push -f origin gh-pages')
         
         # 检查推送结果
         if push_result:
@@ -419,8 +581,714 @@ def publish_to_gh_pages():
         # 确保脚本正常退出
         print_with_encoding("[进度] 发布脚本执行完成")
 
+def recompress_png(data):
+    """
+    无损重压缩 PNG
+
+    优先使用 oxipng 命令行（与页面内 oxipng 压缩同一算法），未安装时退回 Pillow 的 optimize 重新编码。
+    Pillow 只保留第一帧且不写回 gAMA/sRGB 等块，因此回退时只处理全部块都能原样写回的文件（见 PILLOW_SAFE_PNG_CHUNKS），
+    文本块与 ICC 配置显式传回。
+
+    参数:
+        data: PNG 原始字节
+
+    返回:
+        bytes: 压缩后的字节，无法压缩或没有收益时返回 None
+    """
+    optimized = None
+    if shutil.which('oxipng'):
+        with tempfile.TemporaryDirectory(prefix='oxipng-') as temp_dir:
+            input_path = os.path.join(temp_dir, 'input.png')
+            output_path = os.path.join(temp_dir, 'output.png')
+            with open(input_path, 'wb') as f:
+                f.write(data)
+            result = subprocess.run(
+                ['oxipng', '-o', str(OXIPNG_LEVEL), '--strip', 'safe', '--alpha', '--quiet', '--out', output_path, input_path],
+                capture_output=True
+            )
+            if result.returncode == 0 and os.path.exists(output_path):
+                with open(output_path, 'rb') as f:
+                    optimized = f.read()
+    elif Image is not None and get_png_chunk_types(data) <= PILLOW_SAFE_PNG_CHUNKS:
+        try:
+            with Image.open(io.BytesIO(data)) as image:
+                pnginfo = PngImagePlugin.PngInfo()
+                for key, value in image.text.items():
+                    if isinstance(value, PngImagePlugin.iTXt):
+                        pnginfo.add_itxt(key, value, value.lang, value.tkey)
+                    else:
+                        pnginfo.add_text(key, value)
+                extra = {'icc_profile': image.info['icc_profile']} if image.info.get('icc_profile') else {}
+                buffer = io.BytesIO()
+                image.save(buffer, 'PNG', optimize=True, pnginfo=pnginfo, **extra)
+                optimized = buffer.getvalue()
+        except Exception:
+            optimized = None
+
+    if optimized and len(optimized) < len(data):
+        return optimized
+    return None
+
+def get_png_chunk_types(data):
+    """
+    列出 PNG 中出现的块类型
+
+    返回:
+        set: 块类型（bytes），不是合法 PNG 时返回包含 b'' 的集合（不会是 PILLOW_SAFE_PNG_CHUNKS 的子集）
+    """
+    if data[:8] != b'\x89PNG\r\n\x1a\n':
+        return {b''}
+    types = set()
+    pos = 8
+    while pos + 8 <= len(data):
+        length = int.from_bytes(data[pos:pos + 4], 'big')
+        chunk_type = data[pos + 4:pos + 8]
+        types.add(chunk_type)
+        if chunk_type == b'IEND':
+            break
+        pos += 12 + length
+    return types
+
+def precompress_text(data):
+    """
+    生成文本资源的 gzip / brotli 预压缩版本
+
+    gzip 固定 mtime=0，保证同一内容多次生成的字节一致（blob 哈希不变）。
+
+    参数:
+        data: 文本资源原始字节
+
+    返回:
+        dict: {'.gz': 字节, '.br': 字节}，只包含有收益的版本
+    """
+    variants = {}
+    if len(data) < PRECOMPRESS_MIN_SIZE:
+        return variants
+
+    gz_data = gzip.compress(data, compresslevel=9, mtime=0)
+    if len(gz_data) < len(data) * PRECOMPRESS_MAX_RATIO:
+        variants['.gz'] = gz_data
+
+    if brotli is not None:
+        br_data = brotli.compress(data, quality=11)
+        if len(br_data) < len(data) * PRECOMPRESS_MAX_RATIO:
+            variants['.br'] = br_data
+    return variants
+
+def is_png_optimize_target(path):
+    """判断文件是否需要无损重压缩（path 为相对 docs 的 / 分隔路径）"""
+    return path.lower().endswith('.png') and path.startswith(PNG_OPTIMIZE_DIRS)
+
+def is_precompress_target(path):
+    """判断文件是否需要生成预压缩文件"""
+    return path.lower().endswith(PRECOMPRESS_EXTENSIONS)
+
+def print_optimize_tools():
+    """打印可用的优化工具"""
+    if shutil.which('oxipng'):
+        png_tool = f'oxipng -o {OXIPNG_LEVEL}'
+    elif Image is not None:
+        png_tool = 'Pillow optimize'
+    else:
+        png_tool = '不可用（安装 oxipng 或 Pillow 后启用）'
+    print_with_encoding(f"[进度] PNG 重压缩: {png_tool}")
+    print_with_encoding(f"[进度] 预压缩: gzip{' + brotli' if brotli is not None else '（安装 brotli 后额外生成 .br）'}")
+
+def optimize_directory(root):
+    """
+    在目录中就地执行部署优化（--copy 流程使用）
+
+    参数:
+        root: 待发布的目录（docs 的副本）
+
+    返回:
+        dict: 优化统计
+    """
+    print_with_encoding("[进度] 执行部署优化...")
+    print_optimize_tools()
+    def optimize_file(path):
+        """优化单个文件，返回 (是否重压缩 PNG, 节省字节数, 生成的预压缩文件数)"""
+        rel_path = os.path.relpath(path, root).replace(os.sep, '/')
+        with open(path, 'rb') as f:
+            data = f.read()
+        png_saved = 0
+        if is_png_optimize_target(rel_path):
+            optimized = recompress_png(data)
+            if optimized:
+                with open(path, 'wb') as f:
+                    f.write(optimized)
+                png_saved = len(data) - len(optimized)
+        variants = precompress_text(data) if is_precompress_target(rel_path) else {}
+        for suffix, variant in variants.items():
+            with open(path + suffix, 'wb') as f:
+                f.write(variant)
+        return bool(png_saved), png_saved, len(variants)
+
+    files = []
+    for dir_path, dir_names, file_names in os.walk(root):
+        dir_names[:] = [name for name in dir_names if name != '.git']
+        files.extend(os.path.join(dir_path, name) for name in file_names)
+    with ThreadPoolExecutor() as executor:
+        results = list(executor.map(optimize_file, files))
+
+    stats = {
+        'png_count': sum(1 for optimized, _, _ in results if optimized),
+        'png_saved': sum(saved for _, saved, _ in results),
+        'precompressed': sum(count for _, _, count in results)
+    }
+    print_with_encoding(f"[进度] PNG 重压缩 {stats['png_count']} 个，节省 {stats['png_saved'] / 1024:.1f} KB；生成预压缩文件 {stats['precompressed']} 个")
+    return stats
+
+def optimize_deploy_index(project_root, git_dir, docs_path, index_env):
+    """
+    对部署索引执行优化（底层命令流程使用），不修改 docs 目录
+
+    实现思路：
+    1. 从独立索引读出 docs 的全部条目（blob 哈希即源文件内容哈希）
+    2. 按"优化类型:源哈希"查缓存，未命中的文件并行执行 PNG 重压缩 / 预压缩
+    3. 新生成的内容通过 git hash-object -w 写入对象库，再用 update-index --index-info 批量写回索引
+       （PNG 替换原条目，预压缩文件作为同目录的 .gz/.br 新条目）
+
+    参数:
+        project_root: 项目根目录
+        git_dir: .git 目录
+        docs_path: docs 目录
+        index_env: 指向独立索引的环境变量
+
+    返回:
+        dict: 优化统计，失败时返回 None
+    """
+    print_with_encoding("[进度] 执行部署优化...")
+    print_optimize_tools()
+
+    ls_result = run_git(['ls-files', '-s', '-z'], cwd=project_root, env=index_env)
+    if not ls_result or ls_result.returncode != 0:
+        print_with_encoding("错误：读取部署索引失败")
+        return None
+    entries = {}
+    for record in ls_result.stdout.split('\0'):
+        if not record:
+            continue
+        info, path = record.split('\t', 1)
+        entries[path] = info.split()[1]
+
+    # 读取缓存，并剔除对象库中已不存在的 blob（被 gc 清理）
+    cache_path = os.path.join(git_dir, OPTIMIZE_CACHE_FILE)
+    cache = {}
+    if os.path.exists(cache_path):
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            cache = {}
+    # 缓存值为 PNG 的 blob 哈希，或预压缩的 "gz=<哈希>,br=<哈希>"
+    def cached_value_blobs(value):
+        return [item.split('=', 1)[-1] for item in value.split(',') if item]
+
+    cached_blobs = sorted({blob for value in cache.values() for blob in cached_value_blobs(value)})
+    if cached_blobs:
+        check_result = run_git(['cat-file', '--batch-check'], cwd=project_root,
+                               input_data=''.join(f'{blob}\n' for blob in cached_blobs))
+        missing = {line.split()[0] for line in check_result.stdout.splitlines() if line.endswith(' missing')} if check_result else set(cached_blobs)
+        cache = {key: value for key, value in cache.items() if not missing.intersection(cached_value_blobs(value))}
+
+    # 收集需要计算的任务
+    tasks = []
+    for path, blob in entries.items():
+        if is_png_optimize_target(path) and f'png:{blob}' not in cache:
+            tasks.append(('png', path, blob))
+        if is_precompress_target(path) and f'pre:{blob}' not in cache:
+            tasks.append(('pre', path, blob))
+
+    def run_task(task):
+        kind, path, _ = task
+        with open(os.path.join(docs_path, path), 'rb') as f:
+            data = f.read()
+        if kind == 'png':
+            optimized = recompress_png(data)
+            return {'': optimized} if optimized else {}
+        return precompress_text(data)
+
+    if tasks:
+        print_with_encoding(f"[进度] 需要重新计算的优化任务: {len(tasks)} 个（其余命中缓存）")
+        with ThreadPoolExecutor() as executor:
+            outputs = list(executor.map(run_task, tasks))
+
+        # 把新内容写入临时文件，一次 hash-object 调用全部写入对象库
+        with tempfile.TemporaryDirectory(prefix='gh-pages-optimize-') as temp_dir:
+            pending = []
+            for index, ((kind, _, blob), variants) in enumerate(zip(tasks, outputs)):
+                if not variants:
+                    cache[f'{kind}:{blob}'] = ''
+                    continue
+                for suffix, data in variants.items():
+                    temp_path = os.path.join(temp_dir, f'{index}{suffix or ".png"}')
+                    with open(temp_path, 'wb') as f:
+                        f.write(data)
+                    pending.append((f'{kind}:{blob}', suffix, temp_path))
+            if pending:
+                hash_result = run_git(['hash-object', '-w', '--stdin-paths'], cwd=project_root,
+                                      input_data=''.join(f'{temp_path}\n' for _, _, temp_path in pending))
+                if not hash_result or hash_result.returncode != 0:
+                    print_with_encoding("错误：写入优化结果失败")
+                    return None
+                for (key, suffix, _), new_blob in zip(pending, hash_result.stdout.split()):
+                    if key.startswith('png:'):
+                        cache[key] = new_blob
+                    else:
+                        cache[key] = ','.join(filter(None, [cache.get(key), f'{suffix[1:]}={new_blob}']))
+
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, indent=2, sort_keys=True)
+
+    # 把优化结果写回索引
+    stats = {'png_count': 0, 'png_saved': 0, 'precompressed': 0}
+    index_lines = []
+    for path, blob in entries.items():
+        if is_png_optimize_target(path) and cache.get(f'png:{blob}'):
+            index_lines.append(f"100644 {cache[f'png:{blob}']}\t{path}")
+            stats['png_count'] += 1
+        if is_precompress_target(path) and cache.get(f'pre:{blob}'):
+            for item in cache[f'pre:{blob}'].split(','):
+                suffix, new_blob = item.split('=', 1)
+                index_lines.append(f"100644 {new_blob}\t{path}.{suffix}")
+                stats['precompressed'] += 1
+    if index_lines:
+        update_result = run_git(['update-index', '-z', '--index-info'], cwd=project_root, env=index_env,
+                                input_data=''.join(f'{line}\0' for line in index_lines))
+        if not update_result or update_result.returncode != 0:
+            print_with_encoding("错误：写回部署索引失败")
+            return None
+
+    # PNG 节省的体积通过对象大小计算
+    png_pairs = [(blob, cache[f'png:{blob}']) for path, blob in entries.items()
+                 if is_png_optimize_target(path) and cache.get(f'png:{blob}')]
+    if png_pairs:
+        sizes = get_blob_sizes(project_root, [blob for pair in png_pairs for blob in pair])
+        stats['png_saved'] = sum(sizes.get(old, 0) - sizes.get(new, 0) for old, new in png_pairs)
+
+    print_with_encoding(f"[进度] PNG 重压缩 {stats['png_count']} 个，节省 {stats['png_saved'] / 1024:.1f} KB；生成预压缩文件 {stats['precompressed']} 个")
+    return stats
+
+def get_blob_sizes(project_root, blobs):
+    """
+    批量查询 blob 大小
+
+    参数:
+        project_root: 项目根目录
+        blobs: blob 哈希列表
+
+    返回:
+        dict: {哈希: 字节数}
+    """
+    result = run_git(['cat-file', '--batch-check=%(objectname) %(objectsize)'], cwd=project_root,
+                     input_data=''.join(f'{blob}\n' for blob in blobs))
+    sizes = {}
+    if result and result.returncode == 0:
+        for line in result.stdout.splitlines():
+            parts = line.split()
+            if len(parts) == 2 and parts[1].isdigit():
+                sizes[parts[0]] = int(parts[1])
+    return sizes
+
+def list_tree_sizes(project_root, tree_ish):
+    """
+    列出目录树中每个文件的大小
+
+    参数:
+        project_root: 项目根目录
+        tree_ish: 提交或目录树哈希
+
+    返回:
+        dict: {路径: 字节数}
+    """
+    result = run_git(['ls-tree', '-r', '-l', '-z', tree_ish], cwd=project_root)
+    sizes = {}
+    if result and result.returncode == 0:
+        for record in result.stdout.split('\0'):
+            if not record:
+                continue
+            info, path = record.split('\t', 1)
+            size = info.split()[3]
+            sizes[path] = int(size) if size.isdigit() else 0
+    return sizes
+
+def drop_alias_sizes(project_root, tree_ish, sizes):
+    """
+    从文件大小表中去掉哈希别名（读取该目录树中的资源清单）
+
+    参数:
+        project_root: 项目根目录
+        tree_ish: 提交或目录树哈希
+        sizes: list_tree_sizes() 的结果
+
+    返回:
+        dict: 去掉别名后的 {路径: 字节数}
+    """
+    if ASSET_MANIFEST_FILE not in sizes:
+        return sizes
+    result = run_git(['cat-file', 'blob', f'{tree_ish}:{ASSET_MANIFEST_FILE}'], cwd=project_root)
+    try:
+        manifest_files = json.loads(result.stdout)['files'] if result and result.returncode == 0 else {}
+    except (ValueError, KeyError):
+        return sizes
+    aliases = {entry['file'] + suffix
+               for path, entry in manifest_files.items() if entry.get('file') != path
+               for suffix in ('',) + PRECOMPRESSED_SUFFIXES}
+    return {path: size for path, size in sizes.items() if path not in aliases}
+
+def get_size_group(path):
+    """体积报告的分组：assets 下按二级目录分组，其余按一级目录/根目录文件分组"""
+    parts = path.split('/')
+    if parts[0] == 'assets' and len(parts) > 2:
+        return '/'.join(parts[:2])
+    return parts[0] if len(parts) > 1 else '(根目录文件)'
+
+def print_size_report(project_root, previous_commit, tree):
+    """
+    打印本次发布与上一次 gh-pages 的体积对比
+
+    预压缩文件（.gz/.br）不计入页面实际加载体积，单独统计；哈希别名与原文件共用 blob，不重复计算。
+
+    参数:
+        project_root: 项目根目录
+        previous_commit: 上一次 gh-pages 提交，None 表示首次发布
+        tree: 本次发布的目录树
+    """
+    new_sizes = drop_alias_sizes(project_root, tree, list_tree_sizes(project_root, tree))
+    old_sizes = drop_alias_sizes(project_root, previous_commit, list_tree_sizes(project_root, previous_commit)) if previous_commit else {}
+
+    def split_sizes(sizes):
+        assets = {path: size for path, size in sizes.items() if not path.endswith(PRECOMPRESSED_SUFFIXES)}
+        return assets, sum(size for path, size in sizes.items() if path.endswith(PRECOMPRESSED_SUFFIXES))
+
+    new_assets, new_precompressed = split_sizes(new_sizes)
+    old_assets, old_precompressed = split_sizes(old_sizes)
+
+    def format_kb(size):
+        return f"{size / 1024:,.1f} KB"
+
+    def format_delta(delta):
+        return f"{'+' if delta > 0 else ''}{delta / 1024:,.1f} KB"
+
+    print_with_encoding("\n[体积报告] 与上一次 gh-pages 对比" if previous_commit else "\n[体积报告] 首次发布，无对比基准")
+    groups = {}
+    for path, size in old_assets.items():
+        groups.setdefault(get_size_group(path), [0, 0])[0] += size
+    for path, size in new_assets.items():
+        groups.setdefault(get_size_group(path), [0, 0])[1] += size
+    print_with_encoding(f"  {'分组'.ljust(28)}{'上次'.rjust(14)}{'本次'.rjust(14)}{'变化'.rjust(14)}")
+    for group, (old_size, new_size) in sorted(groups.items(), key=lambda item: -item[1][1]):
+        print_with_encoding(f"  {group.ljust(28)}{format_kb(old_size).rjust(14)}{format_kb(new_size).rjust(14)}{format_delta(new_size - old_size).rjust(14)}")
+    old_total = sum(old_assets.values())
+    new_total = sum(new_assets.values())
+    print_with_encoding(f"  {'合计'.ljust(28)}{format_kb(old_total).rjust(14)}{format_kb(new_total).rjust(14)}{format_delta(new_total - old_total).rjust(14)}")
+    print_with_encoding(f"  预压缩文件（.gz/.br）: {format_kb(old_precompressed)} -> {format_kb(new_precompressed)}")
+
+    changes = []
+    for path in set(old_assets) | set(new_assets):
+        delta = new_assets.get(path, 0) - old_assets.get(path, 0)
+        if delta:
+            changes.append((abs(delta), delta, path))
+    if changes:
+        print_with_encoding("  变化最大的文件:")
+        for _, delta, path in sorted(changes, reverse=True)[:10]:
+            print_with_encoding(f"    {format_delta(delta).rjust(12)}  {path}")
+
+def get_git_blob_hash(data):
+    """计算与 git hash-object 一致的 blob 哈希（--copy 流程中没有对象库时使用）"""
+    return hashlib.sha1(b'blob %d\0' % len(data) + data).hexdigest()
+
+def get_hashed_alias(path, blob):
+    """
+    生成内容哈希别名，如 assets/js/lib/vue.min.js -> assets/js/lib/vue.min.1a2b3c4d.js
+
+    参数:
+        path: 相对发布根目录的 / 分隔路径
+        blob: 文件的 blob 哈希
+
+    返回:
+        str: 别名路径，不需要别名的文件返回 None
+    """
+    if not path.startswith(HASHED_ALIAS_PREFIXES) or path.lower().endswith(STABLE_CACHE_EXTENSIONS):
+        return None
+    stem, ext = posixpath.splitext(path)
+    return f'{stem}.{blob[:8]}{ext}'
+
+def build_asset_manifest(files):
+    """
+    生成资源清单、哈希别名和缓存头规则
+
+    清单中每个逻辑路径对应：
+    - file: 实际请求的文件名（有哈希别名时为别名，否则为原路径）
+    - hash: 内容的 blob 哈希
+    - size: 字节数
+
+    参数:
+        files: {路径: (blob 哈希, 字节数)}，不含预压缩文件、清单和 _headers 本身
+
+    返回:
+        tuple: (清单 dict, {别名: 原路径}, 追加到 _headers 的规则文本)
+    """
+    manifest_files = {}
+    aliases = {}
+    immutable_paths = []
+    stable_paths = []
+    for path in sorted(files):
+        blob, size = files[path]
+        alias = get_hashed_alias(path, blob)
+        if alias:
+            aliases[alias] = path
+            immutable_paths.append(alias)
+        elif VITE_HASHED_PATTERN.match(path):
+            immutable_paths.append(path)
+        elif path.lower().endswith(STABLE_CACHE_EXTENSIONS):
+            stable_paths.append(path)
+        manifest_files[path] = {'file': alias or path, 'hash': blob, 'size': size}
+
+    lines = ['', '# 以下规则由 publish-gh-pages-final.py 在发布时生成，请勿手动修改']
+    for path in SHORT_CACHE_PATHS:
+        lines += [path, f'  Cache-Control: {SHORT_CACHE_CONTROL}']
+    for path in sorted(immutable_paths):
+        lines += [f'/{path}', f'  Cache-Control: {IMMUTABLE_CACHE_CONTROL}']
+    for path in stable_paths:
+        lines += [f'/{path}', f'  Cache-Control: {STABLE_CACHE_CONTROL}']
+    return {'files': manifest_files}, aliases, '\n'.join(lines) + '\n'
+
+def is_manifest_source(path):
+    """判断文件是否参与资源清单（排除预压缩文件、清单和 _headers 本身）"""
+    return path not in (ASSET_MANIFEST_FILE, HEADERS_FILE) and not path.endswith(PRECOMPRESSED_SUFFIXES)
+
+def write_asset_manifest_directory(root):
+    """
+    在目录中生成资源清单、哈希别名副本并追加 _headers 规则（--copy 流程使用）
+
+    参数:
+        root: 待发布的目录（docs 的副本）
+
+    返回:
+        int: 生成的哈希别名数量
+    """
+    files = {}
+    for dir_path, dir_names, file_names in os.walk(root):
+        dir_names[:] = [name for name in dir_names if name != '.git']
+        for name in file_names:
+            full_path = os.path.join(dir_path, name)
+            rel_path = os.path.relpath(full_path, root).replace(os.sep, '/')
+            if is_manifest_source(rel_path):
+                with open(full_path, 'rb') as f:
+                    data = f.read()
+                files[rel_path] = (get_git_blob_hash(data), len(data))
+
+    manifest, aliases, headers_block = build_asset_manifest(files)
+    for alias, source in aliases.items():
+        for suffix in ('',) + PRECOMPRESSED_SUFFIXES:
+            source_path = os.path.join(root, source + suffix)
+            if os.path.exists(source_path):
+                shutil.copy2(source_path, os.path.join(root, alias + suffix))
+
+    with open(os.path.join(root, ASSET_MANIFEST_FILE), 'w', encoding='utf-8', newline='\n') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+    headers_path = os.path.join(root, HEADERS_FILE)
+    headers = ''
+    if os.path.exists(headers_path):
+        with open(headers_path, 'r', encoding='utf-8') as f:
+            headers = f.read()
+    with open(headers_path, 'w', encoding='utf-8', newline='\n') as f:
+        f.write(headers.rstrip('\n') + '\n' + headers_block)
+
+    print_with_encoding(f"[进度] 资源清单: {len(manifest['files'])} 个文件，哈希别名 {len(aliases)} 个")
+    return len(aliases)
+
+def write_asset_manifest_index(project_root, index_env):
+    """
+    在部署索引中生成资源清单、哈希别名并追加 _headers 规则（底层命令流程使用）
+
+    哈希别名直接指向原文件的 blob，不产生新对象，也不会增加推送体积。
+
+    参数:
+        project_root: 项目根目录
+        index_env: 指向独立索引的环境变量
+
+    返回:
+        bool: 是否成功
+    """
+    ls_result = run_git(['ls-files', '-s', '-z'], cwd=project_root, env=index_env)
+    if not ls_result or ls_result.returncode != 0:
+        print_with_encoding("错误：读取部署索引失败")
+        return False
+    entries = {}
+    for record in ls_result.stdout.split('\0'):
+        if record:
+            info, path = record.split('\t', 1)
+            entries[path] = info.split()[1]
+
+    sources = {path: blob for path, blob in entries.items() if is_manifest_source(path)}
+    sizes = get_blob_sizes(project_root, sorted(set(sources.values())))
+    manifest, aliases, headers_block = build_asset_manifest(
+        {path: (blob, sizes.get(blob, 0)) for path, blob in sources.items()}
+    )
+
+    headers = ''
+    if HEADERS_FILE in entries:
+        headers_result = run_git(['cat-file', 'blob', entries[HEADERS_FILE]], cwd=project_root)
+        headers = headers_result.stdout if headers_result and headers_result.returncode == 0 else ''
+
+    new_blobs = []
+    for content in (json.dumps(manifest, ensure_ascii=False, indent=2, sort_keys=True) + '\n',
+                    headers.rstrip('\n') + '\n' + headers_block):
+        hash_result = run_git(['hash-object', '-w', '--stdin'], cwd=project_root, input_data=content)
+        if not hash_result or hash_result.returncode != 0:
+            print_with_encoding("错误：写入资源清单失败")
+            return False
+        new_blobs.append(hash_result.stdout.strip())
+
+    index_lines = [f"100644 {new_blobs[0]}\t{ASSET_MANIFEST_FILE}", f"100644 {new_blobs[1]}\t{HEADERS_FILE}"]
+    for alias, source in aliases.items():
+        for suffix in ('',) + PRECOMPRESSED_SUFFIXES:
+            if source + suffix in entries:
+                index_lines.append(f"100644 {entries[source + suffix]}\t{alias}{suffix}")
+    update_result = run_git(['update-index', '-z', '--index-info'], cwd=project_root, env=index_env,
+                            input_data=''.join(f'{line}\0' for line in index_lines))
+    if not update_result or update_result.returncode != 0:
+        print_with_encoding("错误：写回部署索引失败")
+        return False
+
+    print_with_encoding(f"[进度] 资源清单: {len(manifest['files'])} 个文件，哈希别名 {len(aliases)} 个")
+    return True
+
+def publish_with_plumbing(incremental=False, optimize=True):
+    """
+    使用 git 底层命令将 docs 目录发布到 gh-pages 分支（不复制文件、不检出分支）
+
+    实现思路：
+    1. 使用 .git 下独立的索引文件，以 docs 为工作树执行 git add -A，
+       索引在多次发布间保留，只有修改过的文件才会重新计算哈希
+    2. 部署优化直接改写索引条目（PNG 重压缩、追加 .gz/.br），再写入资源清单、哈希别名和 _headers，docs 目录保持不变
+    3. git write-tree 生成目录树，git commit-tree 生成提交（增量模式以远程 gh-pages 最新提交为父提交）
+    4. 直接推送提交到远程 refs/heads/gh-pages，无远程仓库时更新本地 gh-pages 分支
+
+    参数:
+        incremental: 是否使用增量模式
+        optimize: 是否执行部署优化
+
+    返回:
+        bool: 是否发布成功
+    """
+    print_with_encoding("\n3. 正在将 docs 目录发布到 gh-pages 分支（底层命令模式）...")
+
+    project_root = os.getcwd()
+    docs_path = os.path.join(project_root, 'docs')
+    if not os.path.exists(docs_path):
+        print_with_encoding("错误：docs 目录不存在")
+        return False
+
+    git_dir_result = run_git(['rev-parse', '--absolute-git-dir'], cwd=project_root)
+    if not git_dir_result or git_dir_result.returncode != 0:
+        print_with_encoding("错误：获取 .git 目录失败")
+        return False
+    git_dir = git_dir_result.stdout.strip()
+    index_env = {'GIT_INDEX_FILE': os.path.join(git_dir, 'gh-pages-deploy.index')}
+
+    remote_result = run_git(['remote', 'get-url', 'origin'], cwd=project_root)
+    has_remote = bool(remote_result and remote_result.returncode == 0 and remote_result.stdout.strip())
+    if has_remote:
+        print_with_encoding(f"[进度] 远程仓库地址: {remote_result.stdout.strip()}")
+    else:
+        print_with_encoding("[进度] 未配置 origin 远程仓库，将只更新本地 gh-pages 分支")
+
+    # 获取上一次 gh-pages 提交：增量模式作为父提交，同时用于体积报告
+    if has_remote:
+        print_with_encoding("[进度] 拉取远程 gh-pages 最新提交...")
+        fetch_result = run_git(['fetch', '--no-tags', 'origin', 'gh-pages'], cwd=project_root)
+        tip_result = run_git(['rev-parse', 'FETCH_HEAD'], cwd=project_root) if fetch_result and fetch_result.returncode == 0 else None
+    else:
+        tip_result = run_git(['rev-parse', '--verify', '--quiet', 'refs/heads/gh-pages'], cwd=project_root)
+    previous_commit = tip_result.stdout.strip() if tip_result and tip_result.returncode == 0 else None
+    if previous_commit:
+        print_with_encoding(f"[进度] gh-pages 最新提交: {previous_commit}")
+    elif incremental:
+        print_with_encoding("[进度] 不存在 gh-pages 分支，改为完整发布")
+    base_commit = previous_commit if incremental else None
+
+    # 以 docs 为工作树写入独立索引（-A 同时记录删除）
+    print_with_encoding("[进度] 将 docs 写入对象库...")
+    add_result = run_git(['--git-dir', git_dir, '--work-tree', docs_path, 'add', '-A'],
+                         cwd=docs_path, env=index_env)
+    if not add_result or add_result.returncode != 0:
+        print_with_encoding("错误：写入 docs 失败")
+        if add_result:
+            print_with_encoding(f"错误信息：{add_result.stderr}")
+        return False
+
+    if optimize and optimize_deploy_index(project_root, git_dir, docs_path, index_env) is None:
+        return False
+
+    if not write_asset_manifest_index(project_root, index_env):
+        return False
+
+    tree_result = run_git(['write-tree'], cwd=project_root, env=index_env)
+    if not tree_result or tree_result.returncode != 0:
+        print_with_encoding("错误：生成目录树失败")
+        return False
+    tree = tree_result.stdout.strip()
+    print_with_encoding(f"[进度] 目录树: {tree}")
+    print_size_report(project_root, previous_commit, tree)
+
+    if base_commit:
+        diff_result = run_git(['-c', 'core.quotepath=false', 'diff-tree', '-r', '--no-renames', '--name-status', base_commit, tree], cwd=project_root)
+        changed_files = [line for line in diff_result.stdout.splitlines() if line.strip()] if diff_result else []
+        print_with_encoding(f"[进度] 相对 gh-pages 变化的文件: {len(changed_files)} 个")
+        for line in changed_files[:20]:
+            print_with_encoding(f"[进度] {line}")
+        if len(changed_files) > 20:
+            print_with_encoding(f"[进度] ... 等{len(changed_files) - 20}个文件")
+        if not changed_files:
+            print_with_encoding("docs 与 gh-pages 内容一致，无需发布")
+            return True
+
+    commit_msg = f"Deploy docs to gh-pages: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+    commit_args = ['commit-tree', tree, '-m', commit_msg]
+    if base_commit:
+        commit_args[2:2] = ['-p', base_commit]
+    commit_result = run_git(commit_args, cwd=project_root)
+    if not commit_result or commit_result.returncode != 0:
+        print_with_encoding("错误：生成提交失败")
+        if commit_result:
+            print_with_encoding(f"错误信息：{commit_result.stderr}")
+        return False
+    commit = commit_result.stdout.strip()
+    print_with_encoding(f"[进度] 提交: {commit}")
+
+    if has_remote:
+        push_args = ['push', 'origin', f'{commit}:refs/heads/gh-pages']
+        if not base_commit:
+            push_args.insert(1, '-f')
+        print_with_encoding(f"[进度] 推送到远程 gh-pages 分支{'（增量）' if base_commit else '（强制）'}...")
+        push_result = run_git(push_args, cwd=project_root)
+    else:
+        push_result = run_git(['update-ref', 'refs/heads/gh-pages', commit], cwd=project_root)
+
+    if not push_result or push_result.returncode != 0:
+        print_with_encoding("错误：推送失败")
+        if push_result:
+            print_with_encoding(f"错误信息：{push_result.stderr}")
+        return False
+
+    print_with_encoding("成功：docs 目录已发布到 gh-pages 分支")
+    return True
+
 def main():
     """主函数"""
+    parser = argparse.ArgumentParser(description='将 docs 目录发布到 gh-pages 分支')
+    parser.add_argument('--incremental', action='store_true',
+                        help='增量发布：基于远程 gh-pages 最新提交构建新提交，只推送变化的对象')
+    parser.add_argument('--copy', action='store_true',
+                        help='使用旧流程：复制 docs 到临时仓库后提交（默认直接用 git 底层命令写入对象库）')
+    parser.add_argument('--no-optimize', action='store_true',
+                        help='跳过部署优化（PNG 无损重压缩、.gz/.br 预压缩）')
+    args = parser.parse_args()
+    
     print_with_encoding("=== 发布到 gh-pages 分支脚本 ===")
     
     # 1. 关闭 Node 进程
@@ -432,7 +1300,8 @@ def main():
         sys.exit(1)
     
     # 3. 将 docs 目录发布到 gh-pages 分支
-    if not publish_to_gh_pages():
+    publish = publish_to_gh_pages if args.copy else publish_with_plumbing
+    if not publish(incremental=args.incremental, optimize=not args.no_optimize):
         print_with_encoding("错误：发布到 gh-pages 分支失败")
         sys.exit(1)
     
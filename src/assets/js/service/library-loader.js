@@ -25,7 +25,12 @@
  *    - listeners: 进度监听器数组，通过 onProgress(callback) 注册
  *    - 加载过程中会实时更新 progress（0→50→100），触发所有监听器
  * 
- * 5. 【容错降级】
+ * 5. 【内容哈希地址】
+ *    - 发布脚本会生成 asset-manifest.json，把 lib 目录下的库映射到带内容哈希的文件名
+ *    - 哈希文件配置了 immutable 长缓存，再次访问时浏览器直接使用缓存，不再发起验证请求
+ *    - 首次加载库前读取一次清单；开发环境没有清单时使用原地址
+ * 
+ * 6. 【容错降级】
  *    - 如果库已加载（checkFn()=true），直接跳过
  *    - 加载失败不会阻塞其他库，继续处理队列
  *    - 实际使用时（如 svga-builder.js）会检测库是否存在，不存在则降级
@@ -227,6 +232,11 @@
     }
   };
 
+  /**
+   * 资源清单地址（由 publish-gh-pages-final.py 在发布时生成）
+   */
+  var ASSET_MANIFEST_URL = 'asset-manifest.json';
+
   /**
    * LibraryLoader 类
    */
@@ -236,8 +246,41 @@
     this.currentLib = null;    // 当前加载的库 { name, url, progress }
     this.loadedLibs = {};      // 已加载的库 { libName: true }
     this.listeners = [];       // 进度监听器
+    this.assetManifest = null; // 资源清单加载 Promise
   }
 
+  /**
+   * 读取资源清单（只请求一次）
+   * @returns {Promise<Object>} 清单中的 files 映射 { 逻辑路径: { file, hash, size } }，不可用时为空对象
+   */
+  LibraryLoader.prototype.loadAssetManifest = function () {
+    if (!this.assetManifest) {
+      this.assetManifest = fetch(ASSET_MANIFEST_URL, { cache: 'no-cache' })
+        .then(function (response) {
+          return response.ok ? response.json() : {};
+        })
+        .then(function (manifest) {
+          return (manifest && manifest.files) || {};
+        })
+        .catch(function () {
+          // 开发环境没有清单（或返回的不是 JSON），使用原地址
+          return {};
+        });
+    }
+    return this.assetManifest;
+  };
+
+  /**
+   * 把本地库地址解析为带内容哈希的地址
+   * @param {string} url - 原地址
+   * @param {Object} files - 资源清单的 files 映射
+   * @returns {string} 哈希地址，清单中没有时返回原地址
+   */
+  LibraryLoader.prototype.resolveAssetUrl = function (url, files) {
+    var entry = files[url];
+    return entry && entry.file ? entry.file : url;
+  };
+
   /**
    * 添加进度监听器
    * @param {Function} callback - 回调函数 (currentLib) => void
@@ -421,7 +464,11 @@
       });
     };
 
-    return tryLoadUrl(0);
+    // 先把主地址解析为内容哈希地址，再开始加载
+    return this.loadAssetManifest().then(function (files) {
+      urls[0] = _this.resolveAssetUrl(urls[0], files);
+      return tryLoadUrl(0);
+    });
   };
 
   /**
@@ -9,8 +9,139 @@
  */
 if (typeof window === 'undefined') {
   // Service Worker 代码
-  self.addEventListener('install', () => self.skipWaiting());
-  self.addEventListener('activate', (event) => event.waitUntil(self.clients.claim()));
+
+  /**
+   * 预缓存清单：构建时由 copy-static.py 注入（开发环境为 null，不启用预缓存）
+   * 格式：{ version, assets: [{ url, hash, size }], runtime: [CDN 前缀] }
+   * - assets：安装时预缓存的重量级运行时资源（ffmpeg、pngquant、oxipng、protobuf、svga.proto），之后缓存优先
+   * - runtime：版本固定的 CDN 资源，首次请求时缓存，之后缓存优先
+   * 清单变化会改变本文件内容，浏览器据此安装新版 Service Worker 并清理旧缓存
+   */
+  const PRECACHE_MANIFEST = null;
+  const PRECACHE_PREFIX = 'meewoo-precache-';
+  const RUNTIME_CACHE = 'meewoo-runtime-v1';
+  const precacheName = PRECACHE_MANIFEST ? PRECACHE_PREFIX + PRECACHE_MANIFEST.version : null;
+
+  // 资源绝对地址 -> 清单条目
+  const precacheEntries = new Map();
+  if (PRECACHE_MANIFEST) {
+    PRECACHE_MANIFEST.assets.forEach((asset) => {
+      precacheEntries.set(new URL(asset.url, self.registration.scope).href, asset);
+    });
+  }
+
+  /**
+   * 缓存键带上内容哈希：内容未变的资源在版本升级时可以直接从旧缓存复制，不必重新下载
+   */
+  const getCacheKey = (url, asset) => url + '?__precache=' + asset.hash;
+
+  /**
+   * 查找请求对应的预缓存条目
+   * 发布脚本生成的内容哈希别名（如 protobuf.min.1a2b3c4d.js）对应同一个逻辑文件
+   * @returns {String|null} 缓存键
+   */
+  const getPrecacheKey = (request) => {
+    if (!PRECACHE_MANIFEST || request.method !== 'GET') {
+      return null;
+    }
+    const url = new URL(request.url);
+    url.search = '';
+    url.hash = '';
+    let asset = precacheEntries.get(url.href);
+    if (!asset) {
+      url.pathname = url.pathname.replace(/\.[0-9a-f]{8}(\.[^./]+)$/, '$1');
+      asset = precacheEntries.get(url.href);
+    }
+    return asset ? getCacheKey(url.href, asset) : null;
+  };
+
+  const isRuntimeCached = (request) => {
+    return !!PRECACHE_MANIFEST && request.method === 'GET' &&
+      PRECACHE_MANIFEST.runtime.some((prefix) => request.url.startsWith(prefix));
+  };
+
+  /**
+   * 安装时预缓存：优先从旧版本缓存复制内容未变的资源
+   * 预缓存失败不影响 Service Worker 安装（跨域隔离是必需功能）
+   */
+  const precacheAssets = () => {
+    if (!PRECACHE_MANIFEST) {
+      return Promise.resolve();
+    }
+    return caches.open(precacheName).then((cache) => Promise.all(
+      Array.from(precacheEntries.entries()).map(([url, asset]) => {
+        const key = getCacheKey(url, asset);
+        return caches.match(key).then((cached) => {
+          if (cached) {
+            return cache.put(key, cached);
+          }
+          return fetch(url, { cache: 'reload' }).then((response) => {
+            if (response.ok) {
+              return cache.put(key, response);
+            }
+          });
+        });
+      })
+    )).catch((e) => {
+      console.warn('[COI SW] Precache failed:', e);
+    });
+  };
+
+  /**
+   * 激活时删除旧版本的预缓存
+   */
+  const deleteOldPrecaches = () => {
+    return caches.keys().then((names) => Promise.all(
+      names
+        .filter((name) => name.startsWith(PRECACHE_PREFIX) && name !== precacheName)
+        .map((name) => caches.delete(name))
+    ));
+  };
+
+  /**
+   * 添加跨域隔离响应头
+   */
+  const withIsolationHeaders = (response) => {
+    // 响应状态码为 0 表示 opaque 响应（跨域 no-cors），直接返回
+    if (response.status === 0) {
+      return response;
+    }
+
+    const newHeaders = new Headers(response.headers);
+
+    // 为所有响应设置 COOP
+    newHeaders.set('Cross-Origin-Opener-Policy', 'same-origin');
+
+    // 为文档设置 COEP: credentialless
+    // credentialless 模式不需要为资源设置 CORP 头
+    newHeaders.set('Cross-Origin-Embedder-Policy', 'credentialless');
+
+    return new Response(response.body, {
+      status: response.status,
+      statusText: response.statusText,
+      headers: newHeaders,
+    });
+  };
+
+  /**
+   * 缓存优先：命中直接返回，未命中时请求网络并写入缓存（只缓存成功的非 opaque 响应）
+   */
+  const cacheFirst = (cacheName, key, request) => {
+    return caches.open(cacheName).then((cache) => cache.match(key).then((cached) => {
+      if (cached) {
+        return cached;
+      }
+      return fetch(request).then((response) => {
+        if (response.ok && response.type !== 'opaque') {
+          cache.put(key, response.clone());
+        }
+        return response;
+      });
+    }));
+  };
+
+  self.addEventListener('install', (event) => event.waitUntil(precacheAssets().then(() => self.skipWaiting())));
+  self.addEventListener('activate', (event) => event.waitUntil(deleteOldPrecaches().then(() => self.clients.claim())));
 
   self.addEventListener('fetch', (event) => {
     const r = event.request;
@@ -25,29 +156,16 @@ if (typeof window === 'undefined') {
       ? new Request(r, { credentials: 'omit' })
       : r;
 
-    event.respondWith(
-      fetch(request)
-        .then((response) => {
-          // 响应状态码为 0 表示 opaque 响应（跨域 no-cors），直接返回
-          if (response.status === 0) {
-            return response;
-          }
+    const networkFetch = () => fetch(request).then(withIsolationHeaders);
 
-          const newHeaders = new Headers(response.headers);
-          
-          // 为所有响应设置 COOP
-          newHeaders.set('Cross-Origin-Opener-Policy', 'same-origin');
-          
-          // 为文档设置 COEP: credentialless
-          // credentialless 模式不需要为资源设置 CORP 头
-          newHeaders.set('Cross-Origin-Embedder-Policy', 'credentialless');
-
-          return new Response(response.body, {
-            status: response.status,
-            statusText: response.statusText,
-            headers: newHeaders,
-          });
-        })
+    // 预缓存资源与版本固定的 CDN 资源：缓存优先，缓存异常时回退网络
+    const precacheKey = getPrecacheKey(r);
+    const cached = precacheKey
+      ? cacheFirst(precacheName, precacheKey, request)
+      : (isRuntimeCached(r) ? cacheFirst(RUNTIME_CACHE, r.url, request) : null);
+
+    event.respondWith(
+      (cached ? cached.then(withIsolationHeaders).catch(networkFetch) : networkFetch())
         .catch((e) => {
           console.error('[COI SW] Fetch error:', e);
           // 返回网络错误而不是抛异常，避免页面崩溃
@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+"""
+SVGA / YYEVA 服务端工具
+
+在浏览器之外批量读取、检查和转换 SVGA 文件（src/svga.proto 定义的 2.x 格式与 1.x zip 包）。
+纯 Python 实现，核心编解码不依赖第三方库。
+
+命令行:
+    python -m svga_tools info test_files/test.svga
+"""
+
+from .model import (
+    MovieEntity, MovieParams, SpriteEntity, FrameEntity, AudioEntity,
+    Layout, Transform, ShapeEntity, ShapeArgs, RectArgs, EllipseArgs,
+    ShapeStyle, RGBAColor, ShapeType, LineCap, LineJoin
+)
+from .codec import SVGAError, load, loads, dump, dumps
+
+__all__ = [
+    'MovieEntity', 'MovieParams', 'SpriteEntity', 'FrameEntity', 'AudioEntity',
+    'Layout', 'Transform', 'ShapeEntity', 'ShapeArgs', 'RectArgs', 'EllipseArgs',
+    'ShapeStyle', 'RGBAColor', 'ShapeType', 'LineCap', 'LineJoin',
+    'SVGAError', 'load', 'loads', 'dump', 'dumps'
+]
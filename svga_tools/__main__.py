@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+svga_tools 命令行入口
+
+用法:
+    python -m svga_tools <命令> [参数...]
+    python -m svga_tools <命令> --help
+"""
+
+import importlib
+import sys
+
+
+# 命令名 -> (模块, 说明)
+COMMANDS = {
+    'info': ('svga_tools.info', '输出 SVGA 文件的基本信息'),
+    'optimize': ('svga_tools.optimize', '图片去重、PNG 无损重压缩、外层最高级别压缩'),
+    'compact': ('svga_tools.compact', '精简帧数据（KEEP、省略单位矩阵、清空不可见帧）'),
+    'analyze': ('svga_tools.analyze', '渲染开销分析（图层、过度绘制、遮罩、显存）与预算检查'),
+    'render': ('svga_tools.render', '将位图图层渲染为 PNG 帧（NumPy，无需浏览器）'),
+    'convert': ('svga_tools.convert', '批量转换为 GIF / WebP / 序列帧 ZIP（多进程并行）'),
+    'dual-channel': ('svga_tools.dual_channel', '合成双通道（彩色 + Alpha）MP4，帧通过管道交给本地 ffmpeg'),
+    'yyeva': ('svga_tools.yyeva', '解析 YYEVA MP4 的动态元素元数据，可导出 _yyeva_data.json'),
+    'yyeva-batch': ('svga_tools.yyeva_batch', '按 CSV 批量渲染 YYEVA 动态元素（文本 / 图片），输出双通道 MP4'),
+}
+
+
+def print_usage():
+    """打印命令列表"""
+    print('用法: python -m svga_tools <命令> [参数...]\n')
+    print('命令:')
+    for name, (_, description) in COMMANDS.items():
+        print(f'  {name.ljust(12)} {description}')
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ('-h', '--help') or argv[0] not in COMMANDS:
+        print_usage()
+        return 0 if not argv or argv[0] in ('-h', '--help') else 1
+
+    module = importlib.import_module(COMMANDS[argv[0]][0])
+    return module.main(argv[1:])
+
+
+if __name__ == '__main__':
+    sys.exit(main())
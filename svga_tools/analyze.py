@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SVGA 渲染开销分析
+
+按文件、按帧统计影响低端机流畅度的指标，并与预算比较：
+- 可见图层数（alpha > 0，遮罩图层本身不绘制，不计入）
+- 过度绘制：可见图层经 transform 后的 layout 面积之和 / 画布面积
+- 遮罩（matteKey）与 clipPath 使用数
+- 矢量元素数（KEEP 按前一帧展开）
+- 图片解码后的像素总数与估算显存（RGBA 每像素 4 字节，加画布与遮罩离屏画布）
+
+超出预算时退出码为 1，可在 CI 或上传前检查中拦截。
+
+用法:
+    python -m svga_tools analyze docs/assets/svga/*.svga
+    python -m svga_tools analyze test_files/test.svga --max-overdraw 3 --max-gpu-mb 48 --json
+    python -m svga_tools analyze test_files/test.svga --frames
+"""
+
+import argparse
+import json
+
+from .codec import SVGAError, detect_format, load
+from .lazy import LazyMovie
+from .model import MATTE_SUFFIX, ShapeType
+from .png import get_png_size
+
+
+BYTES_PER_PIXEL = 4
+
+# 默认预算（低端机经验值），均可通过命令行覆盖
+DEFAULT_BUDGETS = {
+    'max_sprites': 40,
+    'max_overdraw': 8.0,
+    'max_mattes': 4,
+    'max_clip_paths': 8,
+    'max_shapes': 200,
+    'max_image_pixels': 4096 * 4096,
+    'max_gpu_mb': 64.0
+}
+
+
+def transform_area_scale(transform):
+    """
+    变换后面积的缩放系数 |det|
+
+    svga.min.js 解析 transform 时 a/d 为 0 会按 1 处理，这里保持一致。
+    """
+    if transform is None:
+        return 1.0
+    a = transform.a or 1.0
+    d = transform.d or 1.0
+    return abs(a * d - transform.b * transform.c)
+
+
+def analyze_frames(sprites, frame_count, canvas_area):
+    """
+    逐帧统计渲染指标
+
+    参数:
+        sprites: 图层序列（SpriteEntity 或 LazySprite）
+        frame_count: 总帧数
+        canvas_area: 画布面积
+
+    返回:
+        list: 每帧的统计 dict
+    """
+    frames = [
+        {'frame': index, 'sprites': 0, 'overdraw': 0.0, 'mattes': 0, 'clip_paths': 0, 'shapes': 0}
+        for index in range(frame_count)
+    ]
+    for sprite in sprites:
+        # 遮罩图层只作为 destination-in 的蒙版使用，不单独绘制
+        if sprite.imageKey.endswith(MATTE_SUFFIX):
+            continue
+        last_shapes = []
+        for index, frame in enumerate(sprite.frames[:frame_count]):
+            if frame.shapes and frame.shapes[0].type == ShapeType.KEEP:
+                shapes = last_shapes
+            else:
+                shapes = last_shapes = frame.shapes
+            if not frame.is_visible():
+                continue
+            stats = frames[index]
+            stats['sprites'] += 1
+            if frame.layout is not None and canvas_area:
+                area = frame.layout.width * frame.layout.height * transform_area_scale(frame.transform)
+                stats['overdraw'] += area / canvas_area
+            if sprite.matteKey:
+                stats['mattes'] += 1
+            if frame.clipPath:
+                stats['clip_paths'] += 1
+            stats['shapes'] += len(shapes)
+    return frames
+
+
+def analyze(path):
+    """
+    分析单个文件
+
+    参数:
+        path: SVGA 文件路径
+
+    返回:
+        dict: 文件级统计（含 'frame_stats' 逐帧列表）
+    """
+    with open(path, 'rb') as f:
+        fmt = detect_format(f.read(4))
+    if fmt == 2:
+        movie = LazyMovie.open(path)
+        audio_keys = {audio.audioKey for audio in movie.audios}
+        images = {key: data for key, data in movie.images.items() if key not in audio_keys}
+    else:
+        movie = load(path)
+        images = movie.bitmaps
+
+    params = movie.params
+    width = params.viewBoxWidth if params else 0
+    height = params.viewBoxHeight if params else 0
+    canvas_area = width * height
+    frame_count = params.frames if params else 0
+    if not frame_count:
+        frame_count = max((len(sprite.frames) for sprite in movie.sprites), default=0)
+
+    image_pixels = 0
+    for data in images.values():
+        size = get_png_size(data)
+        if size:
+            image_pixels += size[0] * size[1]
+
+    frame_stats = analyze_frames(movie.sprites, frame_count, canvas_area)
+    has_matte = any(sprite.matteKey for sprite in movie.sprites)
+    # 显存：解码后的纹理 + 主画布 + 遮罩离屏画布
+    canvas_layers = 2 if has_matte else 1
+    gpu_bytes = (image_pixels + canvas_area * canvas_layers) * BYTES_PER_PIXEL
+
+    def peak(name):
+        return max((stats[name] for stats in frame_stats), default=0)
+
+    return {
+        'file': path,
+        'width': width,
+        'height': height,
+        'frames': frame_count,
+        'images': len(images),
+        'image_pixels': image_pixels,
+        'gpu_mb': gpu_bytes / (1024 * 1024),
+        'max_sprites': peak('sprites'),
+        'max_overdraw': peak('overdraw'),
+        'avg_overdraw': sum(stats['overdraw'] for stats in frame_stats) / len(frame_stats) if frame_stats else 0.0,
+        'max_mattes': peak('mattes'),
+        'max_clip_paths': peak('clip_paths'),
+        'max_shapes': peak('shapes'),
+        'frame_stats': frame_stats
+    }
+
+
+def check_budgets(report, budgets):
+    """
+    检查是否超出预算
+
+    参数:
+        report: analyze() 的返回值
+        budgets: 预算 dict（键同 DEFAULT_BUDGETS，值为 None 表示不检查）
+
+    返回:
+        list: 超出预算的说明
+    """
+    checks = [
+        ('max_sprites', report['max_sprites'], '同帧可见图层'),
+        ('max_overdraw', report['max_overdraw'], '过度绘制'),
+        ('max_mattes', report['max_mattes'], '同帧遮罩'),
+        ('max_clip_paths', report['max_clip_paths'], '同帧 clipPath'),
+        ('max_shapes', report['max_shapes'], '同帧矢量元素'),
+        ('max_image_pixels', report['image_pixels'], '图片像素'),
+        ('max_gpu_mb', report['gpu_mb'], '估算显存 MB')
+    ]
+    violations = []
+    for name, value, label in checks:
+        limit = budgets.get(name)
+        if limit is not None and value > limit:
+            violations.append(f'{label} {value:g} > {limit:g}')
+    return violations
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m svga_tools analyze', description='SVGA 渲染开销分析与预算检查')
+    parser.add_argument('files', nargs='+', help='SVGA 文件路径')
+    parser.add_argument('--json', action='store_true', help='输出 JSON')
+    parser.add_argument('--frames', action='store_true', help='输出逐帧统计')
+    parser.add_argument('--max-sprites', type=int, default=DEFAULT_BUDGETS['max_sprites'], help='同帧可见图层上限')
+    parser.add_argument('--max-overdraw', type=float, default=DEFAULT_BUDGETS['max_overdraw'], help='过度绘制倍数上限')
+    parser.add_argument('--max-mattes', type=int, default=DEFAULT_BUDGETS['max_mattes'], help='同帧遮罩上限')
+    parser.add_argument('--max-clip-paths', type=int, default=DEFAULT_BUDGETS['max_clip_paths'], help='同帧 clipPath 上限')
+    parser.add_argument('--max-shapes', type=int, default=DEFAULT_BUDGETS['max_shapes'], help='同帧矢量元素上限')
+    parser.add_argument('--max-image-pixels', type=int, default=DEFAULT_BUDGETS['max_image_pixels'], help='图片像素总数上限')
+    parser.add_argument('--max-gpu-mb', type=float, default=DEFAULT_BUDGETS['max_gpu_mb'], help='估算显存上限（MB）')
+    args = parser.parse_args(argv)
+
+    budgets = {name: getattr(args, name) for name in DEFAULT_BUDGETS}
+    results = []
+    failed = 0
+    for path in args.files:
+        try:
+            report = analyze(path)
+        except (OSError, SVGAError) as e:
+            failed += 1
+            results.append({'file': path, 'error': str(e)})
+            continue
+        report['violations'] = check_budgets(report, budgets)
+        if report['violations']:
+            failed += 1
+        if not args.frames:
+            del report['frame_stats']
+        results.append(report)
+
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    else:
+        for report in results:
+            if 'error' in report:
+                print(f"{report['file']}: 错误 - {report['error']}")
+                continue
+            status = '超出预算: ' + '；'.join(report['violations']) if report['violations'] else '通过'
+            print(
+                f"{report['file']}: {report['width']:g}x{report['height']:g} × {report['frames']} 帧，"
+                f"图层峰值 {report['max_sprites']}，过度绘制 峰值 {report['max_overdraw']:.2f} / 平均 {report['avg_overdraw']:.2f}，"
+                f"遮罩 {report['max_mattes']}，clipPath {report['max_clip_paths']}，矢量元素 {report['max_shapes']}，"
+                f"图片 {report['images']} 张 / {report['image_pixels'] / 1e6:.2f} MP，显存约 {report['gpu_mb']:.1f} MB — {status}"
+            )
+            for stats in report.get('frame_stats', []):
+                print(
+                    f"  #{stats['frame']}: 图层 {stats['sprites']}，过度绘制 {stats['overdraw']:.2f}，"
+                    f"遮罩 {stats['mattes']}，clipPath {stats['clip_paths']}，矢量元素 {stats['shapes']}"
+                )
+    return 1 if failed else 0
@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SVGA 文件编解码
+
+支持两种格式：
+- 2.x：zlib 压缩的 MovieEntity protobuf（与 svga-builder.js 的 decode/encode 相同）
+- 1.x：zip 包，movie.spec（JSON）或 movie.binary（protobuf）+ 以键名命名的 PNG/音频文件
+
+用法:
+    from svga_tools import load, dump
+    movie = load('test_files/test.svga')
+    print(movie.params.viewBoxWidth, len(movie.sprites))
+    dump(movie, 'out.svga')
+"""
+
+import io
+import json
+import zipfile
+import zlib
+
+from .model import (
+    MovieEntity, MovieParams, SpriteEntity, FrameEntity, AudioEntity,
+    Layout, Transform, ShapeEntity, ShapeArgs, RectArgs, EllipseArgs,
+    ShapeStyle, RGBAColor, ShapeType, LineCap, LineJoin
+)
+from .proto import ProtoError, decode_message, encode_message
+
+
+ZIP_MAGIC = b'PK\x03\x04'
+
+# 1.x 包内文件名
+SPEC_FILE = 'movie.spec'
+BINARY_FILE = 'movie.binary'
+
+# 1.x 中矢量类型、端点、连接样式的字符串表示
+SHAPE_TYPE_NAMES = {ShapeType.SHAPE: 'shape', ShapeType.RECT: 'rect', ShapeType.ELLIPSE: 'ellipse', ShapeType.KEEP: 'keep'}
+LINE_CAP_NAMES = {LineCap.BUTT: 'butt', LineCap.ROUND: 'round', LineCap.SQUARE: 'square'}
+LINE_JOIN_NAMES = {LineJoin.MITER: 'miter', LineJoin.ROUND: 'round', LineJoin.BEVEL: 'bevel'}
+
+
+class SVGAError(ValueError):
+    """SVGA 文件格式错误"""
+
+
+def detect_format(data):
+    """
+    判断 SVGA 数据格式
+
+    返回:
+        int: 1（zip 包）或 2（zlib + protobuf）
+    """
+    return 1 if bytes(data[:4]) == ZIP_MAGIC else 2
+
+
+def inflate(data):
+    """
+    解压 2.x 数据
+
+    参数:
+        data: SVGA 文件字节
+
+    返回:
+        bytes: MovieEntity protobuf 字节
+    """
+    try:
+        return zlib.decompress(data)
+    except zlib.error as e:
+        raise SVGAError(f'SVGA解压失败: {e}') from None
+
+
+def loads(data):
+    """
+    解析 SVGA 数据（自动识别 1.x / 2.x）
+
+    参数:
+        data: SVGA 文件字节
+
+    返回:
+        MovieEntity: 解析结果
+    """
+    if detect_format(data) == 1:
+        return decode_zip(data)
+    try:
+        return decode_message(MovieEntity, inflate(data))
+    except ProtoError as e:
+        raise SVGAError(f'SVGA解析失败: {e}') from None
+
+
+def load(path):
+    """
+    读取并解析 SVGA 文件
+
+    参数:
+        path: 文件路径
+
+    返回:
+        MovieEntity: 解析结果
+    """
+    with open(path, 'rb') as f:
+        return loads(f.read())
+
+
+def dumps(movie, version=2, level=-1):
+    """
+    编码 SVGA 数据
+
+    参数:
+        movie: MovieEntity
+        version: 输出格式，2（默认，zlib + protobuf）或 1（zip 包）
+        level: zlib 压缩级别（-1 为默认级别，9 为最高）
+
+    返回:
+        bytes: SVGA 文件字节
+    """
+    if version == 1:
+        return encode_zip(movie)
+    return zlib.compress(bytes(encode_message(movie)), level)
+
+
+def dump(movie, path, version=2, level=-1):
+    """
+    编码并写入 SVGA 文件
+
+    参数:
+        movie: MovieEntity
+        path: 输出路径
+        version: 输出格式，2 或 1
+        level: zlib 压缩级别
+    """
+    data = dumps(movie, version, level)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+def find_zip_file(names, key, extensions):
+    """在 zip 文件名中查找键名对应的文件"""
+    for extension in extensions:
+        if key + extension in names:
+            return key + extension
+    return None
+
+
+def decode_zip(data):
+    """
+    解析 1.x zip 包
+
+    参数:
+        data: zip 字节
+
+    返回:
+        MovieEntity: 解析结果
+    """
+    try:
+        archive = zipfile.ZipFile(io.BytesIO(data))
+    except zipfile.BadZipFile as e:
+        raise SVGAError(f'SVGA解析失败: {e}') from None
+
+    with archive:
+        names = set(archive.namelist())
+        if BINARY_FILE in names:
+            try:
+                movie = decode_message(MovieEntity, archive.read(BINARY_FILE))
+            except ProtoError as e:
+                raise SVGAError(f'SVGA解析失败: {e}') from None
+            movie.version = movie.version or '1.5'
+            references = {key: value.decode('utf-8', 'replace') for key, value in movie.images.items()}
+        elif SPEC_FILE in names:
+            spec = json.loads(archive.read(SPEC_FILE).decode('utf-8'))
+            movie = movie_from_spec(spec)
+            references = spec.get('images') or {}
+        else:
+            raise SVGAError('SVGA解析失败: 缺少 movie.spec / movie.binary')
+
+        # 图片以文件名引用包内文件
+        images = {}
+        for key, reference in references.items():
+            name = find_zip_file(names, reference, ('.png', '', '.mp3'))
+            if name is None:
+                name = find_zip_file(names, key, ('.png', '.mp3'))
+            if name is not None:
+                images[key] = archive.read(name)
+        for audio in movie.audios:
+            name = find_zip_file(names, audio.audioKey, ('.mp3', ''))
+            if audio.audioKey not in images and name is not None:
+                images[audio.audioKey] = archive.read(name)
+        movie.images = images
+    return movie
+
+
+def movie_from_spec(spec):
+    """
+    将 1.x movie.spec JSON 转换为 MovieEntity
+
+    参数:
+        spec: movie.spec 解析后的字典
+
+    返回:
+        MovieEntity: 不含图片数据的动画
+    """
+    info = spec.get('movie') or {}
+    view_box = info.get('viewBox') or {}
+    return MovieEntity(
+        version=str(spec.get('ver') or '1.0'),
+        params=MovieParams(
+            viewBoxWidth=float(view_box.get('width') or 0),
+            viewBoxHeight=float(view_box.get('height') or 0),
+            fps=int(info.get('fps') or 0),
+            frames=int(info.get('frames') or 0)
+        ),
+        sprites=[
+            SpriteEntity(
+                imageKey=sprite.get('imageKey') or '',
+                matteKey=sprite.get('matteKey') or '',
+                frames=[frame_from_spec(frame) for frame in sprite.get('frames') or []]
+            )
+            for sprite in spec.get('sprites') or []
+        ],
+        audios=[
+            AudioEntity(
+                audioKey=audio.get('audioKey') or '',
+                startFrame=int(audio.get('startFrame') or 0),
+                endFrame=int(audio.get('endFrame') or 0),
+                startTime=int(audio.get('startTime') or 0),
+                totalTime=int(audio.get('totalTime') or 0)
+            )
+            for audio in spec.get('audios') or []
+        ]
+    )
+
+
+def numbers_from_spec(cls, values):
+    """按字段名读取数值字段，缺失的字段为 0"""
+    if not values:
+        return None
+    return cls(**{name: float(values.get(name) or 0) for _, name, _, _ in cls._PROTO})
+
+
+def color_from_spec(values):
+    """1.x 颜色为 [r, g, b, a] 数组"""
+    if not values:
+        return None
+    return RGBAColor(*[float(value) for value in list(values)[:4]])
+
+
+def frame_from_spec(frame):
+    """转换 1.x 单帧数据"""
+    return FrameEntity(
+        alpha=float(frame.get('alpha') or 0),
+        layout=numbers_from_spec(Layout, frame.get('layout')),
+        transform=numbers_from_spec(Transform, frame.get('transform')),
+        clipPath=frame.get('clipPath') or '',
+        shapes=[shape_from_spec(shape) for shape in frame.get('shapes') or []]
+    )
+
+
+def shape_from_spec(shape):
+    """转换 1.x 矢量元素"""
+    type_names = {name: value for value, name in SHAPE_TYPE_NAMES.items()}
+    shape_type = type_names.get(shape.get('type'), ShapeType.SHAPE)
+    args = shape.get('args') or {}
+    entity = ShapeEntity(type=shape_type, transform=numbers_from_spec(Transform, shape.get('transform')))
+    if shape_type == ShapeType.SHAPE and args:
+        entity.shape = ShapeArgs(d=args.get('d') or '')
+    elif shape_type == ShapeType.RECT:
+        entity.rect = numbers_from_spec(RectArgs, args) or RectArgs()
+    elif shape_type == ShapeType.ELLIPSE:
+        entity.ellipse = numbers_from_spec(EllipseArgs, args) or EllipseArgs()
+
+    styles = shape.get('styles')
+    if styles:
+        line_dash = list(styles.get('lineDash') or []) + [0, 0, 0]
+        cap_names = {name: value for value, name in LINE_CAP_NAMES.items()}
+        join_names = {name: value for value, name in LINE_JOIN_NAMES.items()}
+        entity.styles = ShapeStyle(
+            fill=color_from_spec(styles.get('fill')),
+            stroke=color_from_spec(styles.get('stroke')),
+            strokeWidth=float(styles.get('strokeWidth') or 0),
+            lineCap=cap_names.get(styles.get('lineCap'), LineCap.BUTT),
+            lineJoin=join_names.get(styles.get('lineJoin'), LineJoin.MITER),
+            miterLimit=float(styles.get('miterLimit') or 0),
+            lineDashI=float(line_dash[0]),
+            lineDashII=float(line_dash[1]),
+            lineDashIII=float(line_dash[2])
+        )
+    return entity
+
+
+def numbers_to_spec(obj):
+    """数值子消息转字典"""
+    if obj is None:
+        return None
+    return {name: getattr(obj, name) for _, name, _, _ in obj._PROTO}
+
+
+def shape_to_spec(shape):
+    """转换矢量元素为 1.x 格式"""
+    result = {'type': SHAPE_TYPE_NAMES.get(shape.type, 'shape')}
+    if shape.shape is not None:
+        result['args'] = {'d': shape.shape.d}
+    elif shape.rect is not None:
+        result['args'] = numbers_to_spec(shape.rect)
+    elif shape.ellipse is not None:
+        result['args'] = numbers_to_spec(shape.ellipse)
+    if shape.transform is not None:
+        result['transform'] = numbers_to_spec(shape.transform)
+    styles = shape.styles
+    if styles is not None:
+        result['styles'] = {
+            'fill': [styles.fill.r, styles.fill.g, styles.fill.b, styles.fill.a] if styles.fill else None,
+            'stroke': [styles.stroke.r, styles.stroke.g, styles.stroke.b, styles.stroke.a] if styles.stroke else None,
+            'strokeWidth': styles.strokeWidth,
+            'lineCap': LINE_CAP_NAMES.get(styles.lineCap, 'butt'),
+            'lineJoin': LINE_JOIN_NAMES.get(styles.lineJoin, 'miter'),
+            'miterLimit': styles.miterLimit,
+            'lineDash': [styles.lineDashI, styles.lineDashII, styles.lineDashIII]
+        }
+    return result
+
+
+def frame_to_spec(frame):
+    """转换单帧数据为 1.x 格式"""
+    result = {'alpha': frame.alpha}
+    if frame.layout is not None:
+        result['layout'] = numbers_to_spec(frame.layout)
+    if frame.transform is not None:
+        result['transform'] = numbers_to_spec(frame.transform)
+    if frame.clipPath:
+        result['clipPath'] = frame.clipPath
+    if frame.shapes:
+        result['shapes'] = [shape_to_spec(shape) for shape in frame.shapes]
+    return result
+
+
+def encode_zip(movie):
+    """
+    编码为 1.x zip 包（movie.spec + 图片/音频文件）
+
+    参数:
+        movie: MovieEntity
+
+    返回:
+        bytes: zip 字节
+    """
+    params = movie.params or MovieParams()
+    audio_keys = movie.audio_keys
+    spec = {
+        'ver': '1.1.0',
+        'movie': {
+            'viewBox': {'width': params.viewBoxWidth, 'height': params.viewBoxHeight},
+            'fps': params.fps,
+            'frames': params.frames
+        },
+        'images': {key: key for key in movie.images if key not in audio_keys},
+        'sprites': [
+            {
+                'imageKey': sprite.imageKey,
+                **({'matteKey': sprite.matteKey} if sprite.matteKey else {}),
+                'frames': [frame_to_spec(frame) for frame in sprite.frames]
+            }
+            for sprite in movie.sprites
+        ]
+    }
+    if movie.audios:
+        spec['audios'] = [
+            {name: getattr(audio, name) for _, name, _, _ in audio._PROTO}
+            for audio in movie.audios
+        ]
+
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr(SPEC_FILE, json.dumps(spec, ensure_ascii=False, separators=(',', ':')))
+        for key, data in movie.images.items():
+            # PNG/MP3 已是压缩格式，直接存储
+            name = key + ('.mp3' if key in audio_keys else '.png')
+            archive.writestr(name, data, compress_type=zipfile.ZIP_STORED)
+    return output.getvalue()
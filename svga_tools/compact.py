@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SVGA 帧数据压缩
+
+svga-builder.js 的 _encodeSVGA 为每个图层的每一帧写出完整的 FrameEntity，长动画中帧数据占大部分解码时间。
+此命令在不改变播放效果的前提下精简帧数据：
+- 矢量图层中与前一帧完全相同的 shapes 替换为单个 ShapeType.KEEP
+- 单位矩阵 transform（帧和矢量元素）省略，播放器缺省即为单位矩阵
+- 不可见帧（alpha 为 0）只保留空消息，丢弃 layout/transform/clipPath/shapes
+- 编码时省略 proto3 缺省值
+
+注意：alpha=1 不能省略，svga.min.js 把缺省的 alpha 读作 0（不可见）。
+
+用法:
+    python -m svga_tools compact docs/assets/svga/*.svga --dry-run
+    python -m svga_tools compact test_files/test.svga -o compacted/
+"""
+
+import argparse
+import os
+import time
+import zlib
+
+from .codec import SVGAError, detect_format, dumps, loads
+from .model import FrameEntity, ShapeEntity, ShapeType
+from .proto import encode_message
+
+
+def expand_keep_shapes(sprite):
+    """
+    展开 KEEP：将引用前帧的 shapes 替换为前帧实际的 shapes（与 svga.min.js 的 lastShapes 逻辑一致）
+
+    参数:
+        sprite: SpriteEntity（原地修改）
+
+    返回:
+        int: 展开的 KEEP 帧数
+    """
+    expanded = 0
+    last_shapes = []
+    for frame in sprite.frames:
+        if frame.shapes and frame.shapes[0].type == ShapeType.KEEP:
+            frame.shapes = list(last_shapes)
+            expanded += 1
+        else:
+            last_shapes = frame.shapes
+    return expanded
+
+
+def compact_sprite(sprite, stats):
+    """
+    精简单个图层的帧数据
+
+    参数:
+        sprite: SpriteEntity（原地修改）
+        stats: 统计信息 dict（累加）
+    """
+    # 统计新增的 KEEP 帧：先减去原有的，重新生成后再加回
+    stats['keep_frames'] -= expand_keep_shapes(sprite)
+
+    for index, frame in enumerate(sprite.frames):
+        if not frame.is_visible():
+            if frame.layout is not None or frame.transform is not None or frame.clipPath or frame.shapes or frame.alpha:
+                stats['invisible_frames'] += 1
+            sprite.frames[index] = FrameEntity()
+            continue
+        if frame.transform is not None and frame.transform.is_identity():
+            frame.transform = None
+            stats['identity_transforms'] += 1
+        for shape in frame.shapes:
+            if shape.transform is not None and shape.transform.is_identity():
+                shape.transform = None
+                stats['identity_transforms'] += 1
+
+    # 第一帧不能使用 KEEP（播放器的 lastShapes 可能来自上一个图层）
+    previous = None
+    for frame in sprite.frames:
+        current = frame.shapes
+        if current and previous is not None and current == previous:
+            frame.shapes = [ShapeEntity(type=ShapeType.KEEP)]
+            stats['keep_frames'] += 1
+        previous = current
+
+
+def compact_movie(movie):
+    """
+    精简所有图层的帧数据
+
+    参数:
+        movie: MovieEntity（原地修改）
+
+    返回:
+        dict: 统计信息
+    """
+    stats = {'keep_frames': 0, 'identity_transforms': 0, 'invisible_frames': 0}
+    for sprite in movie.sprites:
+        compact_sprite(sprite, stats)
+    return stats
+
+
+def measure_decode(data):
+    """测量解码耗时（毫秒）"""
+    start = time.perf_counter()
+    loads(data)
+    return (time.perf_counter() - start) * 1000
+
+
+def compact_bytes(data, level=9):
+    """
+    精简 SVGA 数据
+
+    参数:
+        data: SVGA 文件字节
+        level: 输出的 zlib 压缩级别
+
+    返回:
+        tuple: (精简后的字节, 统计信息 dict)
+    """
+    fmt = detect_format(data)
+    movie = loads(data)
+    before_proto = len(encode_message(movie)) if fmt == 1 else len(zlib.decompress(data))
+    stats = compact_movie(movie)
+    after_proto = len(encode_message(movie))
+    output = dumps(movie, version=fmt, level=level)
+    stats.update({'proto_before': before_proto, 'proto_after': after_proto})
+    return output, stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m svga_tools compact', description='精简 SVGA 帧数据（KEEP、省略单位矩阵、清空不可见帧）')
+    parser.add_argument('files', nargs='+', help='SVGA 文件路径')
+    output = parser.add_mutually_exclusive_group(required=True)
+    output.add_argument('-o', '--output', help='输出目录')
+    output.add_argument('--in-place', action='store_true', help='直接覆盖原文件（只在体积变小时写入）')
+    output.add_argument('--dry-run', action='store_true', help='只输出报告，不写文件')
+    parser.add_argument('--level', type=int, default=9, choices=range(0, 10), help='输出的 zlib 压缩级别（默认: 9）')
+    args = parser.parse_args(argv)
+
+    if args.output:
+        os.makedirs(args.output, exist_ok=True)
+
+    total_before = total_after = 0
+    failed = 0
+    for path in args.files:
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            compacted, stats = compact_bytes(data, args.level)
+        except (OSError, SVGAError) as e:
+            failed += 1
+            print(f'{path}: 错误 - {e}')
+            continue
+
+        # 没有收益时保留原文件内容
+        if len(compacted) >= len(data):
+            compacted = data
+        if not args.dry_run and (compacted is not data or not args.in_place):
+            target = path if args.in_place else os.path.join(args.output, os.path.basename(path))
+            with open(target, 'wb') as f:
+                f.write(compacted)
+
+        total_before += len(data)
+        total_after += len(compacted)
+        print(
+            f'{path}: 文件 {len(data) / 1024:.1f} KB -> {len(compacted) / 1024:.1f} KB，'
+            f'帧数据 {stats["proto_before"] / 1024:.1f} KB -> {stats["proto_after"] / 1024:.1f} KB，'
+            f'解码 {measure_decode(data):.1f}ms -> {measure_decode(compacted):.1f}ms；'
+            f'KEEP {stats["keep_frames"]} 帧，省略单位矩阵 {stats["identity_transforms"]} 个，清空不可见帧 {stats["invisible_frames"]} 个'
+        )
+
+    if total_before:
+        print(f'\n合计: {total_before / 1024:.1f} KB -> {total_after / 1024:.1f} KB（-{(1 - total_after / total_before) * 100:.1f}%）')
+    return 1 if failed else 0
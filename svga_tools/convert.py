@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SVGA 批量转换：GIF / WebP / 序列帧 ZIP
+
+与浏览器端 gif-exporter.js、webp-exporter.js、frames-exporter.js 的参数和输出一致，
+但在服务端用 svga_tools.render 渲染，按文件分配到多个进程并行转换。依赖 numpy 与 Pillow。
+
+- GIF：--quality 1-30（数值越大质量越好，默认 10），--transparent 透明背景，
+  透明模式下 --dither 颜色 将半透明像素与该颜色混合，否则按 --alpha-threshold 二值化；
+  不透明模式填充 --background 背景色
+- WebP：动画 WebP，保留透明通道，--webp-quality 100 为无损（默认，与 webpxmux 一致）
+- 序列帧：frames/frame_0000.png 打包为 <文件名>_frames.zip
+
+用法:
+    python -m svga_tools convert docs/assets/svga -o exports/ --format gif,webp
+    python -m svga_tools convert gifts/ -o exports/ --format gif --transparent --dither '#000000' --fps 20 --scale 0.5
+    python -m svga_tools convert test_files/test.svga -o exports/ --format frames --jobs 4
+"""
+
+import argparse
+import io
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from PIL import Image
+
+from .codec import SVGAError, load
+from .render import Renderer
+
+
+FORMATS = ('gif', 'webp', 'frames')
+
+# 与 gif-exporter.js 一致
+DEFAULT_GIF_QUALITY = 10
+DEFAULT_ALPHA_THRESHOLD = 128
+DEFAULT_BACKGROUND = '#ffffff'
+
+GIF_COLORS = 256
+TRANSPARENT_INDEX = GIF_COLORS - 1
+
+
+def parse_color(value):
+    """'#rrggbb' -> (r, g, b)"""
+    value = value.lstrip('#')
+    if len(value) != 6:
+        raise ValueError(f'颜色格式应为 #rrggbb: {value}')
+    return tuple(int(value[i:i + 2], 16) for i in (0, 2, 4))
+
+
+def find_svga_files(paths):
+    """
+    展开输入路径（目录递归查找 .svga）
+
+    返回:
+        list: (文件路径, 相对输出路径不含扩展名)
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, names in os.walk(path):
+                dirs.sort()
+                for name in sorted(names):
+                    if name.lower().endswith('.svga'):
+                        full = os.path.join(root, name)
+                        files.append((full, os.path.splitext(os.path.relpath(full, path))[0]))
+        else:
+            files.append((path, os.path.splitext(os.path.basename(path))[0]))
+    return files
+
+
+def frame_indices(source_frames, source_fps, fps):
+    """
+    按目标帧率重新取样帧序号（时长不变）
+
+    参数:
+        source_frames: 原始帧数
+        source_fps: 原始帧率
+        fps: 目标帧率
+
+    返回:
+        list: 原始帧序号
+    """
+    if not fps or not source_fps or fps == source_fps:
+        return list(range(source_frames))
+    count = max(1, -(-source_frames * fps // source_fps))
+    return [min(source_frames - 1, int(i * source_fps / fps)) for i in range(count)]
+
+
+def flatten(rgba, background):
+    """半透明帧与背景色混合为不透明 RGB"""
+    alpha = rgba[..., 3:4].astype(np.float32) / 255.0
+    rgb = rgba[..., :3] * alpha + np.asarray(background, dtype=np.float32) * (1 - alpha)
+    return (rgb + 0.5).astype(np.uint8)
+
+
+def process_alpha(rgba, dither_color, threshold):
+    """
+    GIF 透明模式的半透明像素处理（与 gif-exporter.js 的 _processDither / _processAlphaThreshold 一致）
+
+    参数:
+        rgba: uint8 RGBA 帧
+        dither_color: 杂色边颜色 (r, g, b)，None 时按阈值二值化
+        threshold: alpha 阈值
+
+    返回:
+        numpy.ndarray: 处理后的 RGBA（alpha 只有 0 和 255）
+    """
+    rgba = rgba.copy()
+    alpha = rgba[..., 3]
+    partial = (alpha > 0) & (alpha < 255)
+    if dither_color is not None:
+        rgba[partial, :3] = flatten(rgba[partial][:, None], dither_color)[:, 0]
+        rgba[partial, 3] = 255
+    else:
+        rgba[..., 3] = np.where(alpha < threshold, 0, 255).astype(np.uint8)
+    return rgba
+
+
+def quantize(rgb, colors, quality):
+    """
+    RGB 帧量化为调色板图像
+
+    gif.js 的 quality 控制 NeuQuant 的采样间隔，Pillow 没有对应参数：颜色数固定，
+    quality 高于默认值时增加 k-means 迭代次数（越大越接近原图，编码越慢）。
+    """
+    quality = max(1, min(30, quality))
+    kmeans = max(0, quality - DEFAULT_GIF_QUALITY) // 5
+    return Image.fromarray(np.ascontiguousarray(rgb), 'RGB').quantize(colors, method=Image.Quantize.MEDIANCUT, kmeans=kmeans)
+
+
+def to_gif_frame(rgba, options):
+    """RGBA 帧 -> GIF 调色板帧（透明模式最后一个颜色为透明色）"""
+    if not options['transparent']:
+        return quantize(flatten(rgba, options['background']), GIF_COLORS, options['quality'])
+    rgba = process_alpha(rgba, options['dither'], options['alpha_threshold'])
+    paletted = quantize(rgba[..., :3], GIF_COLORS - 1, options['quality'])
+    indices = np.asarray(paletted).copy()
+    indices[rgba[..., 3] == 0] = TRANSPARENT_INDEX
+    frame = Image.fromarray(indices, 'P')
+    palette = paletted.getpalette()[:TRANSPARENT_INDEX * 3]
+    frame.putpalette(palette + [0] * (TRANSPARENT_INDEX * 3 - len(palette)) + [0, 0, 0])
+    frame.info['transparency'] = TRANSPARENT_INDEX
+    return frame
+
+
+def encode_gif(frames, duration, options):
+    images = [to_gif_frame(rgba, options) for rgba in frames]
+    output = io.BytesIO()
+    extra = {'transparency': TRANSPARENT_INDEX, 'disposal': 2} if options['transparent'] else {}
+    images[0].save(output, 'GIF', save_all=True, append_images=images[1:], duration=duration, loop=0, optimize=False, **extra)
+    return output.getvalue()
+
+
+def encode_webp(frames, duration, options):
+    images = [Image.fromarray(rgba, 'RGBA') for rgba in frames]
+    output = io.BytesIO()
+    lossless = options['webp_quality'] >= 100
+    images[0].save(
+        output, 'WEBP', save_all=True, append_images=images[1:], duration=duration, loop=0,
+        lossless=lossless, quality=100 if lossless else options['webp_quality'], background=(0, 0, 0, 0)
+    )
+    return output.getvalue()
+
+
+def encode_frames_zip(frames):
+    """序列帧 ZIP（与 frames-exporter.js 相同的目录结构和文件名）"""
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, 'w', zipfile.ZIP_STORED) as archive:
+        for index, rgba in enumerate(frames):
+            png = io.BytesIO()
+            Image.fromarray(rgba, 'RGBA').save(png, 'PNG')
+            archive.writestr(f'frames/frame_{index:04d}.png', png.getvalue())
+    return output.getvalue()
+
+
+def convert_file(path, target_stem, formats, options):
+    """
+    渲染并编码单个文件（在进程池中执行）
+
+    返回:
+        tuple: (源文件, [(输出路径, 字节数)], 错误信息或 None)
+    """
+    try:
+        movie = load(path)
+        renderer = Renderer(movie, options['scale'])
+        source_fps = movie.params.fps if movie.params else 0
+        indices = frame_indices(renderer.frame_count, source_fps, options['fps'])
+        if not indices:
+            raise SVGAError('没有可渲染的帧')
+        fps = options['fps'] or source_fps or 30
+        duration = round(1000 / fps)
+
+        # 重新取样后相邻帧可能相同，只渲染一次
+        rendered = {}
+        frames = []
+        for index in indices:
+            if index not in rendered:
+                rendered[index] = renderer.render(index)
+            frames.append(rendered[index])
+
+        outputs = []
+        for fmt in formats:
+            if fmt == 'gif':
+                data, target = encode_gif(frames, duration, options), f'{target_stem}.gif'
+            elif fmt == 'webp':
+                data, target = encode_webp(frames, duration, options), f'{target_stem}.webp'
+            else:
+                data, target = encode_frames_zip(frames), f'{target_stem}_frames.zip'
+            os.makedirs(os.path.dirname(target) or '.', exist_ok=True)
+            with open(target, 'wb') as f:
+                f.write(data)
+            outputs.append((target, len(data)))
+        return path, outputs, None
+    except (OSError, ValueError) as e:
+        return path, [], str(e)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m svga_tools convert', description='SVGA 批量转换为 GIF / WebP / 序列帧 ZIP')
+    parser.add_argument('inputs', nargs='+', help='SVGA 文件或目录（目录递归查找）')
+    parser.add_argument('-o', '--output', required=True, help='输出目录（保留输入目录的相对结构）')
+    parser.add_argument('--format', default='gif', help=f'输出格式，逗号分隔：{",".join(FORMATS)}（默认: gif）')
+    parser.add_argument('--fps', type=int, default=0, help='输出帧率（默认: 与 SVGA 相同）')
+    parser.add_argument('--scale', type=float, default=1.0, help='缩放比例（默认: 1.0）')
+    parser.add_argument('--quality', type=int, default=DEFAULT_GIF_QUALITY, help=f'GIF 质量 1-30，越大越好（默认: {DEFAULT_GIF_QUALITY}）')
+    parser.add_argument('--transparent', action='store_true', help='GIF 透明背景')
+    parser.add_argument('--background', default=DEFAULT_BACKGROUND, help=f'GIF 不透明模式的背景色（默认: {DEFAULT_BACKGROUND}）')
+    parser.add_argument('--dither', default=None, help='GIF 透明模式的杂色边颜色，如 #000000（不指定时按阈值二值化）')
+    parser.add_argument('--alpha-threshold', type=int, default=DEFAULT_ALPHA_THRESHOLD, help=f'GIF 透明模式的 alpha 阈值（默认: {DEFAULT_ALPHA_THRESHOLD}）')
+    parser.add_argument('--webp-quality', type=int, default=100, help='WebP 质量 0-100，100 为无损（默认: 100）')
+    parser.add_argument('--jobs', type=int, default=None, help='并行进程数（默认: CPU 数）')
+    args = parser.parse_args(argv)
+
+    formats = [fmt.strip() for fmt in args.format.split(',') if fmt.strip()]
+    unknown = [fmt for fmt in formats if fmt not in FORMATS]
+    if unknown or not formats:
+        parser.error(f'不支持的格式: {",".join(unknown)}（可选: {",".join(FORMATS)}）')
+    try:
+        options = {
+            'fps': args.fps,
+            'scale': args.scale,
+            'quality': args.quality,
+            'transparent': args.transparent,
+            'background': parse_color(args.background),
+            'dither': parse_color(args.dither) if args.dither else None,
+            'alpha_threshold': args.alpha_threshold,
+            'webp_quality': args.webp_quality
+        }
+    except ValueError as e:
+        parser.error(str(e))
+
+    files = find_svga_files(args.inputs)
+    if not files:
+        print('未找到 SVGA 文件')
+        return 1
+    print(f'=== SVGA 批量转换：{len(files)} 个文件 -> {",".join(formats)} ===')
+
+    failed = 0
+    jobs = args.jobs or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=min(jobs, len(files))) as executor:
+        futures = [
+            executor.submit(convert_file, path, os.path.join(args.output, stem), formats, options)
+            for path, stem in files
+        ]
+        for future in futures:
+            path, outputs, error = future.result()
+            if error:
+                failed += 1
+                print(f'{path}: 错误 - {error}')
+                continue
+            print(f'{path}: ' + '，'.join(f'{target}（{size / 1024:.1f} KB）' for target, size in outputs))
+
+    print(f'\n完成: {len(files) - failed}/{len(files)}')
+    return 1 if failed else 0
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+双通道 MP4 合成（服务端）
+
+对应浏览器端 dual-channel-composer.js / dual-channel-worker.js + ffmpeg.wasm：
+每帧左右拼接彩色与 Alpha 灰度两半（彩色为与黑底混合后的颜色，与 worker 输出的 blackBgData 一致），
+编码为 H.264 MP4。
+
+- 输入：SVGA 文件（svga_tools.render 渲染）、PNG 序列目录，或 frames-exporter.js 导出的序列帧 ZIP
+- 合成：NumPy 整帧向量化，输出缓冲区逐帧复用（对应 worker 的 MemoryPool）
+- 编码：原始 rgb24 帧通过管道写入本地 ffmpeg 的 stdin，不落临时文件；
+  编码参数与 ffmpeg-service.js 的 MP4 导出相同（libx264 / yuv420p / CRF 由质量换算）
+- SVGA 渲染可用进程池并行（--jobs），PNG 序列用线程池解码
+
+不包含音频轨道（SVGA 内的音频需单独处理）。
+
+用法:
+    python -m svga_tools dual-channel test_files/test.svga -o videos/
+    python -m svga_tools dual-channel frames_dir/ exported_frames.zip -o videos/ --mode alpha-left-color-right --width 375 --fps 25
+"""
+
+import argparse
+import io
+import math
+import os
+import shutil
+import subprocess
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from PIL import Image
+
+from .codec import SVGAError, loads
+from .convert import frame_indices
+from .render import movie_frame_count, render_frames
+
+
+COLOR_LEFT_ALPHA_RIGHT = 'color-left-alpha-right'
+ALPHA_LEFT_COLOR_RIGHT = 'alpha-left-color-right'
+MODES = (COLOR_LEFT_ALPHA_RIGHT, ALPHA_LEFT_COLOR_RIGHT)
+
+# 与 dual-channel-panel.js 的默认值和取值范围一致
+DEFAULT_FPS = 30
+DEFAULT_QUALITY = 80
+MAX_SIZE = 3000
+
+
+def quality_to_crf(quality):
+    """质量 1-100 换算为 CRF（与 ffmpeg-service.js 相同：100 -> 18，0 -> 51）"""
+    # 按 Math.round 的 .5 向上取整（Python 的 round 为银行家舍入，质量 50 会得到 34 而不是 35）
+    return math.floor(51 - (quality / 100) * 33 + 0.5)
+
+
+def compose_dual(rgba, mode=COLOR_LEFT_ALPHA_RIGHT, out=None):
+    """
+    合成双通道帧
+
+    参数:
+        rgba: uint8 非预乘 RGBA (高, 宽, 4)
+        mode: 通道位置
+        out: 可复用的输出缓冲区 uint8 (高, 宽 * 2, 3)
+
+    返回:
+        numpy.ndarray: uint8 RGB (高, 宽 * 2, 3)
+    """
+    height, width = rgba.shape[:2]
+    if out is None:
+        out = np.empty((height, width * 2, 3), dtype=np.uint8)
+    if mode == COLOR_LEFT_ALPHA_RIGHT:
+        color, gray = out[:, :width], out[:, width:]
+    else:
+        gray, color = out[:, :width], out[:, width:]
+
+    alpha = rgba[..., 3:4]
+    # 与黑底混合：round(c * a / 255)，整数运算（c * a 为奇数倍 255 的一半不会出现，+127 即四舍五入）
+    mixed = rgba[..., :3].astype(np.uint16)
+    mixed *= alpha
+    mixed += 127
+    mixed //= 255
+    color[...] = mixed
+    gray[...] = alpha
+    return out
+
+
+def even(value):
+    """yuv420p 要求宽高为偶数"""
+    return max(2, int(value) // 2 * 2)
+
+
+def target_size(width, height, target_width=None, target_height=None, scale=None):
+    """
+    计算输出单半边尺寸（只给宽或高时按比例联动，与面板一致；上限 3000）
+
+    返回:
+        tuple: (宽, 高)
+    """
+    if target_width and target_height:
+        size = (target_width, target_height)
+    elif target_width:
+        size = (target_width, target_width * height / width)
+    elif target_height:
+        size = (target_height * width / height, target_height)
+    else:
+        size = (width * (scale or 1.0), height * (scale or 1.0))
+    return tuple(even(min(MAX_SIZE, round(value))) for value in size)
+
+
+def svga_source(path, options):
+    """
+    SVGA 渲染帧源
+
+    返回:
+        tuple: (宽, 高, 帧率, 帧生成器)
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    movie = loads(data)
+    params = movie.params
+    if not params or not params.viewBoxWidth or not params.viewBoxHeight:
+        raise SVGAError('缺少画布尺寸')
+    width, height = target_size(params.viewBoxWidth, params.viewBoxHeight, options['width'], options['height'], options['scale'])
+    source_fps = params.fps or DEFAULT_FPS
+    fps = options['fps'] or min(60, max(1, source_fps))
+    indices = frame_indices(movie_frame_count(movie), source_fps, fps)
+    # 按宽度等比渲染，高度差（取偶数造成的 1 像素）由 fit 补齐
+    scale = width / params.viewBoxWidth
+    unique = sorted(set(indices))
+    rendered = render_frames(data, unique, scale, options['jobs'])
+
+    def frames():
+        cache = {}
+        for index in indices:
+            while index not in cache:
+                rendered_index, rgba = next(rendered)
+                cache = {rendered_index: rgba}
+            yield fit(cache[index], width, height)
+
+    return width, height, fps, frames()
+
+
+def list_png_sequence(path):
+    """
+    列出 PNG 序列（目录或序列帧 ZIP），按文件名排序
+
+    返回:
+        list: 读取函数列表，每个返回 PNG 字节
+    """
+    if zipfile.is_zipfile(path):
+        archive = zipfile.ZipFile(path)
+        names = sorted(name for name in archive.namelist() if name.lower().endswith('.png'))
+        return [lambda name=name: archive.read(name) for name in names]
+
+    def reader(full):
+        with open(full, 'rb') as f:
+            return f.read()
+    names = sorted(name for name in os.listdir(path) if name.lower().endswith('.png'))
+    return [lambda full=os.path.join(path, name): reader(full) for name in names]
+
+
+def decode_png(data, size):
+    """解码 PNG 并缩放到目标尺寸（Pillow 对 RGBA 缩放按预乘 alpha 处理，边缘无黑边）"""
+    with Image.open(io.BytesIO(data)) as image:
+        image = image.convert('RGBA')
+        if image.size != size:
+            image = image.resize(size, Image.Resampling.BILINEAR)
+        return np.asarray(image)
+
+
+def png_source(path, options):
+    """
+    PNG 序列帧源
+
+    返回:
+        tuple: (宽, 高, 帧率, 帧生成器)
+    """
+    readers = list_png_sequence(path)
+    if not readers:
+        raise SVGAError('没有 PNG 帧')
+    with Image.open(io.BytesIO(readers[0]())) as first:
+        width, height = target_size(*first.size, options['width'], options['height'], options['scale'])
+    fps = options['fps'] or DEFAULT_FPS
+
+    def frames():
+        with ThreadPoolExecutor(max_workers=options['jobs'] or os.cpu_count()) as executor:
+            yield from executor.map(lambda read: decode_png(read(), (width, height)), readers)
+
+    return width, height, fps, frames()
+
+
+def fit(rgba, width, height):
+    """裁剪或补透明边到指定尺寸"""
+    if rgba.shape[0] == height and rgba.shape[1] == width:
+        return rgba
+    out = np.zeros((height, width, 4), dtype=np.uint8)
+    h, w = min(height, rgba.shape[0]), min(width, rgba.shape[1])
+    out[:h, :w] = rgba[:h, :w]
+    return out
+
+
+def has_ffmpeg(executable='ffmpeg'):
+    """是否安装了 ffmpeg 命令行"""
+    return shutil.which(executable) is not None
+
+
+def encode_rgb24(frames, width, height, fps, output, quality=DEFAULT_QUALITY, ffmpeg='ffmpeg', audio=None):
+    """
+    原始 rgb24 帧通过管道交给 ffmpeg 编码 MP4
+
+    参数:
+        frames: uint8 RGB 帧迭代器（每帧 (高, 宽, 3)）
+        width, height: 帧尺寸
+        fps: 帧率
+        output: 输出 MP4 路径
+        quality: 质量 1-100
+        ffmpeg: ffmpeg 可执行文件
+        audio: 提供音频轨道的媒体文件（可选，音频原样复制）
+
+    返回:
+        int: 编码的帧数
+    """
+    command = [
+        ffmpeg, '-hide_banner', '-loglevel', 'error', '-y',
+        '-f', 'rawvideo', '-pix_fmt', 'rgb24', '-s', f'{width}x{height}', '-framerate', str(fps), '-i', 'pipe:0'
+    ]
+    if audio:
+        command += ['-i', audio, '-map', '0:v:0', '-map', '1:a:0?', '-c:a', 'copy', '-shortest']
+    command += [
+        '-c:v', 'libx264', '-preset', 'fast', '-tune', 'animation', '-profile:v', 'high', '-level', '4.0',
+        '-pix_fmt', 'yuv420p', '-crf', str(quality_to_crf(quality)), '-movflags', '+faststart', '-r', str(fps),
+        output
+    ]
+    process = subprocess.Popen(command, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
+    count = 0
+    try:
+        for rgb in frames:
+            process.stdin.write(rgb.data)
+            count += 1
+        process.stdin.close()
+    except BrokenPipeError:
+        pass
+    except BaseException:
+        process.kill()
+        process.wait()
+        raise
+    stderr = process.stderr.read().decode('utf-8', 'replace')
+    if process.wait() != 0:
+        raise SVGAError(f'ffmpeg 编码失败: {stderr.strip()}')
+    return count
+
+
+def encode_dual_channel(frames, width, height, fps, output, mode=COLOR_LEFT_ALPHA_RIGHT, quality=DEFAULT_QUALITY, ffmpeg='ffmpeg'):
+    """
+    合成双通道帧并通过管道交给 ffmpeg 编码
+
+    参数:
+        frames: uint8 RGBA 帧迭代器（每帧 (高, 宽, 4)）
+        width, height: 单半边尺寸
+        fps: 帧率
+        output: 输出 MP4 路径
+        mode: 通道位置
+        quality: 质量 1-100
+        ffmpeg: ffmpeg 可执行文件
+
+    返回:
+        int: 编码的帧数
+    """
+    buffer = np.empty((height, width * 2, 3), dtype=np.uint8)
+    composed = (compose_dual(rgba, mode, buffer) for rgba in frames)
+    return encode_rgb24(composed, width * 2, height, fps, output, quality, ffmpeg)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m svga_tools dual-channel', description='合成双通道（彩色 + Alpha）MP4')
+    parser.add_argument('inputs', nargs='+', help='SVGA 文件、PNG 序列目录或序列帧 ZIP')
+    parser.add_argument('-o', '--output', required=True, help='输出目录（<文件名>.mp4）')
+    parser.add_argument('--mode', choices=MODES, default=COLOR_LEFT_ALPHA_RIGHT, help=f'通道位置（默认: {COLOR_LEFT_ALPHA_RIGHT}）')
+    parser.add_argument('--width', type=int, default=None, help='单半边宽度（只给宽或高时按比例联动）')
+    parser.add_argument('--height', type=int, default=None, help='单半边高度')
+    parser.add_argument('--scale', type=float, default=None, help='缩放比例（未指定宽高时生效）')
+    parser.add_argument('--fps', type=int, default=None, help=f'帧率 1-60（默认: SVGA 帧率，PNG 序列为 {DEFAULT_FPS}）')
+    parser.add_argument('--quality', type=int, default=DEFAULT_QUALITY, help=f'质量 1-100（默认: {DEFAULT_QUALITY}）')
+    parser.add_argument('--jobs', type=int, default=None, help='渲染/解码并行数（默认: CPU 数）')
+    parser.add_argument('--ffmpeg', default='ffmpeg', help='ffmpeg 可执行文件（默认: ffmpeg）')
+    args = parser.parse_args(argv)
+
+    if not has_ffmpeg(args.ffmpeg):
+        print(f'未找到 ffmpeg: {args.ffmpeg}')
+        return 1
+    options = {
+        'width': args.width,
+        'height': args.height,
+        'scale': args.scale,
+        'fps': min(60, max(1, args.fps)) if args.fps else None,
+        'jobs': args.jobs
+    }
+    quality = max(1, min(100, args.quality))
+    os.makedirs(args.output, exist_ok=True)
+
+    failed = 0
+    for path in args.inputs:
+        stem = os.path.splitext(os.path.basename(os.path.normpath(path)))[0]
+        target = os.path.join(args.output, f'{stem}.mp4')
+        try:
+            source = svga_source if path.lower().endswith('.svga') else png_source
+            width, height, fps, frames = source(path, options)
+            count = encode_dual_channel(frames, width, height, fps, target, args.mode, quality, args.ffmpeg)
+        except (OSError, ValueError) as e:
+            failed += 1
+            print(f'{path}: 错误 - {e}')
+            continue
+        print(f'{path}: {count} 帧，{width * 2}x{height} @ {fps}fps -> {target}（{os.path.getsize(target) / 1024:.1f} KB）')
+    return 1 if failed else 0
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SVGA 文件信息
+
+输出版本、画布尺寸、帧率、图片/音频数量与体积、图层数量，可输出 JSON。
+
+用法:
+    python -m svga_tools info test_files/*.svga
+    python -m svga_tools info --json test_files/test.svga
+"""
+
+import argparse
+import json
+import os
+
+from .codec import SVGAError, detect_format, load
+from .lazy import LazyMovie
+from .model import VECTOR_SUFFIX, MATTE_SUFFIX
+
+
+def describe(path):
+    """
+    读取单个文件的基本信息（2.x 使用懒加载，只解析元数据）
+
+    参数:
+        path: SVGA 文件路径
+
+    返回:
+        dict: 文件信息
+    """
+    with open(path, 'rb') as f:
+        fmt = detect_format(f.read(4))
+    if fmt == 2:
+        movie = LazyMovie.open(path)
+        audio_keys = {audio.audioKey for audio in movie.audios}
+        image_sizes = [size for key, size in movie.image_sizes().items() if key not in audio_keys]
+    else:
+        movie = load(path)
+        image_sizes = [len(data) for data in movie.bitmaps.values()]
+    params = movie.params
+    return {
+        'file': path,
+        'format': fmt,
+        'version': movie.version,
+        'size': os.path.getsize(path),
+        'width': params.viewBoxWidth if params else 0,
+        'height': params.viewBoxHeight if params else 0,
+        'fps': params.fps if params else 0,
+        'frames': params.frames if params else 0,
+        'images': len(image_sizes),
+        'image_bytes': sum(image_sizes),
+        'audios': len(movie.audios),
+        'sprites': len(movie.sprites),
+        'vector_sprites': sum(1 for sprite in movie.sprites if sprite.imageKey.endswith(VECTOR_SUFFIX)),
+        'matte_sprites': sum(1 for sprite in movie.sprites if sprite.imageKey.endswith(MATTE_SUFFIX))
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m svga_tools info', description='输出 SVGA 文件的基本信息')
+    parser.add_argument('files', nargs='+', help='SVGA 文件路径')
+    parser.add_argument('--json', action='store_true', help='输出 JSON')
+    args = parser.parse_args(argv)
+
+    results = []
+    failed = 0
+    for path in args.files:
+        try:
+            results.append(describe(path))
+        except (OSError, SVGAError) as e:
+            failed += 1
+            results.append({'file': path, 'error': str(e)})
+
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    else:
+        for info in results:
+            if 'error' in info:
+                print(f"{info['file']}: 错误 - {info['error']}")
+                continue
+            print(
+                f"{info['file']}: v{info['version'] or '?'}（{info['format']}.x 格式），"
+                f"{info['width']:g}x{info['height']:g} @ {info['fps']}fps × {info['frames']} 帧，"
+                f"图片 {info['images']} 张 / {info['image_bytes'] / 1024:.1f} KB，"
+                f"图层 {info['sprites']}（矢量 {info['vector_sprites']}，遮罩 {info['matte_sprites']}），"
+                f"音频 {info['audios']}"
+            )
+    return 1 if failed else 0
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SVGA 2.x 懒加载读取器
+
+文件通过 mmap 映射后只解压一次，随后只建立 MovieEntity 顶层字段的偏移索引，不解析内容：
+- images 按需返回 memoryview 切片，与解压后的数据共用同一块内存，不复制图片字节
+- params / version 按需解析（只有几十字节）
+- sprites 只在访问时解析 imageKey/matteKey，frames 首次访问时才解码
+
+适合只读取元数据的批量任务（列出图层、读取 MovieParams、统计图片体积）。
+
+用法:
+    from svga_tools.lazy import LazyMovie
+    movie = LazyMovie.open('test_files/test.svga')
+    print(movie.params.fps, movie.image_sizes())
+    png = movie.images['img_0']      # memoryview，bytes(png) 才会复制
+"""
+
+import mmap
+from collections.abc import Mapping, Sequence
+
+from .codec import SVGAError, detect_format, inflate
+from .model import MovieEntity, MovieParams, SpriteEntity, FrameEntity, AudioEntity
+from .proto import ProtoError, WIRE_LEN, iter_fields, decode_message
+
+
+# MovieEntity 顶层字段编号（见 src/svga.proto）
+FIELD_VERSION = 1
+FIELD_PARAMS = 2
+FIELD_IMAGES = 3
+FIELD_SPRITES = 4
+FIELD_AUDIOS = 5
+
+
+class ImageView(Mapping):
+    """images 映射：键名 -> memoryview（共享解压后的缓冲区）"""
+
+    def __init__(self, view, spans):
+        self._view = view
+        self._spans = spans
+
+    def __getitem__(self, key):
+        start, end = self._spans[key]
+        return self._view[start:end]
+
+    def __iter__(self):
+        return iter(self._spans)
+
+    def __len__(self):
+        return len(self._spans)
+
+    def size(self, key):
+        """图片字节数（不切片）"""
+        start, end = self._spans[key]
+        return end - start
+
+
+class LazySprite:
+    """懒加载的图层，frames 首次访问时解码"""
+
+    def __init__(self, data, start, end):
+        self._data = data
+        self._start = start
+        self._end = end
+        self._frames = None
+        self.imageKey = ''
+        self.matteKey = ''
+        self.frame_count = 0
+        for number, wire_type, _, value_start, value_end in iter_fields(data, start, end):
+            if wire_type != WIRE_LEN:
+                continue
+            if number == 1:
+                self.imageKey = str(data[value_start:value_end], 'utf-8')
+            elif number == 2:
+                self.frame_count += 1
+            elif number == 3:
+                self.matteKey = str(data[value_start:value_end], 'utf-8')
+
+    @property
+    def frames(self):
+        """帧列表（首次访问时解码）"""
+        if self._frames is None:
+            self._frames = [
+                decode_message(FrameEntity, self._data, value_start, value_end)
+                for number, wire_type, _, value_start, value_end in iter_fields(self._data, self._start, self._end)
+                if number == 2 and wire_type == WIRE_LEN
+            ]
+        return self._frames
+
+    def to_sprite(self):
+        """完整解码为 SpriteEntity"""
+        return decode_message(SpriteEntity, self._data, self._start, self._end)
+
+
+class SpriteView(Sequence):
+    """sprites 序列，元素按需创建"""
+
+    def __init__(self, data, spans):
+        self._data = data
+        self._spans = spans
+        self._cache = {}
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self._spans)
+        sprite = self._cache.get(index)
+        if sprite is None:
+            start, end = self._spans[index]
+            sprite = self._cache[index] = LazySprite(self._data, start, end)
+        return sprite
+
+    def __len__(self):
+        return len(self._spans)
+
+
+class LazyMovie:
+    """SVGA 2.x 懒加载视图"""
+
+    def __init__(self, data):
+        """
+        参数:
+            data: 解压后的 MovieEntity protobuf 字节
+        """
+        self._data = data
+        self._view = memoryview(data)
+        self._version_span = None
+        self._params_span = None
+        self._params = None
+        self._image_spans = {}
+        self._sprite_spans = []
+        self._audio_spans = []
+        try:
+            self._index()
+        except ProtoError as e:
+            raise SVGAError(f'SVGA解析失败: {e}') from None
+        self._sprites = SpriteView(data, self._sprite_spans)
+
+    @classmethod
+    def open(cls, path):
+        """
+        通过 mmap 读取文件并解压一次
+
+        参数:
+            path: SVGA 文件路径
+
+        返回:
+            LazyMovie
+        """
+        with open(path, 'rb') as f:
+            if not f.seek(0, 2):
+                raise SVGAError('SVGA解析失败: 空文件')
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if detect_format(mapped[:4]) != 2:
+                    raise SVGAError('懒加载仅支持 2.x 格式，1.x zip 包请使用 svga_tools.load')
+                return cls(inflate(mapped))
+
+    @classmethod
+    def from_bytes(cls, raw):
+        """从 SVGA 文件字节创建"""
+        if detect_format(raw) != 2:
+            raise SVGAError('懒加载仅支持 2.x 格式，1.x zip 包请使用 svga_tools.loads')
+        return cls(inflate(raw))
+
+    def _index(self):
+        """建立顶层字段偏移索引"""
+        data = self._data
+        for number, wire_type, _, start, end in iter_fields(data):
+            if wire_type != WIRE_LEN:
+                continue
+            if number == FIELD_VERSION:
+                self._version_span = (start, end)
+            elif number == FIELD_PARAMS:
+                self._params_span = (start, end)
+            elif number == FIELD_IMAGES:
+                key = ''
+                value_span = (start, start)
+                for entry_number, entry_type, _, value_start, value_end in iter_fields(data, start, end):
+                    if entry_type != WIRE_LEN:
+                        continue
+                    if entry_number == 1:
+                        key = str(data[value_start:value_end], 'utf-8')
+                    elif entry_number == 2:
+                        value_span = (value_start, value_end)
+                self._image_spans[key] = value_span
+            elif number == FIELD_SPRITES:
+                self._sprite_spans.append((start, end))
+            elif number == FIELD_AUDIOS:
+                self._audio_spans.append((start, end))
+
+    @property
+    def buffer(self):
+        """解压后的 protobuf 数据（memoryview）"""
+        return self._view
+
+    @property
+    def version(self):
+        if self._version_span is None:
+            return ''
+        start, end = self._version_span
+        return str(self._view[start:end], 'utf-8')
+
+    @property
+    def params(self):
+        if self._params is None:
+            if self._params_span is None:
+                self._params = MovieParams(0.0, 0.0, 0, 0)
+            else:
+                self._params = decode_message(MovieParams, self._data, *self._params_span)
+        return self._params
+
+    @property
+    def images(self):
+        return ImageView(self._view, self._image_spans)
+
+    @property
+    def sprites(self):
+        return self._sprites
+
+    @property
+    def audios(self):
+        return [decode_message(AudioEntity, self._data, start, end) for start, end in self._audio_spans]
+
+    def image_sizes(self):
+        """
+        各图片字节数
+
+        返回:
+            dict: {键名: 字节数}
+        """
+        return {key: end - start for key, (start, end) in self._image_spans.items()}
+
+    def to_movie(self):
+        """完整解码为 MovieEntity"""
+        return decode_message(MovieEntity, self._data)
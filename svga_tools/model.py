@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SVGA 数据模型
+
+与 src/svga.proto 一一对应的类型化模型。每个类的 _PROTO 描述字段编号和类型，
+proto.py 据此完成 protobuf 编解码，字段编号修改时需要与 svga.proto 保持一致。
+
+字段默认值遵循 proto3 语义（数值为 0、字符串为空、子消息为 None），
+与 svga.min.js 的读取方式一致：
+- FrameEntity.alpha 缺省为 0（不可见），可见帧必须显式写入 alpha
+- FrameEntity.transform 缺省为单位矩阵
+"""
+
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Dict, List, Optional
+
+
+# 字段类型
+FLOAT = 'float'
+INT32 = 'int32'
+ENUM = 'enum'
+STRING = 'string'
+BYTES = 'bytes'
+MESSAGE = 'message'
+REPEATED = 'repeated'
+MAP = 'map'
+
+# 图层键名后缀
+VECTOR_SUFFIX = '.vector'
+MATTE_SUFFIX = '.matte'
+
+
+class ShapeType(IntEnum):
+    """矢量类型"""
+    SHAPE = 0       # 路径
+    RECT = 1        # 矩形
+    ELLIPSE = 2     # 圆形
+    KEEP = 3        # 与前帧一致
+
+
+class LineCap(IntEnum):
+    """线段端点样式"""
+    BUTT = 0
+    ROUND = 1
+    SQUARE = 2
+
+
+class LineJoin(IntEnum):
+    """线段连接样式"""
+    MITER = 0
+    ROUND = 1
+    BEVEL = 2
+
+
+@dataclass
+class MovieParams:
+    """动画参数"""
+    viewBoxWidth: float = 0.0
+    viewBoxHeight: float = 0.0
+    fps: int = 0
+    frames: int = 0
+
+
+@dataclass
+class Layout:
+    """初始约束大小"""
+    x: float = 0.0
+    y: float = 0.0
+    width: float = 0.0
+    height: float = 0.0
+
+
+@dataclass
+class Transform:
+    """
+    2D 仿射变换矩阵 [a, c, tx; b, d, ty]
+
+    x' = a*x + c*y + tx, y' = b*x + d*y + ty（与 canvas setTransform 参数顺序一致）
+    """
+    a: float = 1.0
+    b: float = 0.0
+    c: float = 0.0
+    d: float = 1.0
+    tx: float = 0.0
+    ty: float = 0.0
+
+    def is_identity(self):
+        """是否为单位矩阵"""
+        return (self.a, self.b, self.c, self.d, self.tx, self.ty) == (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+
+
+@dataclass
+class ShapeArgs:
+    """路径参数"""
+    d: str = ''
+
+
+@dataclass
+class RectArgs:
+    """矩形参数"""
+    x: float = 0.0
+    y: float = 0.0
+    width: float = 0.0
+    height: float = 0.0
+    cornerRadius: float = 0.0
+
+
+@dataclass
+class EllipseArgs:
+    """椭圆参数"""
+    x: float = 0.0
+    y: float = 0.0
+    radiusX: float = 0.0
+    radiusY: float = 0.0
+
+
+@dataclass
+class RGBAColor:
+    """颜色（各分量 0-1）"""
+    r: float = 0.0
+    g: float = 0.0
+    b: float = 0.0
+    a: float = 0.0
+
+
+@dataclass
+class ShapeStyle:
+    """矢量渲染参数"""
+    fill: Optional[RGBAColor] = None
+    stroke: Optional[RGBAColor] = None
+    strokeWidth: float = 0.0
+    lineCap: int = LineCap.BUTT
+    lineJoin: int = LineJoin.MITER
+    miterLimit: float = 0.0
+    lineDashI: float = 0.0
+    lineDashII: float = 0.0
+    lineDashIII: float = 0.0
+
+
+@dataclass
+class ShapeEntity:
+    """矢量元素，shape/rect/ellipse 三选一（oneof args）"""
+    type: int = ShapeType.SHAPE
+    shape: Optional[ShapeArgs] = None
+    rect: Optional[RectArgs] = None
+    ellipse: Optional[EllipseArgs] = None
+    styles: Optional[ShapeStyle] = None
+    transform: Optional[Transform] = None
+
+
+@dataclass
+class FrameEntity:
+    """单帧数据"""
+    alpha: float = 0.0
+    layout: Optional[Layout] = None
+    transform: Optional[Transform] = None
+    clipPath: str = ''
+    shapes: List[ShapeEntity] = field(default_factory=list)
+
+    def is_visible(self):
+        """是否可见（alpha 大于 0）"""
+        return self.alpha > 0
+
+
+@dataclass
+class SpriteEntity:
+    """元件（图层）"""
+    imageKey: str = ''
+    frames: List[FrameEntity] = field(default_factory=list)
+    matteKey: str = ''
+
+    @property
+    def is_vector(self):
+        """是否为矢量图层"""
+        return self.imageKey.endswith(VECTOR_SUFFIX)
+
+    @property
+    def is_matte(self):
+        """是否为遮罩图层"""
+        return self.imageKey.endswith(MATTE_SUFFIX)
+
+
+@dataclass
+class AudioEntity:
+    """音频"""
+    audioKey: str = ''
+    startFrame: int = 0
+    endFrame: int = 0
+    startTime: int = 0
+    totalTime: int = 0
+
+
+@dataclass
+class MovieEntity:
+    """SVGA 动画"""
+    version: str = ''
+    params: Optional[MovieParams] = None
+    images: Dict[str, bytes] = field(default_factory=dict)
+    sprites: List[SpriteEntity] = field(default_factory=list)
+    audios: List[AudioEntity] = field(default_factory=list)
+
+    @property
+    def audio_keys(self):
+        """images 中属于音频的键名"""
+        return {audio.audioKey for audio in self.audios}
+
+    @property
+    def bitmaps(self):
+        """images 中的位图（排除音频数据）"""
+        audio_keys = self.audio_keys
+        return {key: value for key, value in self.images.items() if key not in audio_keys}
+
+
+# 字段描述：(字段编号, 属性名, 类型, 子消息类/枚举类)，与 src/svga.proto 保持一致
+MovieParams._PROTO = (
+    (1, 'viewBoxWidth', FLOAT, None),
+    (2, 'viewBoxHeight', FLOAT, None),
+    (3, 'fps', INT32, None),
+    (4, 'frames', INT32, None),
+)
+Layout._PROTO = (
+    (1, 'x', FLOAT, None),
+    (2, 'y', FLOAT, None),
+    (3, 'width', FLOAT, None),
+    (4, 'height', FLOAT, None),
+)
+# Transform 在 proto 中的缺省值为 0，解码时先置 0 再读取字段
+Transform._PROTO = (
+    (1, 'a', FLOAT, None),
+    (2, 'b', FLOAT, None),
+    (3, 'c', FLOAT, None),
+    (4, 'd', FLOAT, None),
+    (5, 'tx', FLOAT, None),
+    (6, 'ty', FLOAT, None),
+)
+ShapeArgs._PROTO = (
+    (1, 'd', STRING, None),
+)
+RectArgs._PROTO = (
+    (1, 'x', FLOAT, None),
+    (2, 'y', FLOAT, None),
+    (3, 'width', FLOAT, None),
+    (4, 'height', FLOAT, None),
+    (5, 'cornerRadius', FLOAT, None),
+)
+EllipseArgs._PROTO = (
+    (1, 'x', FLOAT, None),
+    (2, 'y', FLOAT, None),
+    (3, 'radiusX', FLOAT, None),
+    (4, 'radiusY', FLOAT, None),
+)
+RGBAColor._PROTO = (
+    (1, 'r', FLOAT, None),
+    (2, 'g', FLOAT, None),
+    (3, 'b', FLOAT, None),
+    (4, 'a', FLOAT, None),
+)
+ShapeStyle._PROTO = (
+    (1, 'fill', MESSAGE, RGBAColor),
+    (2, 'stroke', MESSAGE, RGBAColor),
+    (3, 'strokeWidth', FLOAT, None),
+    (4, 'lineCap', ENUM, LineCap),
+    (5, 'lineJoin', ENUM, LineJoin),
+    (6, 'miterLimit', FLOAT, None),
+    (7, 'lineDashI', FLOAT, None),
+    (8, 'lineDashII', FLOAT, None),
+    (9, 'lineDashIII', FLOAT, None),
+)
+ShapeEntity._PROTO = (
+    (1, 'type', ENUM, ShapeType),
+    (2, 'shape', MESSAGE, ShapeArgs),
+    (3, 'rect', MESSAGE, RectArgs),
+    (4, 'ellipse', MESSAGE, EllipseArgs),
+    (10, 'styles', MESSAGE, ShapeStyle),
+    (11, 'transform', MESSAGE, Transform),
+)
+FrameEntity._PROTO = (
+    (1, 'alpha', FLOAT, None),
+    (2, 'layout', MESSAGE, Layout),
+    (3, 'transform', MESSAGE, Transform),
+    (4, 'clipPath', STRING, None),
+    (5, 'shapes', REPEATED, ShapeEntity),
+)
+SpriteEntity._PROTO = (
+    (1, 'imageKey', STRING, None),
+    (2, 'frames', REPEATED, FrameEntity),
+    (3, 'matteKey', STRING, None),
+)
+AudioEntity._PROTO = (
+    (1, 'audioKey', STRING, None),
+    (2, 'startFrame', INT32, None),
+    (3, 'endFrame', INT32, None),
+    (4, 'startTime', INT32, None),
+    (5, 'totalTime', INT32, None),
+)
+MovieEntity._PROTO = (
+    (1, 'version', STRING, None),
+    (2, 'params', MESSAGE, MovieParams),
+    (3, 'images', MAP, BYTES),
+    (4, 'sprites', REPEATED, SpriteEntity),
+    (5, 'audios', REPEATED, AudioEntity),
+)
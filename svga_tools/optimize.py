@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SVGA 优化
+
+- 内容相同的图片只保留一份（按内容哈希），图层的 imageKey 改为保留的键名
+- 所有 PNG 无损重压缩（oxipng，级别与 image-compression-service.js 的换算一致；未安装时用纯 zlib 重压缩 IDAT）
+- 2.x 外层 zlib 以最高级别重新压缩
+
+动态替换用的图片键名（如业务中按 imageKey 替换头像/文案的占位图）不能合并，
+用 --keep-key 指定；遮罩图层引用的键名和音频数据始终保留。
+
+用法:
+    python -m svga_tools optimize test_files/test.svga -o optimized/
+    python -m svga_tools optimize docs/assets/svga/*.svga --in-place --keep-key img_394
+"""
+
+import argparse
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from .codec import SVGAError, detect_format, dumps, loads
+from .png import DEFAULT_QUALITY, has_oxipng, quality_to_oxipng_level, recompress_png
+
+
+def dedupe_images(movie, keep_keys=()):
+    """
+    合并内容相同的图片并重映射图层的 imageKey
+
+    参数:
+        movie: MovieEntity（原地修改）
+        keep_keys: 不参与合并的键名
+
+    返回:
+        int: 删除的图片数量
+    """
+    protected = set(keep_keys) | movie.audio_keys
+    # 遮罩图层和被 matteKey 引用的图层按键名匹配，不能改名
+    for sprite in movie.sprites:
+        if sprite.matteKey:
+            protected.add(sprite.matteKey)
+        if sprite.is_matte:
+            protected.add(sprite.imageKey)
+
+    canonical = {}
+    remap = {}
+    for key, data in movie.images.items():
+        if key in protected:
+            continue
+        digest = hashlib.sha256(data).digest()
+        if digest in canonical:
+            remap[key] = canonical[digest]
+        else:
+            canonical[digest] = key
+
+    if not remap:
+        return 0
+
+    for key in remap:
+        del movie.images[key]
+    for sprite in movie.sprites:
+        if sprite.imageKey in remap:
+            sprite.imageKey = remap[sprite.imageKey]
+    return len(remap)
+
+
+def recompress_images(movie, level, jobs=None):
+    """
+    并行无损重压缩所有 PNG（内容相同的图片只压缩一次）
+
+    参数:
+        movie: MovieEntity（原地修改）
+        level: oxipng 优化级别
+        jobs: 并行线程数
+
+    返回:
+        int: 节省的字节数
+    """
+    audio_keys = movie.audio_keys
+    keys = [key for key in movie.images if key not in audio_keys]
+    unique = {}
+    for key in keys:
+        unique.setdefault(hashlib.sha256(movie.images[key]).digest(), movie.images[key])
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        results = dict(zip(unique, executor.map(lambda data: recompress_png(data, level), unique.values())))
+
+    saved = 0
+    for key in keys:
+        data = movie.images[key]
+        optimized = results[hashlib.sha256(data).digest()]
+        saved += len(data) - len(optimized)
+        movie.images[key] = optimized
+    return saved
+
+
+def optimize_bytes(data, level, keep_keys=(), jobs=None):
+    """
+    优化 SVGA 数据
+
+    参数:
+        data: SVGA 文件字节
+        level: oxipng 优化级别
+        keep_keys: 不参与合并的键名
+        jobs: 并行线程数
+
+    返回:
+        tuple: (优化后的字节, 统计信息 dict)
+    """
+    fmt = detect_format(data)
+    movie = loads(data)
+    removed = dedupe_images(movie, keep_keys)
+    # 先合并再压缩，重复图片不会被重复压缩；压缩后内容可能变得相同，再合并一次
+    saved = recompress_images(movie, level, jobs)
+    removed += dedupe_images(movie, keep_keys)
+    output = dumps(movie, version=fmt, level=9)
+    return output, {'deduped_images': removed, 'png_saved': saved}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m svga_tools optimize', description='SVGA 图片去重与无损重压缩')
+    parser.add_argument('files', nargs='+', help='SVGA 文件路径')
+    output = parser.add_mutually_exclusive_group(required=True)
+    output.add_argument('-o', '--output', help='输出目录')
+    output.add_argument('--in-place', action='store_true', help='直接覆盖原文件（只在体积变小时写入）')
+    parser.add_argument('--quality', type=int, default=DEFAULT_QUALITY, help=f'压缩质量 10-100，换算为 oxipng 级别（默认: {DEFAULT_QUALITY}，与浏览器端相同）')
+    parser.add_argument('--level', type=int, choices=range(1, 7), default=None, help='直接指定 oxipng 级别（覆盖 --quality）')
+    parser.add_argument('--keep-key', action='append', default=[], help='不参与去重的图片键名（可重复）')
+    parser.add_argument('--jobs', type=int, default=None, help='并行线程数（默认: CPU 数）')
+    args = parser.parse_args(argv)
+
+    level = args.level or quality_to_oxipng_level(args.quality)
+    engine = f'oxipng -o {level}' if has_oxipng() else 'zlib（未安装 oxipng）'
+    print(f'=== SVGA 优化（{engine}）===')
+
+    if args.output:
+        os.makedirs(args.output, exist_ok=True)
+
+    total_before = total_after = 0
+    failed = 0
+    for path in args.files:
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            optimized, stats = optimize_bytes(data, level, args.keep_key, args.jobs)
+        except (OSError, SVGAError) as e:
+            failed += 1
+            print(f'{path}: 错误 - {e}')
+            continue
+
+        # 没有收益时保留原文件内容
+        if len(optimized) >= len(data):
+            optimized = data
+        target = path if args.in_place else os.path.join(args.output, os.path.basename(path))
+        if optimized is not data or not args.in_place:
+            with open(target, 'wb') as f:
+                f.write(optimized)
+
+        total_before += len(data)
+        total_after += len(optimized)
+        ratio = (1 - len(optimized) / len(data)) * 100 if data else 0
+        print(
+            f'{path}: {len(data) / 1024:.1f} KB -> {len(optimized) / 1024:.1f} KB（-{ratio:.1f}%），'
+            f'合并图片 {stats["deduped_images"]} 张，PNG 节省 {stats["png_saved"] / 1024:.1f} KB'
+        )
+
+    if total_before:
+        print(f'\n合计: {total_before / 1024:.1f} KB -> {total_after / 1024:.1f} KB（-{(1 - total_after / total_before) * 100:.1f}%）')
+    return 1 if failed else 0
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PNG 辅助函数
+
+- 读取尺寸（只解析 IHDR）
+- 无损重压缩：优先使用 oxipng 命令行（与 image-compression-service.js 中的 oxipng WASM 同一算法），
+  未安装时退回纯 zlib 方案：合并 IDAT 并以最高级别重新 deflate，像素数据不变
+"""
+
+import os
+import shutil
+import struct
+import subprocess
+import tempfile
+import zlib
+
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# 与 image-compression-service.js 一致：quality（10-100）映射到 oxipng 级别（1-6）
+DEFAULT_QUALITY = 80
+
+
+def is_png(data):
+    """是否为 PNG 数据"""
+    return bytes(data[:8]) == PNG_SIGNATURE
+
+
+def get_png_size(data):
+    """
+    读取 PNG 宽高
+
+    参数:
+        data: PNG 字节
+
+    返回:
+        tuple: (宽, 高)，不是 PNG 时返回 None
+    """
+    if not is_png(data) or len(data) < 24 or bytes(data[12:16]) != b'IHDR':
+        return None
+    return struct.unpack('>II', bytes(data[16:24]))
+
+
+def quality_to_oxipng_level(quality):
+    """
+    将压缩质量换算为 oxipng 优化级别（与浏览器端 compressWithOxipng 相同）
+
+    参数:
+        quality: 压缩质量 10-100
+
+    返回:
+        int: oxipng 级别 1-6
+    """
+    # Math.round 为 .5 向上取整，Python 的 round 为银行家舍入（50 -> 2、90 -> 4），不能直接使用
+    return min(6, max(1, int(quality / 20 + 0.5)))
+
+
+def iter_chunks(data):
+    """
+    遍历 PNG 数据块
+
+    返回:
+        生成器，产出 (类型, 数据)
+    """
+    pos = len(PNG_SIGNATURE)
+    while pos + 8 <= len(data):
+        length, chunk_type = struct.unpack('>I4s', data[pos:pos + 8])
+        yield chunk_type, data[pos + 8:pos + 8 + length]
+        pos += 12 + length
+        if chunk_type == b'IEND':
+            break
+
+
+def make_chunk(chunk_type, payload):
+    """构建 PNG 数据块"""
+    return struct.pack('>I', len(payload)) + chunk_type + payload + struct.pack('>I', zlib.crc32(chunk_type + payload) & 0xFFFFFFFF)
+
+
+def repack_idat(data):
+    """
+    纯 zlib 无损重压缩：合并所有 IDAT 并以级别 9 重新压缩，其余数据块原样保留
+
+    参数:
+        data: PNG 字节
+
+    返回:
+        bytes: 重新压缩后的 PNG，格式异常时返回 None
+    """
+    try:
+        chunks = list(iter_chunks(data))
+        idat = b''.join(payload for chunk_type, payload in chunks if chunk_type == b'IDAT')
+        if not idat:
+            return None
+        raw = zlib.decompress(idat)
+    except (struct.error, zlib.error):
+        return None
+
+    compressor = zlib.compressobj(9, zlib.DEFLATED, zlib.MAX_WBITS, 9)
+    packed = compressor.compress(raw) + compressor.flush()
+
+    parts = [PNG_SIGNATURE]
+    idat_written = False
+    for chunk_type, payload in chunks:
+        if chunk_type == b'IDAT':
+            if not idat_written:
+                parts.append(make_chunk(b'IDAT', packed))
+                idat_written = True
+            continue
+        parts.append(make_chunk(chunk_type, payload))
+    return b''.join(parts)
+
+
+def run_oxipng(data, level):
+    """
+    调用 oxipng 命令行压缩
+
+    参数:
+        data: PNG 字节
+        level: 优化级别
+
+    返回:
+        bytes: 压缩结果，失败时返回 None
+    """
+    with tempfile.TemporaryDirectory(prefix='svga-oxipng-') as temp_dir:
+        input_path = os.path.join(temp_dir, 'input.png')
+        output_path = os.path.join(temp_dir, 'output.png')
+        with open(input_path, 'wb') as f:
+            f.write(data)
+        # 与浏览器端参数一致：不隔行、优化透明像素，不删除任何数据块
+        result = subprocess.run(
+            ['oxipng', '-o', str(level), '-i', '0', '--alpha', '--quiet', '--out', output_path, input_path],
+            capture_output=True
+        )
+        if result.returncode != 0 or not os.path.exists(output_path):
+            return None
+        with open(output_path, 'rb') as f:
+            return f.read()
+
+
+def has_oxipng():
+    """是否安装了 oxipng 命令行"""
+    return shutil.which('oxipng') is not None
+
+
+def recompress_png(data, level):
+    """
+    无损重压缩 PNG
+
+    参数:
+        data: PNG 字节
+        level: oxipng 优化级别
+
+    返回:
+        bytes: 更小的 PNG，没有收益时返回原数据
+    """
+    data = bytes(data)
+    if not is_png(data):
+        return data
+    optimized = run_oxipng(data, level) if has_oxipng() else repack_idat(data)
+    if optimized and len(optimized) < len(data):
+        return optimized
+    return data
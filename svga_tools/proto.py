@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+protobuf 编解码（不依赖 protobuf 库）
+
+只实现 svga.proto 用到的部分：varint / fixed32 float / 长度前缀（字符串、字节、子消息、map）。
+按 model.py 中各类的 _PROTO 字段描述编解码：
+- 解码时所有字段先置为 proto3 缺省值，未知字段跳过
+- 编码时按字段编号顺序写出，缺省值（0、空字符串、None、空列表）省略
+"""
+
+import struct
+
+from .model import FLOAT, INT32, ENUM, STRING, BYTES, MESSAGE, REPEATED, MAP
+
+
+# 线类型
+WIRE_VARINT = 0
+WIRE_FIXED64 = 1
+WIRE_LEN = 2
+WIRE_FIXED32 = 5
+
+_FLOAT = struct.Struct('<f')
+_UINT32 = struct.Struct('<I')
+
+
+class ProtoError(ValueError):
+    """protobuf 数据格式错误"""
+
+
+def read_varint(buf, pos):
+    """
+    读取 varint
+
+    参数:
+        buf: bytes / memoryview
+        pos: 起始位置
+
+    返回:
+        tuple: (数值, 结束位置)
+    """
+    result = 0
+    shift = 0
+    while True:
+        try:
+            byte = buf[pos]
+        except IndexError:
+            raise ProtoError('varint 越界') from None
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+        if shift >= 70:
+            raise ProtoError('varint 过长')
+
+
+def iter_fields(buf, start=0, end=None):
+    """
+    遍历消息中的字段，不解析内容
+
+    参数:
+        buf: bytes / memoryview
+        start: 消息起始位置
+        end: 消息结束位置（默认为 buf 末尾）
+
+    返回:
+        生成器，产出 (字段编号, 线类型, 数值, 值起始位置, 值结束位置)；
+        varint/fixed 字段的数值为整数，长度前缀字段的数值为 None
+    """
+    if end is None:
+        end = len(buf)
+    pos = start
+    while pos < end:
+        key, pos = read_varint(buf, pos)
+        number = key >> 3
+        wire_type = key & 7
+        if wire_type == WIRE_VARINT:
+            value_start = pos
+            value, pos = read_varint(buf, pos)
+        elif wire_type == WIRE_LEN:
+            length, value_start = read_varint(buf, pos)
+            pos = value_start + length
+            value = None
+        elif wire_type == WIRE_FIXED32:
+            value_start = pos
+            pos += 4
+            value = _UINT32.unpack_from(buf, value_start)[0] if pos <= end else None
+        elif wire_type == WIRE_FIXED64:
+            value_start = pos
+            pos += 8
+            value = None
+        else:
+            raise ProtoError(f'不支持的线类型 {wire_type}（字段 {number}）')
+        if pos > end:
+            raise ProtoError(f'字段 {number} 越界')
+        yield number, wire_type, value, value_start, pos
+
+
+def to_int32(value):
+    """varint 转 int32（负数以 64 位补码存储）"""
+    value &= 0xFFFFFFFF
+    return value - 0x100000000 if value >= 0x80000000 else value
+
+
+def get_field_table(cls):
+    """
+    获取类的字段编号索引（缓存在类上）
+
+    返回:
+        dict: {字段编号: (属性名, 类型, 子类型)}
+    """
+    table = cls.__dict__.get('_PROTO_TABLE')
+    if table is None:
+        table = {number: (name, kind, sub) for number, name, kind, sub in cls._PROTO}
+        cls._PROTO_TABLE = table
+    return table
+
+
+def new_default(cls):
+    """创建所有字段为 proto3 缺省值的实例"""
+    obj = cls.__new__(cls)
+    for _, name, kind, _ in cls._PROTO:
+        if kind == FLOAT:
+            value = 0.0
+        elif kind in (INT32, ENUM):
+            value = 0
+        elif kind == STRING:
+            value = ''
+        elif kind == BYTES:
+            value = b''
+        elif kind == REPEATED:
+            value = []
+        elif kind == MAP:
+            value = {}
+        else:
+            value = None
+        setattr(obj, name, value)
+    return obj
+
+
+def decode_map_entry(buf, start, end, value_kind):
+    """
+    解码 map 条目（key=1 字符串，value=2）
+
+    返回:
+        tuple: (键, 值)
+    """
+    key = ''
+    value = b'' if value_kind == BYTES else ''
+    for number, wire_type, _, value_start, value_end in iter_fields(buf, start, end):
+        if wire_type != WIRE_LEN:
+            continue
+        if number == 1:
+            key = str(buf[value_start:value_end], 'utf-8')
+        elif number == 2:
+            value = bytes(buf[value_start:value_end])
+            if value_kind == STRING:
+                value = value.decode('utf-8')
+    return key, value
+
+
+def decode_message(cls, buf, start=0, end=None):
+    """
+    按 _PROTO 描述解码消息
+
+    参数:
+        cls: 模型类
+        buf: bytes / memoryview
+        start: 消息起始位置
+        end: 消息结束位置
+
+    返回:
+        模型实例
+    """
+    table = get_field_table(cls)
+    obj = new_default(cls)
+    for number, wire_type, value, value_start, value_end in iter_fields(buf, start, end):
+        spec = table.get(number)
+        if spec is None:
+            continue
+        name, kind, sub = spec
+        if kind == FLOAT:
+            if wire_type == WIRE_FIXED32:
+                setattr(obj, name, _FLOAT.unpack_from(buf, value_start)[0])
+        elif kind == INT32:
+            if wire_type == WIRE_VARINT:
+                setattr(obj, name, to_int32(value))
+        elif kind == ENUM:
+            if wire_type == WIRE_VARINT:
+                value = to_int32(value)
+                try:
+                    value = sub(value)
+                except ValueError:
+                    pass
+                setattr(obj, name, value)
+        elif wire_type != WIRE_LEN:
+            continue
+        elif kind == STRING:
+            setattr(obj, name, str(buf[value_start:value_end], 'utf-8'))
+        elif kind == BYTES:
+            setattr(obj, name, bytes(buf[value_start:value_end]))
+        elif kind == MESSAGE:
+            setattr(obj, name, decode_message(sub, buf, value_start, value_end))
+        elif kind == REPEATED:
+            getattr(obj, name).append(decode_message(sub, buf, value_start, value_end))
+        elif kind == MAP:
+            key, item = decode_map_entry(buf, value_start, value_end, sub)
+            getattr(obj, name)[key] = item
+    return obj
+
+
+def put_varint(out, value):
+    """写入 varint（负数按 64 位补码）"""
+    if value < 0:
+        value &= 0xFFFFFFFFFFFFFFFF
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def put_len(out, number, payload):
+    """写入长度前缀字段"""
+    put_varint(out, (number << 3) | WIRE_LEN)
+    put_varint(out, len(payload))
+    out += payload
+
+
+def encode_message(obj, out=None):
+    """
+    按 _PROTO 描述编码消息，缺省值省略
+
+    参数:
+        obj: 模型实例
+        out: 可选，写入的 bytearray
+
+    返回:
+        bytearray: 编码结果
+    """
+    if out is None:
+        out = bytearray()
+    for number, name, kind, sub in obj._PROTO:
+        value = getattr(obj, name)
+        if kind == FLOAT:
+            if value:
+                put_varint(out, (number << 3) | WIRE_FIXED32)
+                out += _FLOAT.pack(value)
+        elif kind in (INT32, ENUM):
+            if value:
+                put_varint(out, (number << 3) | WIRE_VARINT)
+                put_varint(out, int(value))
+        elif kind == STRING:
+            if value:
+                put_len(out, number, value.encode('utf-8'))
+        elif kind == BYTES:
+            if value:
+                put_len(out, number, value)
+        elif kind == MESSAGE:
+            if value is not None:
+                put_len(out, number, encode_message(value))
+        elif kind == REPEATED:
+            for item in value:
+                put_len(out, number, encode_message(item))
+        elif kind == MAP:
+            for key, item in value.items():
+                entry = bytearray()
+                put_len(entry, 1, key.encode('utf-8'))
+                put_len(entry, 2, item.encode('utf-8') if sub == STRING else item)
+                put_len(out, number, entry)
+    return out
@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SVGA 无头渲染（NumPy）
+
+按 FrameEntity 合成位图图层，输出 RGBA 帧（numpy uint8 数组，形状 (高, 宽, 4)），用于服务端生成缩略图、
+GIF/WebP 预览和像素对比测试，不依赖浏览器。依赖 numpy 与 Pillow（解码 PNG）。
+
+与 svga.min.js 的 drawSprite 保持一致：
+- alpha < 0.05 的帧不绘制；transform 的 a/d 为 0 时按 1 处理
+- 位图在图层坐标系原点绘制，按 layout 宽高缩放（与 Android 播放器一致；layout 与图片同尺寸时和 Web 端相同）
+- .matte 图层不单独绘制；matteKey 相同的连续图层先画到离屏层，再用遮罩图层的 alpha 做 destination-in 后合成
+- 双线性采样（对应 canvas 默认的 imageSmoothingEnabled）
+
+不支持矢量 shapes 和 clipPath（需要路径光栅化），这两类内容会被忽略。
+
+每个图层按目标区域整体向量化计算（逆仿射映射 + 双线性采样 + premultiplied alpha 合成），
+多帧渲染可用进程池按帧区间并行。
+
+用法:
+    python -m svga_tools render test_files/test.svga -o frames/ --scale 0.5
+    python -m svga_tools render test_files/test.svga -o thumbs/ --frames 0 --jobs 1
+
+    from svga_tools.render import Renderer
+    renderer = Renderer(svga_tools.load('test_files/test.svga'))
+    rgba = renderer.render(0)
+"""
+
+import argparse
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from PIL import Image
+
+from .codec import SVGAError, loads
+from .model import MATTE_SUFFIX
+
+
+# svga.min.js: alpha < 0.05 的帧直接跳过
+MIN_ALPHA = 0.05
+
+# 进程池按帧区间分配任务时每个区间的最大帧数
+FRAME_CHUNK = 16
+
+# 进程池中每个进程持有的渲染器（由 _init_worker 创建，避免每个任务重复解码）
+_worker_renderer = None
+
+
+def frame_matrix(frame):
+    """
+    帧的仿射矩阵 (a, b, c, d, tx, ty)，a/d 为 0 时按 1 处理（与 svga.min.js 一致）
+    """
+    transform = frame.transform
+    if transform is None:
+        return (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+    return (transform.a or 1.0, transform.b, transform.c, transform.d or 1.0, transform.tx, transform.ty)
+
+
+def multiply(m1, m2):
+    """矩阵相乘 m1 * m2（先应用 m2，再应用 m1）"""
+    a1, b1, c1, d1, tx1, ty1 = m1
+    a2, b2, c2, d2, tx2, ty2 = m2
+    return (
+        a1 * a2 + c1 * b2,
+        b1 * a2 + d1 * b2,
+        a1 * c2 + c1 * d2,
+        b1 * c2 + d1 * d2,
+        a1 * tx2 + c1 * ty2 + tx1,
+        b1 * tx2 + d1 * ty2 + ty1
+    )
+
+
+def decode_image(data):
+    """
+    解码图片为 premultiplied float32 RGBA，四周各补 1 像素透明边（双线性采样时边缘自然过渡）
+
+    参数:
+        data: PNG/JPEG 字节（bytes 或 memoryview）
+
+    返回:
+        numpy.ndarray: 形状 (高 + 2, 宽 + 2, 4)，解码失败返回 None
+    """
+    try:
+        with Image.open(io.BytesIO(bytes(data))) as image:
+            rgba = np.asarray(image.convert('RGBA'), dtype=np.float32) / 255.0
+    except (OSError, ValueError):
+        return None
+    rgba[..., :3] *= rgba[..., 3:4]
+    return np.pad(rgba, ((1, 1), (1, 1), (0, 0)))
+
+
+def split_coords(coords, size):
+    """
+    采样坐标拆分为整数下标与小数权重
+
+    参数:
+        coords: 补边后的图片坐标（float32）
+        size: 图片原始宽或高
+
+    返回:
+        tuple: (下标, 权重, 是否落在图片及 1 像素补边内)
+    """
+    floor = np.floor(coords)
+    valid = (coords >= 0) & (coords < size + 1)
+    index = np.clip(floor, 0, size).astype(np.intp)
+    return index, coords - floor, valid
+
+
+def composite(target, image, matrix, alpha):
+    """
+    将图片按仿射矩阵合成到目标画布（source-over，原地修改）
+
+    参数:
+        target: premultiplied float32 画布 (高, 宽, 4)
+        image: decode_image() 的返回值
+        matrix: 图片像素坐标 -> 画布坐标的仿射矩阵
+        alpha: 整体透明度
+    """
+    height, width = image.shape[0] - 2, image.shape[1] - 2
+    a, b, c, d, tx, ty = matrix
+    det = a * d - b * c
+    if abs(det) < 1e-9:
+        return
+
+    # 目标区域：图片四角变换后的包围盒
+    corners_x = [tx, a * width + tx, c * height + tx, a * width + c * height + tx]
+    corners_y = [ty, b * width + ty, d * height + ty, b * width + d * height + ty]
+    x0 = max(int(np.floor(min(corners_x))), 0)
+    y0 = max(int(np.floor(min(corners_y))), 0)
+    x1 = min(int(np.ceil(max(corners_x))), target.shape[1])
+    y1 = min(int(np.ceil(max(corners_y))), target.shape[0])
+    if x0 >= x1 or y0 >= y1:
+        return
+
+    # 逆映射：画布像素中心 -> 图片坐标（+0.5 为采样偏移，补边后下标整体右移 1）
+    px = np.arange(x0, x1, dtype=np.float32) + np.float32(0.5 - tx)
+    py = np.arange(y0, y1, dtype=np.float32) + np.float32(0.5 - ty)
+    weight = np.float32(alpha)
+    if b == 0 and c == 0:
+        # 轴对齐（约占导出帧的一半以上）：行、列分别插值，只做一维取样
+        sx = px / np.float32(a) + np.float32(0.5)
+        sy = py / np.float32(d) + np.float32(0.5)
+        ix, fx, valid_x = split_coords(sx, width)
+        iy, fy, valid_y = split_coords(sy, height)
+        if not valid_x.any() or not valid_y.any():
+            return
+        rows = image[iy] * (1 - fy)[:, None, None] + image[iy + 1] * fy[:, None, None]
+        source = rows[:, ix] * (1 - fx)[None, :, None] + rows[:, ix + 1] * fx[None, :, None]
+        source *= (valid_y[:, None] * valid_x[None, :] * weight)[..., None]
+    else:
+        py = py[:, None]
+        sx = (np.float32(d / det) * px - np.float32(c / det) * py) + np.float32(0.5)
+        sy = (np.float32(a / det) * py - np.float32(b / det) * px) + np.float32(0.5)
+        ix, fx, valid_x = split_coords(sx, width)
+        iy, fy, valid_y = split_coords(sy, height)
+        inside = valid_x & valid_y
+        if not inside.any():
+            return
+        fx = fx[..., None]
+        fy = fy[..., None]
+        top = image[iy, ix] * (1 - fx) + image[iy, ix + 1] * fx
+        bottom = image[iy + 1, ix] * (1 - fx) + image[iy + 1, ix + 1] * fx
+        source = top * (1 - fy) + bottom * fy
+        source *= (inside * weight)[..., None]
+
+    region = target[y0:y1, x0:x1]
+    region *= 1 - source[..., 3:4]
+    region += source
+
+
+def movie_frame_count(movie):
+    """总帧数：params.frames，缺失或为 0 时取最长图层的帧数"""
+    params = movie.params
+    if params and params.frames:
+        return params.frames
+    return max((len(sprite.frames) for sprite in movie.sprites), default=0)
+
+
+class Renderer:
+    """SVGA 位图渲染器（图片只解码一次）"""
+
+    def __init__(self, movie, scale=1.0):
+        """
+        参数:
+            movie: MovieEntity
+            scale: 输出缩放比例
+        """
+        self.movie = movie
+        self.scale = scale
+        params = movie.params
+        self.width = max(int(round((params.viewBoxWidth if params else 0) * scale)), 1)
+        self.height = max(int(round((params.viewBoxHeight if params else 0) * scale)), 1)
+        self.frame_count = movie_frame_count(movie)
+        self._images = {}
+        self._mattes = {sprite.imageKey: sprite for sprite in movie.sprites if sprite.is_matte}
+
+    def get_image(self, image_key):
+        """按图层 imageKey 取解码后的图片（.matte 后缀去掉后查找，与 svga.min.js 一致）"""
+        if image_key not in self._images:
+            data = self.movie.images.get(image_key)
+            if data is None:
+                data = self.movie.images.get(image_key.replace(MATTE_SUFFIX, ''))
+            self._images[image_key] = decode_image(data) if data else None
+        return self._images[image_key]
+
+    def draw_sprite(self, target, sprite, index):
+        """绘制单个图层的第 index 帧"""
+        if index >= len(sprite.frames):
+            return
+        frame = sprite.frames[index]
+        if frame.alpha < MIN_ALPHA:
+            return
+        image = self.get_image(sprite.imageKey)
+        if image is None:
+            return
+        matrix = multiply((self.scale, 0.0, 0.0, self.scale, 0.0, 0.0), frame_matrix(frame))
+        layout = frame.layout
+        if layout is not None and layout.width > 0 and layout.height > 0:
+            image_height, image_width = image.shape[0] - 2, image.shape[1] - 2
+            matrix = multiply(matrix, (layout.width / image_width, 0.0, 0.0, layout.height / image_height, 0.0, 0.0))
+        composite(target, image, matrix, frame.alpha)
+
+    def render_premultiplied(self, index):
+        """
+        渲染第 index 帧
+
+        返回:
+            numpy.ndarray: premultiplied float32 RGBA (高, 宽, 4)，取值 0-1
+        """
+        canvas = np.zeros((self.height, self.width, 4), dtype=np.float32)
+        layer = None
+        matte_key = ''
+
+        def flush():
+            mask = np.zeros_like(canvas)
+            matte = self._mattes.get(matte_key)
+            if matte is not None:
+                self.draw_sprite(mask, matte, index)
+            layer[...] *= mask[..., 3:4]
+            canvas[...] *= 1 - layer[..., 3:4]
+            canvas[...] += layer
+
+        for sprite in self.movie.sprites:
+            if sprite.is_matte:
+                continue
+            if sprite.matteKey != matte_key:
+                if layer is not None:
+                    flush()
+                matte_key = sprite.matteKey
+                layer = np.zeros_like(canvas) if matte_key else None
+            self.draw_sprite(canvas if layer is None else layer, sprite, index)
+        if layer is not None:
+            flush()
+        return canvas
+
+    def render(self, index):
+        """
+        渲染第 index 帧
+
+        返回:
+            numpy.ndarray: 非预乘 uint8 RGBA (高, 宽, 4)
+        """
+        return to_rgba8(self.render_premultiplied(index))
+
+
+def to_rgba8(premultiplied):
+    """premultiplied float32 -> 非预乘 uint8"""
+    alpha = premultiplied[..., 3:4]
+    rgb = np.divide(premultiplied[..., :3], alpha, out=np.zeros_like(premultiplied[..., :3]), where=alpha > 0)
+    rgba = np.concatenate([rgb, alpha], axis=-1)
+    return (np.clip(rgba, 0.0, 1.0) * 255.0 + 0.5).astype(np.uint8)
+
+
+def _init_worker(data, scale):
+    global _worker_renderer
+    _worker_renderer = Renderer(loads(data), scale)
+
+
+def _render_range(indices):
+    return [(index, _worker_renderer.render(index)) for index in indices]
+
+
+def render_frames(data, frames=None, scale=1.0, jobs=None):
+    """
+    渲染多帧，jobs > 1 时按帧区间分给进程池（每个进程只解码一次文件和图片）
+
+    参数:
+        data: SVGA 文件字节
+        frames: 帧序号列表（默认全部）
+        scale: 输出缩放比例
+        jobs: 进程数（默认 CPU 数；1 表示在当前进程渲染）
+
+    返回:
+        生成器，按帧序号顺序产出 (帧序号, uint8 RGBA 数组)
+    """
+    jobs = jobs or os.cpu_count() or 1
+    if jobs <= 1:
+        renderer = Renderer(loads(data), scale)
+        indices = range(renderer.frame_count) if frames is None else frames
+        for index in indices:
+            yield index, renderer.render(index)
+        return
+
+    if frames is None:
+        frames = range(movie_frame_count(loads(data)))
+    frames = list(frames)
+    if not frames:
+        return
+    # 区间不宜过大：结果按区间整体返回，过大时会在内存中堆积大量帧
+    chunk = max(1, min(-(-len(frames) // jobs), FRAME_CHUNK))
+    ranges = [frames[i:i + chunk] for i in range(0, len(frames), chunk)]
+    with ProcessPoolExecutor(max_workers=min(jobs, len(ranges)), initializer=_init_worker, initargs=(data, scale)) as executor:
+        for results in executor.map(_render_range, ranges):
+            yield from results
+
+
+def parse_frames(spec, frame_count):
+    """
+    解析帧选择，如 "0"、"0-9"、"0,10,20"
+
+    返回:
+        list: 帧序号
+    """
+    if not spec:
+        return list(range(frame_count))
+    frames = []
+    for part in spec.split(','):
+        if '-' in part:
+            start, end = part.split('-', 1)
+            frames.extend(range(int(start), min(int(end), frame_count - 1) + 1))
+        elif int(part) < frame_count:
+            frames.append(int(part))
+    return frames
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m svga_tools render', description='将 SVGA 位图图层渲染为 PNG 帧（NumPy）')
+    parser.add_argument('file', help='SVGA 文件路径')
+    parser.add_argument('-o', '--output', required=True, help='输出目录')
+    parser.add_argument('--frames', help='帧选择，如 0、0-9、0,10,20（默认全部）')
+    parser.add_argument('--scale', type=float, default=1.0, help='缩放比例（默认: 1.0）')
+    parser.add_argument('--jobs', type=int, default=None, help='并行进程数（默认: CPU 数）')
+    args = parser.parse_args(argv)
+
+    try:
+        with open(args.file, 'rb') as f:
+            data = f.read()
+        frame_count = movie_frame_count(loads(data))
+    except (OSError, SVGAError) as e:
+        print(f'{args.file}: 错误 - {e}')
+        return 1
+
+    frames = parse_frames(args.frames, frame_count)
+    os.makedirs(args.output, exist_ok=True)
+    stem = os.path.splitext(os.path.basename(args.file))[0]
+    for index, rgba in render_frames(data, frames, args.scale, args.jobs):
+        Image.fromarray(rgba, 'RGBA').save(os.path.join(args.output, f'{stem}_{index:04d}.png'))
+    print(f'{args.file}: 已渲染 {len(frames)} 帧 -> {args.output}')
+    return 0
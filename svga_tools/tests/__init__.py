@@ -0,0 +1,2 @@
+# -*- coding: utf-8 -*-
+"""svga_tools 测试（python -m pytest svga_tools/tests）"""
@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+"""测试公用的样例文件路径（test_files/）"""
+
+import os
+
+import pytest
+
+TEST_FILES = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'test_files')
+
+
+def sample(name):
+    return os.path.join(TEST_FILES, name)
+
+
+@pytest.fixture
+def test_svga():
+    return sample('test.svga')
+
+
+@pytest.fixture
+def icon_svga():
+    return sample('icon_chatroom_ani_wordgame_nor.svga')
@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+"""渲染开销分析与预算检查"""
+
+from svga_tools import load
+from svga_tools.analyze import DEFAULT_BUDGETS, analyze, check_budgets
+
+
+def test_analyze_report(test_svga):
+    report = analyze(test_svga)
+    assert (report['width'], report['height'], report['frames']) == (750, 750, 90)
+    assert 0 < report['images'] <= len(load(test_svga).images)
+    assert len(report['frame_stats']) == 90
+    assert report['max_sprites'] == max(stats['sprites'] for stats in report['frame_stats'])
+    assert report['gpu_mb'] > 0
+
+
+def test_check_budgets(test_svga):
+    report = analyze(test_svga)
+    assert check_budgets(report, {name: None for name in DEFAULT_BUDGETS}) == []
+    violations = check_budgets(report, dict(DEFAULT_BUDGETS, max_sprites=0, max_gpu_mb=0.001))
+    assert len(violations) == 2
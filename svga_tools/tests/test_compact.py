@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""帧数据精简：播放结果不变，第一帧不使用 KEEP"""
+
+from svga_tools import ShapeType, load, loads
+from svga_tools.compact import compact_bytes, expand_keep_shapes
+from svga_tools.render import frame_matrix
+
+
+def test_compact_preserves_playback(test_svga):
+    with open(test_svga, 'rb') as f:
+        data = f.read()
+    output, stats = compact_bytes(data)
+    compacted = loads(output)
+
+    assert stats['proto_after'] <= stats['proto_before']
+    for sprite in compacted.sprites:
+        if sprite.frames and sprite.frames[0].shapes:
+            assert sprite.frames[0].shapes[0].type != ShapeType.KEEP
+
+    original = load(test_svga)
+    for sprite_before, sprite_after in zip(original.sprites, compacted.sprites):
+        expand_keep_shapes(sprite_before)
+        expand_keep_shapes(sprite_after)
+        assert len(sprite_before.frames) == len(sprite_after.frames)
+        for frame_before, frame_after in zip(sprite_before.frames, sprite_after.frames):
+            assert frame_before.is_visible() == frame_after.is_visible()
+            if frame_before.is_visible():
+                assert frame_after.alpha == frame_before.alpha
+                assert frame_after.layout == frame_before.layout
+                assert frame_matrix(frame_after) == frame_matrix(frame_before)
+                assert len(frame_after.shapes) == len(frame_before.shapes)
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""GIF / WebP / 序列帧编码"""
+
+import io
+import zipfile
+
+import numpy as np
+from PIL import Image
+
+from svga_tools import load
+from svga_tools.convert import encode_frames_zip, encode_gif, encode_webp, frame_indices, process_alpha
+from svga_tools.render import Renderer
+
+OPTIONS = {
+    'quality': 10, 'transparent': True, 'background': (255, 255, 255), 'dither': None,
+    'alpha_threshold': 128, 'webp_quality': 100
+}
+
+
+def rendered(path, indices=(21, 23, 25, 27)):
+    # 取后段逐帧变化的帧，避免 GIF 编码器合并相同帧
+    renderer = Renderer(load(path))
+    return [renderer.render(index) for index in indices]
+
+
+def test_frame_indices():
+    assert frame_indices(30, 30, 30) == list(range(30))
+    assert frame_indices(30, 30, 15) == list(range(0, 30, 2))
+    assert len(frame_indices(30, 30, 60)) == 60
+
+
+def test_process_alpha_threshold():
+    rgba = np.array([[[10, 10, 10, 100], [10, 10, 10, 200]]], dtype=np.uint8)
+    assert process_alpha(rgba, None, 128)[..., 3].tolist() == [[0, 255]]
+    assert process_alpha(rgba, (0, 0, 0), 128)[..., 3].tolist() == [[255, 255]]
+
+
+def test_encoders(icon_svga):
+    frames = rendered(icon_svga)
+    with Image.open(io.BytesIO(encode_gif(frames, 33, OPTIONS))) as gif:
+        assert gif.n_frames == len(frames) and gif.size == (72, 72)
+    with Image.open(io.BytesIO(encode_webp(frames, 33, OPTIONS))) as webp:
+        assert webp.n_frames == len(frames) and webp.mode == 'RGBA'
+    with zipfile.ZipFile(io.BytesIO(encode_frames_zip(frames))) as archive:
+        assert archive.namelist() == [f'frames/frame_{index:04d}.png' for index in range(len(frames))]
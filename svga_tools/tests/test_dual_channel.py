@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""双通道合成：CRF 换算、通道布局，以及用本地 ffmpeg 实际编码 / 解码"""
+
+import os
+import subprocess
+
+import numpy as np
+import pytest
+
+from svga_tools.dual_channel import (
+    ALPHA_LEFT_COLOR_RIGHT, COLOR_LEFT_ALPHA_RIGHT, compose_dual, encode_dual_channel, has_ffmpeg, quality_to_crf
+)
+
+
+@pytest.mark.parametrize('quality, crf', [(100, 18), (80, 25), (50, 35), (1, 51)])
+def test_quality_to_crf_matches_math_round(quality, crf):
+    assert quality_to_crf(quality) == crf
+
+
+def test_compose_dual_layout():
+    rgba = np.array([[[200, 100, 50, 128], [10, 20, 30, 255]]], dtype=np.uint8)
+    color = np.round(rgba[..., :3].astype(np.float64) * rgba[..., 3:] / 255).astype(np.uint8)
+
+    out = compose_dual(rgba, COLOR_LEFT_ALPHA_RIGHT)
+    assert out.shape == (1, 4, 3)
+    assert (out[:, :2] == color).all()
+    assert (out[:, 2:] == rgba[..., 3:]).all()
+
+    out = compose_dual(rgba, ALPHA_LEFT_COLOR_RIGHT)
+    assert (out[:, :2] == rgba[..., 3:]).all()
+    assert (out[:, 2:] == color).all()
+
+
+@pytest.mark.skipif(not has_ffmpeg(), reason='未安装 ffmpeg')
+def test_encode_dual_channel_with_ffmpeg(tmp_path):
+    width, height, count = 64, 48, 5
+    frames = []
+    for index in range(count):
+        rgba = np.zeros((height, width, 4), dtype=np.uint8)
+        rgba[..., 0] = 255
+        rgba[..., 3] = 40 * index
+        frames.append(rgba)
+    output = os.path.join(tmp_path, 'dual.mp4')
+    assert encode_dual_channel(iter(frames), width, height, 30, output) == count
+
+    decoded = subprocess.run(
+        ['ffmpeg', '-hide_banner', '-loglevel', 'error', '-i', output, '-f', 'rawvideo', '-pix_fmt', 'rgb24', 'pipe:1'],
+        capture_output=True, check=True
+    ).stdout
+    frame_size = width * 2 * height * 3
+    assert len(decoded) == frame_size * count
+    last = np.frombuffer(decoded[-frame_size:], dtype=np.uint8).reshape(height, width * 2, 3)
+    # 有损编码，只检查大致数值：彩色半边 R ≈ 255 * 160 / 255，Alpha 半边 ≈ 160
+    assert abs(int(last[:, :width, 0].mean()) - 160) < 8
+    assert abs(int(last[:, width:].mean()) - 160) < 8
@@ -0,0 +1,16 @@
+# -*- coding: utf-8 -*-
+"""懒加载读取与完整解码结果一致"""
+
+from svga_tools import load
+from svga_tools.lazy import LazyMovie
+
+
+def test_lazy_movie_matches_full_decode(test_svga):
+    movie = load(test_svga)
+    lazy = LazyMovie.open(test_svga)
+    assert lazy.params == movie.params
+    assert dict(lazy.images) == movie.images
+    assert len(lazy.sprites) == len(movie.sprites)
+    assert [sprite.imageKey for sprite in lazy.sprites] == [sprite.imageKey for sprite in movie.sprites]
+    assert lazy.sprites[3].frames == movie.sprites[3].frames
+    assert lazy.to_movie() == movie
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+"""图片去重与 oxipng 级别换算"""
+
+import pytest
+
+from svga_tools import load
+from svga_tools.optimize import dedupe_images
+from svga_tools.png import quality_to_oxipng_level
+
+
+def test_dedupe_images_remaps_sprites(test_svga):
+    movie = load(test_svga)
+    sprite = next(sprite for sprite in movie.sprites if sprite.imageKey in movie.images and not sprite.matteKey)
+    original = sprite.imageKey
+    movie.images['duplicate_copy'] = movie.images[original]
+    sprite.imageKey = 'duplicate_copy'
+
+    assert dedupe_images(movie) == 1
+    assert 'duplicate_copy' not in movie.images
+    assert sprite.imageKey == original
+
+
+def test_dedupe_images_keeps_protected_keys(test_svga):
+    movie = load(test_svga)
+    key = next(iter(movie.images))
+    movie.images['duplicate_copy'] = movie.images[key]
+    assert dedupe_images(movie, keep_keys=('duplicate_copy',)) == 0
+    assert 'duplicate_copy' in movie.images
+
+
+@pytest.mark.parametrize('quality, level', [(10, 1), (30, 2), (50, 3), (70, 4), (90, 5), (100, 5)])
+def test_quality_to_oxipng_level_matches_math_round(quality, level):
+    assert quality_to_oxipng_level(quality) == level
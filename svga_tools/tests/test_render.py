@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+"""NumPy 渲染：尺寸、帧数回退、多进程与单进程结果一致"""
+
+import numpy as np
+
+from svga_tools import dumps, load
+from svga_tools.render import Renderer, movie_frame_count, parse_frames, render_frames
+
+
+def test_renderer_output(icon_svga):
+    renderer = Renderer(load(icon_svga), scale=2.0)
+    assert (renderer.width, renderer.height, renderer.frame_count) == (144, 144, 30)
+    rgba = renderer.render(0)
+    assert rgba.shape == (144, 144, 4) and rgba.dtype == np.uint8
+    assert rgba[..., 3].any()
+
+
+def test_frame_count_falls_back_to_sprites(icon_svga):
+    movie = load(icon_svga)
+    movie.params.frames = 0
+    assert movie_frame_count(movie) == max(len(sprite.frames) for sprite in movie.sprites)
+    indices = [index for index, _ in render_frames(dumps(movie), scale=0.25, jobs=2)]
+    assert indices == list(range(movie_frame_count(movie)))
+
+
+def test_parallel_matches_serial(icon_svga):
+    with open(icon_svga, 'rb') as f:
+        data = f.read()
+    serial = list(render_frames(data, [0, 7, 15], jobs=1))
+    parallel = list(render_frames(data, [0, 7, 15], jobs=2))
+    assert [index for index, _ in parallel] == [0, 7, 15]
+    for (_, a), (_, b) in zip(serial, parallel):
+        assert np.array_equal(a, b)
+
+
+def test_parse_frames():
+    assert parse_frames(None, 3) == [0, 1, 2]
+    assert parse_frames('0-2,5,99', 10) == [0, 1, 2, 5]
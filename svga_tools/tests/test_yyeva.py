@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""YYEVA 元数据解析、JSON 导出与旁路文件"""
+
+import json
+
+import pytest
+
+from svga_tools import SVGAError
+from svga_tools.yyeva import YYEVAIndex, build_index, compress_index, export_json, parse_yyeva
+
+from .conftest import sample
+
+EFFECT_VIDEOS = ['万圣节首页打开动画gala_dynamic_264_mid', '万圣节首页打开动画rostar_dynamic_264_mid']
+
+
+@pytest.mark.parametrize('name', EFFECT_VIDEOS)
+def test_export_matches_reference(name, tmp_path):
+    target = tmp_path / 'out.json'
+    export_json(parse_yyeva(sample(name + '.mp4')), target)
+    with open(sample(name + '_yyeva_data.json'), 'rb') as f:
+        assert target.read_bytes() == f.read()
+
+
+@pytest.mark.parametrize('name', ['开奖动画_normal_264_mid.mp4', 'aaa.mp4'])
+def test_plain_video_has_no_data(name):
+    assert parse_yyeva(sample(name)) is None
+
+
+def assert_index_matches(index, data):
+    assert index.descript == data['descript']
+    assert index.frame_count == len(data['datas'])
+    for frame in data['datas']:
+        items = {item['effectId']: item for item in index.frame_data(frame['frameIndex'])}
+        assert len(items) == len(frame['data'])
+        for expected in frame['data']:
+            item = items[expected['effectId']]
+            for key in ('renderFrame', 'outputFrame'):
+                assert item[key] == pytest.approx(expected[key], abs=1e-3)
+
+
+@pytest.mark.parametrize('compression', ['gzip', 'none'])
+def test_sidecar_lookup(compression, tmp_path):
+    with open(sample(EFFECT_VIDEOS[0] + '_yyeva_data.json'), encoding='utf-8') as f:
+        data = json.load(f)
+    path = tmp_path / 'index.bin'
+    path.write_bytes(compress_index(build_index(data), compression))
+    index = YYEVAIndex.load(path)
+    assert_index_matches(index, data)
+    assert index.frame_data(index.frame_count) == []
+
+
+def test_sidecar_brotli(tmp_path):
+    pytest.importorskip('brotli')
+    with open(sample(EFFECT_VIDEOS[1] + '_yyeva_data.json'), encoding='utf-8') as f:
+        data = json.load(f)
+    path = tmp_path / 'index.bin.br'
+    path.write_bytes(compress_index(build_index(data), 'br'))
+    assert_index_matches(YYEVAIndex.load(path), data)
+
+
+def test_gzip_is_deterministic():
+    raw = build_index({'descript': {}, 'effect': [], 'datas': []})
+    assert compress_index(raw) == compress_index(raw)
+
+
+def test_invalid_sidecar():
+    with pytest.raises(SVGAError):
+        YYEVAIndex(b'XXXX' + bytes(12))
+
+
+def test_short_rect_is_rejected():
+    data = {
+        'descript': {}, 'effect': [{'effectId': 1}],
+        'datas': [{'frameIndex': 0, 'data': [{'effectId': 1, 'renderFrame': [1, 2, 3]}]}]
+    }
+    with pytest.raises(SVGAError):
+        build_index(data)
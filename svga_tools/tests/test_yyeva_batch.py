@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""YYEVA 批量个性化：合成公式、用户配置与逐帧合成"""
+
+import queue
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from svga_tools import SVGAError, yyeva_batch
+from svga_tools.dual_channel import COLOR_LEFT_ALPHA_RIGHT, has_ffmpeg
+from svga_tools.yyeva import YYEVAIndex, build_index
+from svga_tools.yyeva_batch import (
+    STREAM_ABORT, composite, cover, extract_mask, personalized_frames, queued_frames, render_streaming, user_slots
+)
+
+
+def test_composite_premultiplied():
+    color = np.full((1, 2, 3), 100, dtype=np.uint8)
+    alpha = np.full((1, 2, 3), 128, dtype=np.uint8)
+    layer = np.array([[[255, 0, 0, 255], [255, 0, 0, 128]]], dtype=np.uint8)
+    composite(color, alpha, layer, None, 0, 0)
+    assert color[0, 0].tolist() == [255, 0, 0] and alpha[0, 0].tolist() == [255, 255, 255]
+    # 半透明：out = src * a + dst * (1 - a)
+    assert color[0, 1].tolist() == [178, 50, 50] and alpha[0, 1, 0] == 192
+
+
+def test_composite_mask_and_clipping():
+    color = np.zeros((2, 2, 3), dtype=np.uint8)
+    alpha = np.zeros((2, 2, 3), dtype=np.uint8)
+    layer = np.full((2, 2, 4), 255, dtype=np.uint8)
+    mask = np.array([[0, 255], [128, 255]], dtype=np.uint8)
+    composite(color, alpha, layer, mask, 1, 0)
+    assert alpha[..., 0].tolist() == [[0, 0], [0, 128]]
+
+
+def test_user_slots():
+    effects = [{'effectTag': 'text_01'}, {'effectTag': 'avatar_01'}]
+    row = {'text_01': ' 你好 ', 'text_01_fontSize': '24', 'text_01_fontColor': '', 'avatar_01': ''}
+    assert user_slots(row, effects) == {'text_01': {'value': '你好', 'fontSize': '24'}}
+
+
+def test_cover_and_mask_size():
+    image = Image.new('RGBA', (40, 10), (255, 0, 0, 255))
+    assert cover(image, (6, 4)).shape == (4, 6, 4)
+    frame = np.zeros((4, 8, 3), dtype=np.uint8)
+    frame[:, 4:, 0] = 200
+    assert extract_mask(frame, [4, 0, 4, 4], (2, 2)).tolist() == [[200, 200], [200, 200]]
+    assert extract_mask(frame, [6, 0, 4, 4], (2, 2)) is None
+
+
+def avatar_context(tmp_path):
+    """8x4 合成视频（彩色 4x4 + Alpha 4x4），第 1 帧在 (1, 1) 放置 2x2 头像"""
+    Image.new('RGBA', (4, 4), (255, 0, 0, 255)).save(tmp_path / 'avatar.png')
+    data = {
+        'descript': {'width': 8, 'height': 4, 'rgbFrame': [0, 0, 4, 4], 'alphaFrame': [4, 0, 4, 4]},
+        'effect': [{'effectId': 1, 'effectType': 'img', 'effectTag': 'avatar_01'}],
+        'datas': [{'frameIndex': 1, 'data': [{'effectId': 1, 'renderFrame': [1, 1, 2, 2]}]}]
+    }
+    context = {
+        'index': YYEVAIndex(build_index(data)), 'rgb_rect': (0, 0, 4, 4), 'alpha_rect': (4, 0, 4, 4),
+        'mode': COLOR_LEFT_ALPHA_RIGHT, 'font': None, 'base_dir': str(tmp_path), 'output': str(tmp_path),
+        'fps': 30, 'quality': 80, 'ffmpeg': 'ffmpeg', 'audio': None
+    }
+    return data, context
+
+
+def test_personalized_frames(tmp_path):
+    data, context = avatar_context(tmp_path)
+    frames = np.zeros((2, 4, 8, 3), dtype=np.uint8)
+    slots = user_slots({'avatar_01': 'avatar.png'}, data['effect'])
+    outputs = [frame.copy() for frame in personalized_frames(frames, context, slots)]
+    assert not outputs[0].any()
+    expected = np.zeros((4, 4), dtype=np.uint8)
+    expected[1:3, 1:3] = 255
+    assert np.array_equal(outputs[1][:, :4, 0], expected)
+    assert np.array_equal(outputs[1][:, 4:, 0], expected)
+    assert not outputs[1][:, :4, 1:].any()
+
+
+def test_abort_marker_raises():
+    frames_queue = queue.Queue()
+    frames_queue.put(np.zeros((1, 1, 3), dtype=np.uint8))
+    frames_queue.put(STREAM_ABORT)
+    frames = queued_frames(frames_queue)
+    next(frames)
+    with pytest.raises(SVGAError):
+        next(frames)
+
+
+@pytest.mark.skipif(not has_ffmpeg(), reason='未安装 ffmpeg')
+def test_streaming_decode_failure_leaves_no_output(tmp_path, monkeypatch):
+    _, context = avatar_context(tmp_path)
+
+    def truncated(path, width, height, ffmpeg='ffmpeg'):
+        for _ in range(3):
+            yield np.zeros((height, width, 3), dtype=np.uint8)
+        raise SVGAError('ffmpeg 解码数据不完整')
+
+    monkeypatch.setattr(yyeva_batch, 'decode_frames', truncated)
+    batch = [(0, {'name': 'a', 'avatar_01': 'avatar.png'}), (1, {'name': 'b'})]
+    with pytest.raises(SVGAError):
+        render_streaming('source.mp4', batch, context, (8, 4))
+    assert not list(tmp_path.glob('*.mp4'))
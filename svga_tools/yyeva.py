@@ -0,0 +1,427 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+YYEVA 元数据解析
+
+YYEVA 双通道 MP4 在 moov -> udta -> meta 中以 yyeffectmp4json[[Base64(zlib 压缩的 JSON)]] 存放动态元素配置。
+与 yyeva-parser.js 的逐字节扫描不同，这里：
+- mmap 映射文件，只读取需要的页
+- 先遍历顶层 box 找到 moov（通常只有几个顶层 box），在 moov 范围内用 bytes.find 定位标记；
+  找不到时再对整个文件 find 兜底
+- 直接切出 [[...]] 之间的 Base64，解码、解压、解析 JSON
+
+输出结构与 test_files/*_yyeva_data.json 相同：{descript, effect, datas}。
+
+--sidecar 额外生成按帧索引的旁路文件 <文件名>_yyeva_index.bin.gz（或 .br），
+播放端直接按 帧序号 * 槽位数 取矩形，无需解析 MP4，也不用线性查找 datas。
+格式（小端，解压后）：
+    0   4   魔数 'YYIX'
+    4   2   版本 (1)
+    6   2   槽位数 E（effect 列表顺序）
+    8   4   帧数 F（最大 frameIndex + 1）
+    12  4   元数据 JSON 字节数 L（UTF-8，{descript, effect}）
+    16  L   元数据 JSON，补 0 对齐到 4 字节
+    ..      Float32 F * E * 8：renderFrame[x, y, w, h] + outputFrame[x, y, w, h]，该帧没有此槽位时为 NaN
+
+用法:
+    python -m svga_tools yyeva test_files/*.mp4
+    python -m svga_tools yyeva videos/ --export exports/
+    python -m svga_tools yyeva videos/ test_files/*_yyeva_data.json --sidecar exports/ --compression br
+
+    from svga_tools.yyeva import parse_yyeva
+    data = parse_yyeva('test_files/万圣节首页打开动画gala_dynamic_264_mid.mp4')
+"""
+
+import argparse
+import base64
+import binascii
+import gzip
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+import time
+import zlib
+from array import array
+
+from .codec import SVGAError
+
+
+YYEVA_MARKER = b'yyeffectmp4json'
+PAYLOAD_START = b'[['
+PAYLOAD_END = b']]'
+
+INDEX_MAGIC = b'YYIX'
+INDEX_VERSION = 1
+INDEX_HEADER = struct.Struct('<4sHHII')
+# 每个槽位 renderFrame + outputFrame 共 8 个 float32
+RECT_VALUES = 8
+COMPRESSIONS = ('gzip', 'br', 'none')
+INDEX_SUFFIXES = {'gzip': '.bin.gz', 'br': '.bin.br', 'none': '.bin'}
+
+
+def iter_boxes(buf, start=0, end=None):
+    """
+    遍历 MP4 box（不递归）
+
+    参数:
+        buf: 文件数据（bytes / mmap）
+        start, end: 遍历范围
+
+    返回:
+        生成器，产出 (类型, box 起始, 内容起始, box 结束)
+    """
+    end = len(buf) if end is None else end
+    pos = start
+    while pos + 8 <= end:
+        size, box_type = struct.unpack('>I4s', buf[pos:pos + 8])
+        header = 8
+        if size == 1:
+            if pos + 16 > end:
+                return
+            size = struct.unpack('>Q', buf[pos + 8:pos + 16])[0]
+            header = 16
+        elif size == 0:
+            size = end - pos
+        if size < header or pos + size > end:
+            return
+        yield box_type, pos, pos + header, pos + size
+        pos += size
+
+
+def find_marker(buf):
+    """
+    定位 YYEVA 标记
+
+    返回:
+        tuple: (标记位置, 搜索范围结束)，找不到返回 (-1, 0)
+    """
+    for box_type, _, content_start, box_end in iter_boxes(buf):
+        if box_type == b'moov':
+            index = buf.find(YYEVA_MARKER, content_start, box_end)
+            if index != -1:
+                return index, box_end
+            break
+    index = buf.find(YYEVA_MARKER)
+    return index, len(buf)
+
+
+def decode_payload(payload):
+    """
+    Base64 -> zlib 解压 -> JSON
+
+    参数:
+        payload: [[ 与 ]] 之间的 Base64 字节
+
+    返回:
+        dict: JSON 数据
+    """
+    try:
+        compressed = base64.b64decode(payload, validate=True)
+        return json.loads(zlib.decompress(compressed))
+    except (binascii.Error, zlib.error, ValueError) as e:
+        raise SVGAError(f'YYEVA 数据解析失败: {e}') from None
+
+
+def read_yyeva_json(buf):
+    """
+    从 MP4 数据中读取 YYEVA JSON（不检查 isEffect）
+
+    参数:
+        buf: 文件数据（bytes / mmap）
+
+    返回:
+        dict: JSON 数据，没有 YYEVA 标记时返回 None
+    """
+    index, limit = find_marker(buf)
+    if index == -1:
+        return None
+    start = index + len(YYEVA_MARKER)
+    if buf[start:start + len(PAYLOAD_START)] != PAYLOAD_START:
+        raise SVGAError('YYEVA 数据解析失败: 标记后缺少 [[')
+    start += len(PAYLOAD_START)
+    end = buf.find(PAYLOAD_END, start, limit)
+    if end == -1:
+        raise SVGAError('YYEVA 数据解析失败: 缺少 ]]')
+    return decode_payload(buf[start:end])
+
+
+def normalize(data):
+    """
+    整理为 {descript, effect, datas}（与 yyeva-parser.js 一致：isEffect 不为 1 时返回 None）
+    """
+    if not isinstance(data, dict):
+        return None
+    descript = data.get('descript')
+    if not descript or descript.get('isEffect') != 1:
+        return None
+    return {
+        'descript': descript,
+        'effect': data.get('effect') or {},
+        'datas': data.get('datas') or []
+    }
+
+
+def parse_yyeva_bytes(data):
+    """
+    解析 YYEVA MP4 字节
+
+    返回:
+        dict: {descript, effect, datas}，不是 YYEVA 动态元素视频时返回 None
+    """
+    raw = read_yyeva_json(data)
+    return normalize(raw) if raw is not None else None
+
+
+def parse_yyeva(path):
+    """
+    解析 YYEVA MP4 文件（mmap，只读取 box 头和 moov）
+
+    参数:
+        path: MP4 文件路径
+
+    返回:
+        dict: {descript, effect, datas}，不是 YYEVA 动态元素视频时返回 None
+    """
+    with open(path, 'rb') as f:
+        if not f.seek(0, 2):
+            return None
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return parse_yyeva_bytes(mapped)
+
+
+def effect_list(effect):
+    """effect 可能是列表或以 effectId 为键的对象，统一为列表"""
+    return list(effect.values()) if isinstance(effect, dict) else list(effect)
+
+
+def build_index(data):
+    """
+    生成按帧索引的旁路数据（未压缩）
+
+    参数:
+        data: parse_yyeva() 的返回值或 _yyeva_data.json 的内容
+
+    返回:
+        bytes: 旁路文件内容
+    """
+    effects = effect_list(data['effect'])
+    slots = {str(effect.get('effectId')): slot for slot, effect in enumerate(effects)}
+    datas = data['datas']
+    frame_count = max((entry['frameIndex'] for entry in datas), default=-1) + 1
+
+    rects = array('f', [math.nan]) * (frame_count * len(effects) * RECT_VALUES)
+    for entry in datas:
+        base = entry['frameIndex'] * len(effects)
+        for item in entry.get('data') or []:
+            slot = slots.get(str(item.get('effectId')))
+            if slot is None:
+                continue
+            offset = (base + slot) * RECT_VALUES
+            for start, key in ((0, 'renderFrame'), (4, 'outputFrame')):
+                rect = item.get(key)
+                if not rect:
+                    continue
+                if len(rect) < 4:
+                    raise SVGAError(f'YYEVA 第 {entry["frameIndex"]} 帧 effectId={item.get("effectId")} 的 {key} 不足 4 个数值')
+                # 逐个赋值，长度不变，后续帧 / 槽位偏移不会错位
+                for position in range(4):
+                    rects[offset + start + position] = rect[position]
+    if sys.byteorder == 'big':
+        rects.byteswap()
+
+    meta = json.dumps({'descript': data['descript'], 'effect': effects}, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    padding = b'\0' * (-len(meta) % 4)
+    header = INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, len(effects), frame_count, len(meta))
+    return header + meta + padding + rects.tobytes()
+
+
+def compress_index(raw, compression='gzip'):
+    """压缩旁路数据（gzip 固定 mtime，相同输入输出相同字节）"""
+    if compression == 'gzip':
+        return gzip.compress(raw, compresslevel=9, mtime=0)
+    if compression == 'br':
+        try:
+            import brotli
+        except ImportError:
+            raise SVGAError('brotli 压缩需要安装 brotli（pip install brotli）') from None
+        return brotli.compress(raw, quality=11)
+    return raw
+
+
+class YYEVAIndex:
+    """
+    旁路文件读取，按帧 O(1) 查找动态元素矩形
+
+    属性:
+        descript: 视频描述
+        effects: 动态元素列表（槽位顺序）
+        frame_count: 帧数
+        rects: Float32 数组（帧 * 槽位 * 8）
+    """
+
+    def __init__(self, raw):
+        if len(raw) < INDEX_HEADER.size:
+            raise SVGAError('YYEVA 旁路文件过短')
+        magic, version, slot_count, frame_count, meta_size = INDEX_HEADER.unpack_from(raw)
+        if magic != INDEX_MAGIC or version != INDEX_VERSION:
+            raise SVGAError('不是 YYEVA 旁路文件或版本不支持')
+        offset = INDEX_HEADER.size + meta_size + (-meta_size % 4)
+        size = frame_count * slot_count * RECT_VALUES * 4
+        if len(raw) < offset + size:
+            raise SVGAError('YYEVA 旁路文件数据不完整')
+        meta = json.loads(raw[INDEX_HEADER.size:INDEX_HEADER.size + meta_size])
+        self.descript = meta['descript']
+        self.effects = meta['effect']
+        self.frame_count = frame_count
+        self.rects = array('f')
+        self.rects.frombytes(raw[offset:offset + size])
+        if sys.byteorder == 'big':
+            self.rects.byteswap()
+
+    @classmethod
+    def load(cls, path):
+        """读取旁路文件（按文件头识别 gzip / brotli / 未压缩）"""
+        with open(path, 'rb') as f:
+            raw = f.read()
+        if raw[:2] == b'\x1f\x8b':
+            raw = gzip.decompress(raw)
+        elif raw[:4] != INDEX_MAGIC:
+            try:
+                import brotli
+            except ImportError:
+                raise SVGAError('brotli 解压需要安装 brotli（pip install brotli）') from None
+            raw = brotli.decompress(raw)
+        return cls(raw)
+
+    def frame_data(self, frame_index):
+        """
+        取某帧的动态元素数据
+
+        参数:
+            frame_index: 帧序号
+
+        返回:
+            list: 与 datas[i].data 相同结构的 [{effectId, renderFrame, outputFrame}]，没有数据的帧返回空列表
+        """
+        if not 0 <= frame_index < self.frame_count:
+            return []
+        items = []
+        for slot, effect in enumerate(self.effects):
+            offset = (frame_index * len(self.effects) + slot) * RECT_VALUES
+            values = self.rects[offset:offset + RECT_VALUES]
+            item = {'effectId': effect.get('effectId')}
+            if not math.isnan(values[2]):
+                item['renderFrame'] = list(values[:4])
+            if not math.isnan(values[6]):
+                item['outputFrame'] = list(values[4:])
+            if len(item) > 1:
+                items.append(item)
+        return items
+
+
+def export_json(data, path):
+    """写出与 test_files/*_yyeva_data.json 相同格式的 JSON（2 空格缩进，非 ASCII 转义）"""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps(data, indent=2))
+
+
+def find_mp4_files(paths):
+    """展开输入路径（目录递归查找 .mp4）"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, names in os.walk(path):
+                dirs.sort()
+                files.extend(os.path.join(root, name) for name in sorted(names) if name.lower().endswith('.mp4'))
+        else:
+            files.append(path)
+    return files
+
+
+def load_source(path):
+    """
+    读取 MP4 或已导出的 _yyeva_data.json
+
+    返回:
+        tuple: (数据或 None, 文件名主干)
+    """
+    stem = os.path.splitext(os.path.basename(path))[0]
+    if path.lower().endswith('.json'):
+        with open(path, encoding='utf-8') as f:
+            data = normalize(json.load(f))
+        if stem.endswith('_yyeva_data'):
+            stem = stem[:-len('_yyeva_data')]
+        return data, stem
+    return parse_yyeva(path), stem
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m svga_tools yyeva', description='解析 YYEVA MP4 的动态元素元数据')
+    parser.add_argument('inputs', nargs='+', help='MP4 文件、_yyeva_data.json 或目录（目录递归查找 .mp4）')
+    parser.add_argument('--export', metavar='DIR', help='导出 <文件名>_yyeva_data.json 到指定目录')
+    parser.add_argument('--sidecar', metavar='DIR', help='生成按帧索引的旁路文件 <文件名>_yyeva_index.bin.* 到指定目录')
+    parser.add_argument('--compression', choices=COMPRESSIONS, default='gzip', help='旁路文件压缩方式（默认: gzip）')
+    parser.add_argument('--json', action='store_true', help='输出 JSON 摘要')
+    args = parser.parse_args(argv)
+
+    for directory in (args.export, args.sidecar):
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    results = []
+    failed = 0
+    for path in find_mp4_files(args.inputs):
+        start = time.perf_counter()
+        try:
+            data, stem = load_source(path)
+            elapsed = (time.perf_counter() - start) * 1000
+            if data is None:
+                results.append({'file': path, 'yyeva': False, 'ms': elapsed})
+                continue
+            if args.export:
+                export_json(data, os.path.join(args.export, f'{stem}_yyeva_data.json'))
+            sidecar = None
+            if args.sidecar:
+                compressed = compress_index(build_index(data), args.compression)
+                sidecar = os.path.join(args.sidecar, f'{stem}_yyeva_index{INDEX_SUFFIXES[args.compression]}')
+                with open(sidecar, 'wb') as f:
+                    f.write(compressed)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            failed += 1
+            results.append({'file': path, 'error': str(e)})
+            continue
+        descript = data['descript']
+        info = {
+            'file': path,
+            'yyeva': True,
+            'ms': elapsed,
+            'width': descript.get('width'),
+            'height': descript.get('height'),
+            'fps': descript.get('fps'),
+            'frames': len(data['datas']),
+            'effects': [f"{effect.get('effectTag')}({effect.get('effectType')})" for effect in effect_list(data['effect'])]
+        }
+        if sidecar:
+            info['sidecar'] = sidecar
+            info['sidecar_size'] = os.path.getsize(sidecar)
+        results.append(info)
+
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    else:
+        for info in results:
+            if 'error' in info:
+                print(f"{info['file']}: 错误 - {info['error']}")
+            elif not info['yyeva']:
+                print(f"{info['file']}: 不是 YYEVA 动态元素视频（{info['ms']:.2f}ms）")
+            else:
+                print(
+                    f"{info['file']}: {info['width']}x{info['height']} @ {info['fps']}fps，{info['frames']} 帧，"
+                    f"动态元素 {', '.join(info['effects']) or '无'}（{info['ms']:.2f}ms）"
+                )
+                if 'sidecar' in info:
+                    print(f"  旁路文件 -> {info['sidecar']}（{info['sidecar_size'] / 1024:.1f} KB）")
+    return 1 if failed else 0
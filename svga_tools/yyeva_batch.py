@@ -0,0 +1,519 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+YYEVA 动态元素批量渲染（服务端）
+
+对应浏览器端 yyeva-key-panel.js + yyeva-renderer.js 的逐个替换：给定一个 YYEVA MP4 和一份 CSV
+（每行一个用户的文本 / 图片），批量输出已烘焙动态元素的双通道 MP4。依赖 numpy、Pillow 和本地 ffmpeg。
+
+- 默认流式：ffmpeg 解码的 rgb24 帧逐帧分发给 --jobs 个用户的合成线程，内存只占几帧，不写磁盘；
+  用户数超过 --jobs 时分批，每批解码一次
+- --cache-dir：源视频只解码一次写入该目录的缓存文件（帧数 × 宽 × 高 × 3 字节，如 181 帧 1504x1904 约 1.5 GB），
+  各进程以 np.memmap 只读共享，适合用户数远多于 --jobs 的场景
+- 解码时强制输出 descript 中的宽高（-s），与 YYEVA 坐标一致，不会因实际编码尺寸不同而错帧
+- 动态元素位置按帧 O(1) 查找（svga_tools.yyeva.YYEVAIndex）
+- 合成与 yyeva-renderer.js 一致：文本 / 图片（cover 裁剪）的 alpha 乘以视频 outputFrame 区域的蒙版 R 通道，
+  在 renderFrame 位置 source-over 叠加；源视频彩色半边本身是与黑底混合的预乘颜色，直接在预乘空间合成，
+  输出仍为预乘彩色 + Alpha 灰度的双通道帧，只处理动态元素所在区域，其余像素原样复制
+- 每个用户一个 ffmpeg 编码进程（管道输入，不落临时帧），--jobs 个用户并行；源视频有音轨时原样复制
+
+renderFrame 的小数坐标取整到像素（浏览器端为亚像素绘制，差异不超过 1 像素）。
+
+CSV 格式（与 file-list.csv 相同：首行为表头，UTF-8，可带 BOM）：
+    name,text_01,avatar_01,text_01_fontColor,text_01_fontSize
+    user001,小明,avatars/001.png,#ffcc00,40
+- name：输出文件名（<name>.mp4），为空时用行号
+- <effectTag>：文本内容或图片路径（相对 CSV 所在目录，也可为 http(s) URL），为空时该元素不显示
+- <effectTag>_fontColor / _fontSize / _textAlign：覆盖 effect 中的文本样式（可选）
+
+用法:
+    python -m svga_tools yyeva-batch test_files/万圣节首页打开动画gala_dynamic_264_mid.mp4 users.csv -o gifts/
+    python -m svga_tools yyeva-batch gift.mp4 users.csv -o gifts/ --font fonts/NotoSansSC-Bold.otf --jobs 4 --quality 90
+    python -m svga_tools yyeva-batch gift.mp4 users.csv -o gifts/ --cache-dir /data/tmp --jobs 8
+"""
+
+import argparse
+import csv
+import io
+import math
+import os
+import queue
+import subprocess
+import tempfile
+import threading
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from PIL import Image, ImageColor, ImageDraw, ImageFont
+
+from .codec import SVGAError
+from .dual_channel import (
+    ALPHA_LEFT_COLOR_RIGHT, COLOR_LEFT_ALPHA_RIGHT, DEFAULT_QUALITY, MODES, encode_rgb24, even, has_ffmpeg
+)
+from .yyeva import YYEVAIndex, build_index, effect_list, parse_yyeva
+
+
+# 与 yyeva-renderer.js 的默认文本样式一致
+DEFAULT_FONT_SIZE = 36
+DEFAULT_FONT_COLOR = '#ffffff'
+DEFAULT_TEXT_ALIGN = 'center'
+
+# textBaseline = 'middle'，x 固定为宽度的一半，textAlign 决定文字相对该点的位置
+TEXT_ANCHORS = {'center': 'mm', 'left': 'lm', 'start': 'lm', 'right': 'rm', 'end': 'rm'}
+
+STYLE_FIELDS = ('fontColor', 'fontSize', 'textAlign')
+
+# 流式模式下每个用户线程最多缓冲的帧数
+STREAM_QUEUE_SIZE = 4
+# 流式解码失败时发给用户线程的中止标记（None 为正常结束）
+STREAM_ABORT = object()
+
+# 进程池中每个进程共享的解码帧与配置（由 _init_worker 创建）
+_worker_frames = None
+_worker_context = None
+
+
+def rect_ints(rect):
+    """[x, y, w, h] 取整（与 renderer 中 Math.floor 一致）"""
+    return tuple(int(math.floor(value)) for value in rect[:4])
+
+
+def decode_frames(path, width, height, ffmpeg='ffmpeg'):
+    """
+    ffmpeg 解码视频为 rgb24 帧（强制输出为指定尺寸）
+
+    参数:
+        path: 视频路径
+        width, height: 输出尺寸（descript.width / height）
+        ffmpeg: ffmpeg 可执行文件
+
+    返回:
+        生成器，产出 uint8 (高, 宽, 3)
+    """
+    command = [
+        ffmpeg, '-hide_banner', '-loglevel', 'error', '-i', path,
+        '-s', f'{width}x{height}', '-f', 'rawvideo', '-pix_fmt', 'rgb24', 'pipe:1'
+    ]
+    frame_size = width * height * 3
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    count = 0
+    data = b''
+    try:
+        while True:
+            data = process.stdout.read(frame_size)
+            if len(data) < frame_size:
+                break
+            count += 1
+            yield np.frombuffer(data, dtype=np.uint8).reshape(height, width, 3)
+    except GeneratorExit:
+        # 调用方提前结束
+        process.kill()
+        raise
+    finally:
+        process.stdout.close()
+        stderr = process.stderr.read().decode('utf-8', 'replace')
+        returncode = process.wait()
+    if returncode != 0:
+        raise SVGAError(f'ffmpeg 解码失败: {stderr.strip()}')
+    if data:
+        raise SVGAError(f'ffmpeg 解码数据不完整：第 {count + 1} 帧只有 {len(data)}/{frame_size} 字节')
+    if not count:
+        raise SVGAError('视频没有可解码的帧')
+
+
+def decode_to_cache(path, width, height, cache_path, ffmpeg='ffmpeg'):
+    """
+    解码视频并写入缓存文件（--cache-dir 模式）
+
+    返回:
+        int: 帧数
+    """
+    count = 0
+    with open(cache_path, 'wb') as cache:
+        for frame in decode_frames(path, width, height, ffmpeg):
+            cache.write(frame.data)
+            count += 1
+    return count
+
+
+def read_rows(path):
+    """读取 CSV（utf-8-sig 兼容 BOM）"""
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        return list(csv.DictReader(f))
+
+
+def user_slots(row, effects):
+    """
+    从 CSV 行提取每个动态元素的用户配置
+
+    返回:
+        dict: effectTag -> {'value': 文本或图片路径, 样式字段...}，空值的元素不包含
+    """
+    slots = {}
+    for effect in effects:
+        tag = effect.get('effectTag')
+        value = (row.get(tag) or '').strip()
+        if not value:
+            continue
+        config = {'value': value}
+        for field in STYLE_FIELDS:
+            style = (row.get(f'{tag}_{field}') or '').strip()
+            if style:
+                config[field] = style
+        slots[tag] = config
+    return slots
+
+
+def load_font(path, size):
+    """加载字体（未指定时用 Pillow 内置字体，只含拉丁字符，中文需指定 --font）"""
+    if path:
+        return ImageFont.truetype(path, size)
+    return ImageFont.load_default(size)
+
+
+def render_text(text, size, effect, config, font_path):
+    """
+    绘制文本图层（与 _renderText 一致：水平居中于宽度一半、垂直居中）
+
+    参数:
+        text: 文本
+        size: (宽, 高)
+        effect: effect 信息
+        config: 用户配置（样式字段覆盖 effect）
+        font_path: 字体文件
+
+    返回:
+        numpy.ndarray: uint8 非预乘 RGBA (高, 宽, 4)
+    """
+    width, height = size
+    font_size = float(config.get('fontSize') or effect.get('fontSize') or DEFAULT_FONT_SIZE)
+    color = ImageColor.getcolor(config.get('fontColor') or effect.get('fontColor') or DEFAULT_FONT_COLOR, 'RGBA')
+    align = config.get('textAlign') or effect.get('textAlign') or DEFAULT_TEXT_ALIGN
+    layer = Image.new('RGBA', (width, height), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(layer)
+    draw.text((width / 2, height / 2), text, fill=color, font=load_font(font_path, font_size), anchor=TEXT_ANCHORS.get(align, 'mm'))
+    return np.asarray(layer)
+
+
+def read_image(source, base_dir):
+    """读取用户图片（本地路径相对 CSV 目录，或 http(s) URL）"""
+    if source.startswith(('http://', 'https://')):
+        with urllib.request.urlopen(source, timeout=30) as response:
+            data = response.read()
+    else:
+        with open(os.path.join(base_dir, source), 'rb') as f:
+            data = f.read()
+    with Image.open(io.BytesIO(data)) as image:
+        return image.convert('RGBA')
+
+
+def cover(image, size):
+    """
+    cover 裁剪缩放（与 _drawImageToCanvas 一致：保持比例，短边填满，长边居中裁剪）
+
+    返回:
+        numpy.ndarray: uint8 非预乘 RGBA (高, 宽, 4)
+    """
+    width, height = size
+    image_width, image_height = image.size
+    target_ratio = width / height
+    if image_width / image_height > target_ratio:
+        crop_width = image_height * target_ratio
+        box = ((image_width - crop_width) / 2, 0, (image_width + crop_width) / 2, image_height)
+    else:
+        crop_height = image_width / target_ratio
+        box = (0, (image_height - crop_height) / 2, image_width, (image_height + crop_height) / 2)
+    return np.asarray(image.resize((width, height), Image.Resampling.BILINEAR, box=box))
+
+
+def extract_mask(frame, output_frame, size):
+    """
+    从完整视频帧的 outputFrame 区域取蒙版（R 通道），缩放到图层尺寸
+
+    返回:
+        numpy.ndarray: uint8 (高, 宽)，outputFrame 超出视频范围时返回 None（与 renderer 一致，不应用蒙版）
+    """
+    x, y, w, h = rect_ints(output_frame)
+    if w <= 0 or h <= 0 or x < 0 or y < 0 or x + w > frame.shape[1] or y + h > frame.shape[0]:
+        return None
+    mask = frame[y:y + h, x:x + w, 0]
+    if (w, h) != size:
+        mask = np.asarray(Image.fromarray(np.ascontiguousarray(mask), 'L').resize(size, Image.Resampling.BILINEAR))
+    return mask
+
+
+def composite(color, alpha, layer, mask, x, y):
+    """
+    预乘空间 source-over 合成一个动态元素（就地修改）
+
+    参数:
+        color: 输出彩色半边 uint8 (高, 宽, 3)，预乘（与黑底混合）颜色
+        alpha: 输出 Alpha 半边 uint8 (高, 宽, 3)，灰度
+        layer: uint8 非预乘 RGBA 图层
+        mask: uint8 蒙版或 None，图层 alpha = floor(alpha * mask / 255)
+        x, y: 图层左上角（像素）
+    """
+    height, width = color.shape[:2]
+    left, top = max(0, x), max(0, y)
+    right, bottom = min(width, x + layer.shape[1]), min(height, y + layer.shape[0])
+    if left >= right or top >= bottom:
+        return
+    region = (slice(top, bottom), slice(left, right))
+    local = (slice(top - y, bottom - y), slice(left - x, right - x))
+
+    layer_alpha = layer[local][..., 3].astype(np.uint16)
+    if mask is not None:
+        layer_alpha = layer_alpha * mask[local] // 255
+    coverage = layer_alpha.astype(np.float32)[..., None] / 255.0
+    if not coverage.any():
+        return
+    source = layer[local][..., :3] * coverage
+    keep = 1.0 - coverage
+    color[region] = (source + color[region] * keep + 0.5).astype(np.uint8)
+    alpha[region] = (coverage * 255.0 + alpha[region][..., :1] * keep + 0.5).astype(np.uint8)
+
+
+def _init_worker(cache_path, shape, context):
+    global _worker_frames, _worker_context
+    _worker_frames = np.memmap(cache_path, dtype=np.uint8, mode='r', shape=shape)
+    _worker_context = dict(context, index=YYEVAIndex(build_index(context['data'])))
+
+
+def personalized_frames(frames, context, slots):
+    """
+    逐帧合成单个用户的双通道帧
+
+    参数:
+        frames: 解码帧迭代器，每帧 uint8 (视频高, 视频宽, 3)（缓存 memmap 或流式队列）
+        context: 共享配置（index / effects / 区域 / 输出模式 / 字体等）
+        slots: user_slots() 的返回值
+
+    返回:
+        生成器，产出 uint8 RGB (高, 宽 * 2, 3)（同一缓冲区复用）
+    """
+    index = context['index']
+    effects = {str(effect.get('effectId')): effect for effect in index.effects}
+    rx, ry, width, height = context['rgb_rect']
+    ax, ay = context['alpha_rect'][:2]
+    out = np.empty((height, width * 2, 3), dtype=np.uint8)
+    if context['mode'] == COLOR_LEFT_ALPHA_RIGHT:
+        color, alpha = out[:, :width], out[:, width:]
+    else:
+        alpha, color = out[:, :width], out[:, width:]
+
+    images = {}
+    layers = {}
+    for frame_index, frame in enumerate(frames):
+        color[...] = frame[ry:ry + height, rx:rx + width]
+        alpha[...] = frame[ay:ay + height, ax:ax + width, :1]
+        for item in index.frame_data(frame_index):
+            effect = effects.get(str(item['effectId']))
+            config = slots.get(effect.get('effectTag')) if effect else None
+            if config is None:
+                continue
+            is_text = effect.get('effectType') == 'txt'
+            rect = item.get('renderFrame') or (item.get('outputFrame') if is_text else None)
+            if not rect or effect.get('effectType') not in ('txt', 'img'):
+                continue
+            size = (int(rect[2]), int(rect[3]))
+            if size[0] <= 0 or size[1] <= 0:
+                continue
+            key = (effect.get('effectTag'), size)
+            if key not in layers:
+                if is_text:
+                    layers[key] = render_text(config['value'], size, effect, config, context['font'])
+                else:
+                    if config['value'] not in images:
+                        images[config['value']] = read_image(config['value'], context['base_dir'])
+                    layers[key] = cover(images[config['value']], size)
+            mask = extract_mask(frame, item['outputFrame'], size) if 'outputFrame' in item else None
+            composite(color, alpha, layers[key], mask, round(rect[0]), round(rect[1]))
+        yield out
+
+
+def render_user(position, row, context, frames):
+    """
+    渲染并编码单个用户
+
+    参数:
+        position: CSV 行号（从 0 开始，name 为空时用于命名）
+        row: CSV 行
+        context: 共享配置
+        frames: 解码帧迭代器
+
+    返回:
+        tuple: (名称, 输出路径, 帧数, 错误信息或 None)
+    """
+    name = os.path.basename((row.get('name') or '').strip()) or f'{position + 1:04d}'
+    target = os.path.join(context['output'], f'{name}.mp4')
+    try:
+        slots = user_slots(row, context['index'].effects)
+        _, _, width, height = context['rgb_rect']
+        count = encode_rgb24(
+            personalized_frames(frames, context, slots), width * 2, height, context['fps'], target,
+            context['quality'], context['ffmpeg'], context['audio']
+        )
+        return name, target, count, None
+    except (OSError, ValueError) as e:
+        # 不在最终文件名下留下不完整的 MP4
+        if os.path.exists(target):
+            os.remove(target)
+        return name, target, 0, str(e)
+
+
+def _render_cached(position, row):
+    """进程池任务：从共享的解码缓存渲染单个用户"""
+    return render_user(position, row, _worker_context, _worker_frames)
+
+
+def queued_frames(frames_queue):
+    """从队列取帧，直到收到 None；收到 STREAM_ABORT 时抛出异常，使编码端终止 ffmpeg"""
+    while True:
+        frame = frames_queue.get()
+        if frame is None:
+            return
+        if frame is STREAM_ABORT:
+            raise SVGAError('源视频解码失败，已中止编码')
+        yield frame
+
+
+def put_frame(frames_queue, thread, frame):
+    """向用户线程的队列放入一帧；线程已结束（如编码失败）时丢弃，避免阻塞解码"""
+    while thread.is_alive():
+        try:
+            frames_queue.put(frame, timeout=0.5)
+            return
+        except queue.Full:
+            continue
+
+
+def render_streaming(video, batch, context, size):
+    """
+    流式渲染一批用户：解码一次，每帧分发给各用户的合成线程（编码在各自的 ffmpeg 进程中并行）
+
+    参数:
+        video: 源视频
+        batch: [(CSV 行号, CSV 行)]
+        context: 共享配置
+        size: 解码尺寸 (宽, 高)
+
+    返回:
+        list: 每个用户的 render_user() 结果（解码失败时中止各用户编码、不留输出文件，并重新抛出异常）
+    """
+    results = [None] * len(batch)
+    workers = []
+    for slot, (position, row) in enumerate(batch):
+        frames_queue = queue.Queue(maxsize=STREAM_QUEUE_SIZE)
+
+        def run(slot=slot, position=position, row=row, frames_queue=frames_queue):
+            results[slot] = render_user(position, row, context, queued_frames(frames_queue))
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        workers.append((frames_queue, thread))
+    end = STREAM_ABORT
+    try:
+        for frame in decode_frames(video, size[0], size[1], context['ffmpeg']):
+            for frames_queue, thread in workers:
+                put_frame(frames_queue, thread, frame)
+        end = None
+    finally:
+        for frames_queue, thread in workers:
+            put_frame(frames_queue, thread, end)
+            thread.join()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m svga_tools yyeva-batch', description='YYEVA 动态元素批量渲染为双通道 MP4')
+    parser.add_argument('video', help='YYEVA MP4')
+    parser.add_argument('csv', help='用户数据 CSV（name, <effectTag>, <effectTag>_fontColor ...）')
+    parser.add_argument('-o', '--output', required=True, help='输出目录（<name>.mp4）')
+    parser.add_argument('--mode', choices=MODES, default=None, help='输出通道位置（默认: 与源视频相同）')
+    parser.add_argument('--quality', type=int, default=DEFAULT_QUALITY, help=f'质量 1-100（默认: {DEFAULT_QUALITY}）')
+    parser.add_argument('--font', default=None, help='文本字体文件（TTF/OTF，中文文本必须指定）')
+    parser.add_argument('--no-audio', action='store_true', help='不复制源视频音轨')
+    parser.add_argument('--jobs', type=int, default=None, help='同时渲染的用户数（默认: CPU 数）')
+    parser.add_argument('--cache-dir', default=None, help='启用磁盘解码缓存并放在该目录（只解码一次，占用 帧数 × 宽 × 高 × 3 字节）')
+    parser.add_argument('--ffmpeg', default='ffmpeg', help='ffmpeg 可执行文件（默认: ffmpeg）')
+    args = parser.parse_args(argv)
+
+    if not has_ffmpeg(args.ffmpeg):
+        print(f'未找到 ffmpeg: {args.ffmpeg}')
+        return 1
+    try:
+        data = parse_yyeva(args.video)
+        if data is None:
+            raise SVGAError('不是 YYEVA 动态元素视频')
+        rows = read_rows(args.csv)
+    except (OSError, ValueError) as e:
+        print(f'错误 - {e}')
+        return 1
+    if not rows:
+        print('CSV 没有数据行')
+        return 1
+    tags = [effect.get('effectTag') for effect in effect_list(data['effect'])]
+    if not any(tag in rows[0] for tag in tags):
+        print(f'CSV 表头中没有动态元素列（可用: {", ".join(tags)}）')
+        return 1
+
+    descript = data['descript']
+    video_width, video_height = int(descript['width']), int(descript['height'])
+    rgb_rect = rect_ints(descript['rgbFrame'])
+    alpha_rect = rect_ints(descript['alphaFrame'])
+    # yuv420p 要求偶数尺寸，奇数时裁掉最后一行 / 列
+    rgb_rect = rgb_rect[:2] + (even(rgb_rect[2]), even(rgb_rect[3]))
+    mode = args.mode or (COLOR_LEFT_ALPHA_RIGHT if alpha_rect[0] >= rgb_rect[0] else ALPHA_LEFT_COLOR_RIGHT)
+    os.makedirs(args.output, exist_ok=True)
+
+    context = {
+        'data': data,
+        'rgb_rect': rgb_rect,
+        'alpha_rect': alpha_rect,
+        'mode': mode,
+        'fps': descript.get('fps') or 30,
+        'quality': max(1, min(100, args.quality)),
+        'font': args.font,
+        'audio': None if args.no_audio or not descript.get('hasAudio') else args.video,
+        'base_dir': os.path.dirname(os.path.abspath(args.csv)),
+        'output': args.output,
+        'ffmpeg': args.ffmpeg
+    }
+    jobs = max(1, args.jobs or os.cpu_count() or 1)
+    frame_size = video_width * video_height * 3
+
+    print(f'=== YYEVA 批量渲染：{len(rows)} 个用户，动态元素 {", ".join(tags)} ===')
+    results = []
+    decode_failed = False
+    try:
+        if args.cache_dir:
+            os.makedirs(args.cache_dir, exist_ok=True)
+            print(f'解码缓存: {args.cache_dir}（预计 {len(data["datas"]) * frame_size / 1024 / 1024:.0f} MB）')
+            with tempfile.TemporaryDirectory(dir=args.cache_dir) as cache_dir:
+                cache_path = os.path.join(cache_dir, 'frames.rgb')
+                frame_count = decode_to_cache(args.video, video_width, video_height, cache_path, args.ffmpeg)
+                print(f'{args.video}: 解码 {frame_count} 帧（{video_width}x{video_height}），缓存 {os.path.getsize(cache_path) / 1024 / 1024:.0f} MB')
+                shape = (frame_count, video_height, video_width, 3)
+                with ProcessPoolExecutor(max_workers=min(jobs, len(rows)), initializer=_init_worker, initargs=(cache_path, shape, context)) as executor:
+                    results = list(executor.map(_render_cached, range(len(rows)), rows))
+        else:
+            context['index'] = YYEVAIndex(build_index(data))
+            batches = [list(enumerate(rows))[i:i + jobs] for i in range(0, len(rows), jobs)]
+            print(f'流式渲染: 每批 {jobs} 个用户，共 {len(batches)} 批（每批解码一次；用户很多时可用 --cache-dir 只解码一次）')
+            for batch in batches:
+                results.extend(render_streaming(args.video, batch, context, (video_width, video_height)))
+    except (OSError, ValueError) as e:
+        # 已完成批次的结果仍然输出
+        print(f'{args.video}: 错误 - {e}')
+        decode_failed = True
+
+    succeeded = 0
+    for name, target, count, error in results:
+        if error:
+            print(f'{name}: 错误 - {error}')
+            continue
+        succeeded += 1
+        print(f'{name}: {count} 帧 -> {target}（{os.path.getsize(target) / 1024:.1f} KB）')
+    print(f'\n完成: {succeeded}/{len(rows)}')
+    return 1 if decode_failed or succeeded < len(rows) else 0